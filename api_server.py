@@ -2,13 +2,18 @@
 """
 Simple Flask API for the Indinator web UI.
 Run with:  python api_server.py
+
+The game logic lives in indinator/api_service.py (shared with the ASGI server,
+asgi_server.py); the routes here only translate HTTP requests and errors.
 """
 
 from pathlib import Path
 from flask import Flask, jsonify, request, send_from_directory
 from flask_cors import CORS
 
-from indinator import AkinatorAI
+from indinator.api_service import (
+    DEFAULT_SUGGESTIONS, SUGGEST_CACHE_SECONDS, ApiError, GameService, create_engine
+)
 
 # --- Setup --------------------------------------------------------------------
 
@@ -18,17 +23,16 @@ data_dir = project_root / "data"
 app = Flask(__name__, static_folder="ui", static_url_path="")
 CORS(app)  # Enable CORS for all routes
 
-# Create a single AI engine instance (single-user / local use case)
+# One shared, read-only AI model; each player's game state lives in `service.sessions`
 ai = None
-last_guess_name = None  # track last guess for feedback
+service = None
+sessions = None
 
 try:
     print("[INIT] Initializing AI engine...")
-    ai = AkinatorAI(
-        traits_file=str(data_dir / "traits_flat.json"),
-        questions_file=str(data_dir / "questions.json"),
-        characters_file=str(data_dir / "characters.json"),
-    )
+    ai = create_engine(data_dir)
+    service = GameService(ai)
+    sessions = service.sessions
     print("[OK] AI engine ready!")
 except Exception as e:
     print(f"[ERROR] Error initializing AI engine: {e}")
@@ -40,63 +44,16 @@ except Exception as e:
 # --- Helpers ------------------------------------------------------------------
 
 
-def build_state(allow_guess: bool = True):
+def session_id_of(data: dict = None):
     """
-    Build the JSON state returned to the frontend.
-    Includes: next question (if any), entropy, top candidates, and guess (if ready).
+    The caller's session id: the X-Session-Id header, or "sessionId" in the JSON body.
     """
-    global last_guess_name
+    return request.headers.get("X-Session-Id") or (data or {}).get("sessionId")
 
-    try:
-        # Basic stats
-        entropy = ai.entropy(ai.probabilities)
-        top_candidates = [
-            {"name": name, "probability": float(prob)}
-            for name, prob in ai.get_top_characters(8)
-        ]
-
-        # Decide whether to guess
-        guess = None
-        last_guess_name = None
-        if allow_guess and ai.should_make_guess(threshold=0.85):
-            name, prob = ai.get_best_guess()
-            guess = {"name": name, "probability": float(prob)}
-            last_guess_name = name
-
-        # If we're not making a guess (or want to keep asking), pick the next question
-        question = None
-        question_idx = None
-        if guess is None:
-            q_idx = ai.select_best_question()
-            if q_idx is not None:
-                # Validate question index
-                if 0 <= q_idx < len(ai.questions):
-                    q_obj = ai.questions[q_idx]
-                    question = {
-                        "id": q_idx,
-                        "text": q_obj.get("question", ""),
-                    }
-                    question_idx = q_idx
-                else:
-                    print(f"Warning: Invalid question index {q_idx} (total questions: {len(ai.questions)})")
-
-        # Question number = asked so far + 1 if we're presenting a new one
-        questions_asked = len(ai.asked_questions)
-        question_number = questions_asked + (1 if question is not None else 0)
-
-        return {
-            "question": question,             # {id, text} or null
-            "questionIndex": question_idx,    # same as id; included for clarity
-            "questionNumber": question_number,
-            "entropy": float(entropy),
-            "topCandidates": top_candidates,
-            "guess": guess,                   # {name, probability} or null
-        }
-    except Exception as e:
-        print(f"Error in build_state: {e}")
-        import traceback
-        traceback.print_exc()
-        raise
+
+def error_response(error: ApiError):
+    """Error response for a request the service rejected."""
+    return jsonify({"error": error.message}), error.status
 
 
 # --- Routes -------------------------------------------------------------------
@@ -108,16 +65,41 @@ def index():
     return send_from_directory(app.static_folder, "index.html")
 
 
+@app.get("/api/characters/suggest")
+def api_suggest_characters():
+    """
+    Autocomplete a character name as the player types it.
+    Query: ?q=<text typed so far>&limit=<max suggestions, default 8>
+    Returns { "query": str, "suggestions": [{name}] }, cacheable (ETag = model version).
+    """
+    if ai is None:
+        return jsonify({"error": "AI engine not initialized. Check server logs."}), 500
+
+    try:
+        result = service.suggest(request.args.get("q", ""), request.args.get("limit", DEFAULT_SUGGESTIONS))
+    except ApiError as e:
+        return error_response(e)
+
+    response = jsonify(result)
+    response.cache_control.public = True
+    response.cache_control.max_age = SUGGEST_CACHE_SECONDS
+    response.set_etag(service.model_version())
+    return response.make_conditional(request)
+
+
 @app.post("/api/start")
 def api_start():
-    """Start a new game (or restart) and return the initial state."""
+    """
+    Start a new game (or restart) and return the initial state.
+    Reuses the caller's session if it is still live, otherwise creates one.
+    The returned "sessionId" must be sent with every following request.
+    """
     if ai is None:
         return jsonify({"error": "AI engine not initialized. Check server logs."}), 500
     
     try:
-        ai.reset()
-        state = build_state(allow_guess=False)  # never guess immediately
-        return jsonify(state)
+        data = request.get_json(silent=True) or {}
+        return jsonify(service.start(session_id_of(data)))
     except Exception as e:
         print(f"Error in api_start: {e}")
         import traceback
@@ -129,49 +111,16 @@ def api_start():
 def api_answer():
     """
     Submit an answer to the current question.
-    Body: { "questionId": int, "answer": "yes" | "no" | "probably_yes" | ... }
+    Body: { "sessionId": str, "questionId": int, "answer": "yes" | "no" | "probably_yes" | ... }
     """
     if ai is None:
         return jsonify({"error": "AI engine not initialized. Check server logs."}), 500
     
     try:
         data = request.get_json(force=True) or {}
-
-        if "questionId" not in data or "answer" not in data:
-            return jsonify({"error": "Missing 'questionId' or 'answer'"}), 400
-
-        q_idx = int(data["questionId"])
-        answer_code = str(data["answer"])
-
-        # Map UI answers to DecisionTreeAI answer format
-        # DecisionTreeAI expects: "yes", "no", "probably", "probably_not", "dont_know"
-        if answer_code == "yes":
-            user_answer = "yes"
-            lk_correct, lk_incorrect = 0.95, 0.05
-        elif answer_code == "probably_yes":
-            user_answer = "probably"
-            lk_correct, lk_incorrect = 0.75, 0.25
-        elif answer_code == "no":
-            user_answer = "no"
-            lk_correct, lk_incorrect = 0.95, 0.05
-        elif answer_code == "probably_no":
-            user_answer = "probably_not"
-            lk_correct, lk_incorrect = 0.75, 0.25
-        elif answer_code == "unknown":
-            user_answer = "dont_know"
-        else:
-            return jsonify({"error": f"Invalid answer '{answer_code}'"}), 400
-
-        # Update probabilities (DecisionTreeAI handles "dont_know" by not updating)
-        ai.update_probabilities(
-            q_idx,
-            user_answer,
-            likelihood_correct=lk_correct,
-            likelihood_incorrect=lk_incorrect,
-        )
-
-        state = build_state(allow_guess=True)
-        return jsonify(state)
+        return jsonify(service.answer(session_id_of(data), data.get("questionId"), data.get("answer")))
+    except ApiError as e:
+        return error_response(e)
     except Exception as e:
         print(f"Error in api_answer: {e}")
         import traceback
@@ -189,8 +138,10 @@ def api_next_question():
         return jsonify({"error": "AI engine not initialized. Check server logs."}), 500
     
     try:
-        state = build_state(allow_guess=True)
-        return jsonify(state)
+        data = request.get_json(silent=True) or {}
+        return jsonify(service.next_question(session_id_of(data)))
+    except ApiError as e:
+        return error_response(e)
     except Exception as e:
         print(f"Error in api_next_question: {e}")
         import traceback
@@ -202,34 +153,18 @@ def api_next_question():
 def api_guess_feedback():
     """
     Receive feedback on the last guess.
-    Body: { "correct": bool }
+    Body: { "sessionId": str, "correct": bool }
     If incorrect, penalize that character so we don't repeat the same wrong guess.
     """
     if ai is None:
         return jsonify({"error": "AI engine not initialized. Check server logs."}), 500
     
     try:
-        global last_guess_name
-
         data = request.get_json(force=True) or {}
         correct = bool(data.get("correct", False))
-
-        if last_guess_name is None:
-            return jsonify({"error": "No active guess to score"}), 400
-
-        if correct:
-            # Boost the correct character's probability (optional)
-            ai.boost_character(last_guess_name, boost_factor=1000.0)
-            msg = "Great! I'll remember that."
-        else:
-            # Strongly penalize the wrong guess and continue
-            ai.penalize_wrong_guess(last_guess_name, penalty_factor=0.001)
-            msg = "Got it — updating my beliefs and continuing."
-
-        # Clear stored guess
-        last_guess_name = None
-
-        return jsonify({"ok": True, "message": msg})
+        return jsonify(service.guess_feedback(session_id_of(data), correct))
+    except ApiError as e:
+        return error_response(e)
     except Exception as e:
         print(f"Error in api_guess_feedback: {e}")
         import traceback
@@ -0,0 +1,326 @@
+# asgi_server.py
+"""
+ASGI API for the Indinator web UI (same routes and responses as api_server.py).
+Run with:  python asgi_server.py
+      or:  uvicorn asgi_server:app --host 0.0.0.0 --port 5000
+
+The event loop only handles HTTP; the game logic (indinator/api_service.py)
+runs on ENGINE_WORKERS engine processes. Each one memory-maps the model
+snapshot (data/model.snapshot), so the operating system shares the model's
+pages between them, and owns the sessions it created: a session id starts
+with its worker's number, and every request of that session is sent back to
+that worker. New games go to the least busy worker.
+
+A worker handles one request at a time. At most MAX_PENDING_PER_WORKER
+requests wait for a worker; beyond that the server answers 503 with a
+Retry-After header instead of queueing without bound.
+
+If an engine process dies (e.g. killed for using too much memory), the next
+request to it starts a new one. The games it held are lost: their requests
+get 404 (as for an expired session), other requests in flight get 503.
+
+Run a single server process (not `uvicorn --workers N`): sessions live in
+this process's engine workers, so throughput scales with ENGINE_WORKERS.
+"""
+
+import asyncio
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from contextlib import asynccontextmanager
+from pathlib import Path
+from typing import List, Optional
+
+from fastapi import FastAPI, Request
+from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import JSONResponse, Response
+from fastapi.staticfiles import StaticFiles
+
+from indinator.api_service import (
+    DEFAULT_SUGGESTIONS, SESSION_NOT_FOUND, SUGGEST_CACHE_SECONDS, _call_worker, _init_worker
+)
+
+# --- Setup --------------------------------------------------------------------
+
+project_root = Path(__file__).parent
+data_dir = project_root / "data"
+
+# Engine processes (default: one per CPU; override with INDINATOR_ENGINE_WORKERS)
+ENGINE_WORKERS = int(os.environ.get("INDINATOR_ENGINE_WORKERS", "0")) or os.cpu_count() or 1
+# Requests allowed to wait for one engine process before answering 503
+MAX_PENDING_PER_WORKER = 32
+# Retry-After sent with 503 responses
+RETRY_AFTER_SECONDS = 1
+
+
+# GameService methods that need an existing session (lost if its worker dies)
+SESSION_METHODS = ("answer", "next_question", "guess_feedback")
+
+
+class Overloaded(Exception):
+    """All request slots of an engine worker are taken."""
+
+
+class WorkerRestarted(Exception):
+    """The engine process died during the request (its sessions are lost) and was restarted."""
+
+
+class EngineWorker:
+    """One engine process, with the session id prefix it hands out and its queue depth."""
+
+    def __init__(self, index: int, context):
+        self.index = index
+        self.prefix = f"{index}."
+        self.pending = 0
+        self.context = context
+        self.executor = self._start_executor()
+
+    def _start_executor(self) -> ProcessPoolExecutor:
+        """Start the engine process (it loads the engine on its first request)."""
+        return ProcessPoolExecutor(
+            max_workers=1, mp_context=self.context,
+            initializer=_init_worker, initargs=(str(data_dir), self.prefix)
+        )
+
+    async def call(self, method: str, *args):
+        """
+        Run a GameService method on this worker.
+
+        If the engine process has died (e.g. killed for using too much memory),
+        a new one is started, so only the requests in flight and the sessions of
+        the old process are lost.
+
+        Returns:
+            (status, body) from the worker (see api_service._call_worker)
+
+        Raises:
+            Overloaded: if MAX_PENDING_PER_WORKER requests are already waiting
+            WorkerRestarted: if the engine process died
+        """
+        if self.pending >= MAX_PENDING_PER_WORKER:
+            raise Overloaded()
+        self.pending += 1
+        executor = self.executor
+        try:
+            loop = asyncio.get_running_loop()
+            return await loop.run_in_executor(executor, _call_worker, method, args)
+        except BrokenProcessPool:
+            # Requests in flight all fail together; only the first restarts the process
+            if self.executor is executor:
+                print(f"[WARN] Engine worker {self.index} died; restarting it (its sessions are lost)")
+                executor.shutdown(wait=False, cancel_futures=True)
+                self.executor = self._start_executor()
+            raise WorkerRestarted()
+        finally:
+            self.pending -= 1
+
+    def close(self):
+        self.executor.shutdown(wait=False, cancel_futures=True)
+
+
+class EnginePool:
+    """The engine workers, and which one serves a request."""
+
+    def __init__(self, num_workers: int):
+        # Fresh interpreters: forking a running event loop (and its threads) is unsafe
+        context = multiprocessing.get_context("spawn")
+        self.workers: List[EngineWorker] = [EngineWorker(i, context) for i in range(num_workers)]
+        self.model_version = ""
+
+    async def start(self):
+        """Load the engine in every worker (in parallel) before serving requests."""
+        versions = await asyncio.gather(*(worker.call("model_version") for worker in self.workers))
+        self.model_version = versions[0][1]
+
+    def least_busy(self) -> EngineWorker:
+        return min(self.workers, key=lambda worker: worker.pending)
+
+    def for_session(self, session_id: Optional[str]) -> EngineWorker:
+        """The worker owning a session (least busy one for new or foreign ids)."""
+        if session_id:
+            index, _, _ = session_id.partition(".")
+            if index.isdigit() and int(index) < len(self.workers):
+                return self.workers[int(index)]
+        return self.least_busy()
+
+    def close(self):
+        for worker in self.workers:
+            worker.close()
+
+
+# Set up by lifespan(); None if the engine failed to load
+engines: Optional[EnginePool] = None
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    global engines
+    pool = EnginePool(ENGINE_WORKERS)
+    try:
+        print(f"[INIT] Starting {ENGINE_WORKERS} engine workers...")
+        await pool.start()
+        engines = pool
+        print("[OK] AI engine ready!")
+    except Exception as e:
+        print(f"[ERROR] Error initializing AI engine: {e}")
+        import traceback
+        traceback.print_exc()
+        # engines will remain None, routes will check for this
+    try:
+        yield
+    finally:
+        engines = None
+        pool.close()
+
+
+app = FastAPI(lifespan=lifespan)
+app.add_middleware(CORSMiddleware, allow_origins=["*"], allow_methods=["*"], allow_headers=["*"])
+
+
+# --- Helpers ------------------------------------------------------------------
+
+
+async def read_json(request: Request) -> dict:
+    """The JSON request body ({} if missing or invalid)."""
+    try:
+        data = await request.json()
+    except ValueError:
+        return {}
+    return data if isinstance(data, dict) else {}
+
+
+def session_id_of(request: Request, data: dict) -> Optional[str]:
+    """
+    The caller's session id: the X-Session-Id header, or "sessionId" in the JSON body.
+    """
+    return request.headers.get("X-Session-Id") or data.get("sessionId")
+
+
+async def call_engine(worker: EngineWorker, failure: str, method: str, *args) -> Response:
+    """
+    Run a GameService method on a worker and turn the result into a response.
+
+    Args:
+        worker: Engine worker to run on
+        failure: Error message prefix for unexpected errors (e.g. "Failed to start game")
+        method: GameService method name
+        *args: Method arguments
+    """
+    try:
+        status, body = await worker.call(method, *args)
+    except Overloaded:
+        return retry_later("Server busy, please retry.")
+    except WorkerRestarted:
+        if method in SESSION_METHODS:
+            # The game lived in the dead process
+            return JSONResponse({"error": SESSION_NOT_FOUND}, status_code=404)
+        return retry_later("Game engine restarted, please retry.")
+    except Exception as e:
+        print(f"Error in {method}: {e}")
+        return JSONResponse({"error": f"{failure}: {str(e)}"}, status_code=500)
+    return JSONResponse(body, status_code=status)
+
+
+def retry_later(message: str) -> Response:
+    """503 response asking the client to retry after RETRY_AFTER_SECONDS."""
+    return JSONResponse(
+        {"error": message}, status_code=503,
+        headers={"Retry-After": str(RETRY_AFTER_SECONDS)}
+    )
+
+
+def engine_not_ready() -> Response:
+    return JSONResponse({"error": "AI engine not initialized. Check server logs."}, status_code=500)
+
+
+# --- Routes -------------------------------------------------------------------
+
+
+@app.get("/api/characters/suggest")
+async def api_suggest_characters(request: Request, q: str = "", limit: str = str(DEFAULT_SUGGESTIONS)):
+    """
+    Autocomplete a character name as the player types it.
+    Query: ?q=<text typed so far>&limit=<max suggestions, default 8>
+    Returns { "query": str, "suggestions": [{name}] }, cacheable (ETag = model version).
+    """
+    if engines is None:
+        return engine_not_ready()
+
+    etag = f'"{engines.model_version}"'
+    headers = {"Cache-Control": f"public, max-age={SUGGEST_CACHE_SECONDS}", "ETag": etag}
+    if etag in request.headers.get("If-None-Match", ""):
+        return Response(status_code=304, headers=headers)
+
+    response = await call_engine(engines.least_busy(), "Failed to suggest characters", "suggest", q, limit)
+    if response.status_code == 200:
+        response.headers.update(headers)
+    return response
+
+
+@app.post("/api/start")
+async def api_start(request: Request):
+    """
+    Start a new game (or restart) and return the initial state.
+    Reuses the caller's session if it is still live, otherwise creates one.
+    The returned "sessionId" must be sent with every following request.
+    """
+    if engines is None:
+        return engine_not_ready()
+    data = await read_json(request)
+    session_id = session_id_of(request, data)
+    return await call_engine(engines.for_session(session_id), "Failed to start game", "start", session_id)
+
+
+@app.post("/api/answer")
+async def api_answer(request: Request):
+    """
+    Submit an answer to the current question.
+    Body: { "sessionId": str, "questionId": int, "answer": "yes" | "no" | "probably_yes" | ... }
+    """
+    if engines is None:
+        return engine_not_ready()
+    data = await read_json(request)
+    session_id = session_id_of(request, data)
+    return await call_engine(engines.for_session(session_id), "Failed to process answer", "answer",
+                             session_id, data.get("questionId"), data.get("answer"))
+
+
+@app.post("/api/next-question")
+async def api_next_question(request: Request):
+    """
+    Get the next question without changing probabilities.
+    Used after a wrong guess (penalty already applied).
+    """
+    if engines is None:
+        return engine_not_ready()
+    data = await read_json(request)
+    session_id = session_id_of(request, data)
+    return await call_engine(engines.for_session(session_id), "Failed to get next question", "next_question",
+                             session_id)
+
+
+@app.post("/api/guess-feedback")
+async def api_guess_feedback(request: Request):
+    """
+    Receive feedback on the last guess.
+    Body: { "sessionId": str, "correct": bool }
+    If incorrect, penalize that character so we don't repeat the same wrong guess.
+    """
+    if engines is None:
+        return engine_not_ready()
+    data = await read_json(request)
+    session_id = session_id_of(request, data)
+    return await call_engine(engines.for_session(session_id), "Failed to process feedback", "guess_feedback",
+                             session_id, bool(data.get("correct", False)))
+
+
+# Serve the main UI page (after the API routes, which take precedence)
+app.mount("/", StaticFiles(directory=str(project_root / "ui"), html=True), name="ui")
+
+
+if __name__ == "__main__":
+    import uvicorn
+
+    # Listen on all interfaces to handle both IPv4 and IPv6 connections
+    uvicorn.run(app, host="0.0.0.0", port=5000)
@@ -1,6 +1,7 @@
 // API service for backend communication
 
 export interface GameState {
+  sessionId: string;
   question: { id: number; text: string } | null;
   questionIndex: number | null;
   questionNumber: number;
@@ -15,6 +16,17 @@ export interface ApiError {
 
 const API_BASE = "/api";
 
+// Identifies this player's game on the server (issued by /api/start)
+let sessionId: string | null = null;
+
+/**
+ * Request headers, including the current game session
+ */
+const requestHeaders = (): Record<string, string> => ({
+  "Content-Type": "application/json",
+  ...(sessionId ? { "X-Session-Id": sessionId } : {}),
+});
+
 /**
  * Map frontend answer values to backend format
  */
@@ -53,9 +65,7 @@ export const startGame = async (): Promise<GameState> => {
   try {
     const response = await fetch(`${API_BASE}/start`, {
       method: "POST",
-      headers: {
-        "Content-Type": "application/json",
-      },
+      headers: requestHeaders(),
     });
 
     if (!response.ok) {
@@ -65,7 +75,9 @@ export const startGame = async (): Promise<GameState> => {
       throw new Error(error.error || "Failed to start game");
     }
 
-    return parseJsonResponse<GameState>(response);
+    const state = await parseJsonResponse<GameState>(response);
+    sessionId = state.sessionId;
+    return state;
   } catch (error) {
     if (error instanceof TypeError && error.message.includes("fetch")) {
       throw new Error("Cannot connect to backend server. Make sure it's running on http://localhost:5000");
@@ -85,9 +97,7 @@ export const submitAnswer = async (
 
   const response = await fetch(`${API_BASE}/answer`, {
     method: "POST",
-    headers: {
-      "Content-Type": "application/json",
-    },
+    headers: requestHeaders(),
     body: JSON.stringify({
       questionId,
       answer: backendAnswer,
@@ -110,9 +120,7 @@ export const submitAnswer = async (
 export const getNextQuestion = async (): Promise<GameState> => {
   const response = await fetch(`${API_BASE}/next-question`, {
     method: "POST",
-    headers: {
-      "Content-Type": "application/json",
-    },
+    headers: requestHeaders(),
   });
 
   if (!response.ok) {
@@ -133,9 +141,7 @@ export const submitGuessFeedback = async (
 ): Promise<{ ok: boolean; message: string }> => {
   const response = await fetch(`${API_BASE}/guess-feedback`, {
     method: "POST",
-    headers: {
-      "Content-Type": "application/json",
-    },
+    headers: requestHeaders(),
     body: JSON.stringify({ correct }),
   });
 
@@ -0,0 +1,323 @@
+"""
+Web API Service
+Game logic shared by the web servers (api_server.py on Flask, asgi_server.py
+on ASGI): session handling, answer mapping and the JSON state sent to the
+frontend. The servers only translate HTTP requests into GameService calls
+and ApiError into error responses.
+
+The ASGI server runs each GameService in an engine worker process
+(_init_worker / _call_worker); the Flask server uses one in-process.
+"""
+
+import contextlib
+import io
+import sys
+from pathlib import Path
+from typing import Dict, Optional
+
+try:
+    from .decision_tree_engine import DecisionTreeAI
+    from .guess_policy import GuessPolicy
+    from .session import SessionStore
+except ImportError:
+    from indinator.decision_tree_engine import DecisionTreeAI
+    from indinator.guess_policy import GuessPolicy
+    from indinator.session import SessionStore
+
+# Games idle for longer than this are dropped
+SESSION_TTL_SECONDS = 30 * 60
+# Upper bound on concurrent games kept in memory (least recently used are evicted)
+MAX_SESSIONS = 10000
+# Upper bound on the estimated memory of all games (a fresh game is ~5 KB with the
+# current catalog; the cap keeps memory bounded if the catalog grows)
+MAX_SESSION_BYTES = 64 * 1024 * 1024
+
+# Question selection strategy of the web game (one of QUESTION_STRATEGIES; the
+# 'ensemble' trees are loaded from the snapshot, see scripts/build_snapshot.py)
+QUESTION_STRATEGY = 'tree'
+
+# When the web game guesses, and how strongly it reacts to guess feedback
+# (tune with scripts/sweep.py)
+GUESS_POLICY = GuessPolicy(threshold=0.85, penalty_factor=0.001, boost_factor=1000.0)
+
+# Name autocompletion: suggestions per request (default / upper bound), and how long
+# clients and proxies may cache them (they only change when the model is rebuilt)
+DEFAULT_SUGGESTIONS = 8
+MAX_SUGGESTIONS = 20
+SUGGEST_CACHE_SECONDS = 24 * 60 * 60
+
+# UI answer code -> (engine answer, likelihood if correct, likelihood if incorrect)
+ANSWER_CODES = {
+    'yes': ('yes', 0.95, 0.05),
+    'probably_yes': ('probably', 0.75, 0.25),
+    'no': ('no', 0.95, 0.05),
+    'probably_no': ('probably_not', 0.75, 0.25),
+    'unknown': ('dont_know', 0.95, 0.05),
+}
+
+SESSION_NOT_FOUND = "Unknown or expired session. Start a new game."
+
+# Per-process service set up by _init_worker
+_worker_service = None
+
+
+class ApiError(Exception):
+    """A request the service rejects (sent to the client as {"error": message})."""
+
+    def __init__(self, status: int, message: str):
+        super().__init__(status, message)
+        self.status = status
+        self.message = message
+
+
+def create_engine(data_dir: Path, quiet: bool = False) -> DecisionTreeAI:
+    """
+    Load the web game's engine from the data directory.
+
+    Args:
+        data_dir: Directory with traits_flat.json, questions.json and model.snapshot
+        quiet: Suppress the engine's progress output ("[WARN]" lines, e.g. an unusable
+               snapshot, still go to stderr)
+
+    Returns:
+        DecisionTreeAI using QUESTION_STRATEGY and GUESS_POLICY
+    """
+    output = io.StringIO()
+    try:
+        with contextlib.redirect_stdout(output) if quiet else contextlib.nullcontext():
+            return DecisionTreeAI(
+                traits_file=str(data_dir / "traits_flat.json"),
+                questions_file=str(data_dir / "questions.json"),
+                characters_file=str(data_dir / "characters.json"),
+                # Precompiled model (scripts/build_snapshot.py); falls back to JSON if missing/stale
+                snapshot_file=str(data_dir / "model.snapshot"),
+                question_strategy=QUESTION_STRATEGY,
+                guess_policy=GUESS_POLICY,
+            )
+    finally:
+        for line in output.getvalue().splitlines():
+            if line.startswith("[WARN]"):
+                print(line, file=sys.stderr)
+
+
+def build_state(game, session_id: str, allow_guess: bool = True) -> Dict:
+    """
+    Build the JSON state returned to the frontend.
+    Includes: next question (if any), entropy, top candidates, and guess (if ready).
+
+    `game` is the engine bound to the player's session state (see DecisionTreeAI.for_state).
+    """
+    # Basic stats
+    entropy = game.entropy(game.probabilities)
+    top_candidates = [
+        {"name": name, "probability": float(prob)}
+        for name, prob in game.get_top_characters(8)
+    ]
+
+    # Decide whether to guess
+    guess = None
+    game.state.last_guess = None
+    if allow_guess and game.should_make_guess():
+        name, prob = game.get_best_guess()
+        guess = {"name": name, "probability": float(prob)}
+        game.state.last_guess = name
+
+    # If we're not making a guess (or want to keep asking), pick the next question
+    question = None
+    question_idx = None
+    if guess is None:
+        q_idx = game.select_best_question()
+        if q_idx is not None:
+            # Validate question index
+            if 0 <= q_idx < len(game.questions):
+                q_obj = game.questions[q_idx]
+                question = {
+                    "id": q_idx,
+                    "text": q_obj.get("question", ""),
+                }
+                question_idx = q_idx
+            else:
+                print(f"Warning: Invalid question index {q_idx} (total questions: {len(game.questions)})")
+
+    # Question number = asked so far + 1 if we're presenting a new one
+    questions_asked = len(game.asked_questions)
+    question_number = questions_asked + (1 if question is not None else 0)
+
+    return {
+        "sessionId": session_id,          # send back on every request
+        "question": question,             # {id, text} or null
+        "questionIndex": question_idx,    # same as id; included for clarity
+        "questionNumber": question_number,
+        "entropy": float(entropy),
+        "topCandidates": top_candidates,
+        "guess": guess,                   # {name, probability} or null
+    }
+
+
+class GameService:
+    """
+    The web game's operations on one shared engine and its session store.
+
+    Thread-safe: requests of the same session are serialized by its lock,
+    different sessions run independently.
+    """
+
+    def __init__(self, ai: DecisionTreeAI, ttl_seconds: float = SESSION_TTL_SECONDS,
+                 max_sessions: int = MAX_SESSIONS, max_bytes: Optional[int] = MAX_SESSION_BYTES,
+                 id_prefix: str = ''):
+        """
+        Initialize the service.
+
+        Args:
+            ai: Shared, read-only engine (each game plays on a for_state view)
+            ttl_seconds: Idle time after which a session expires
+            max_sessions: Maximum number of live sessions
+            max_bytes: Cap on the estimated memory of all live sessions (None = no cap)
+            id_prefix: Prefix of the session ids this service hands out
+        """
+        self.ai = ai
+        self.sessions = SessionStore(
+            ai.new_state,
+            ttl_seconds=ttl_seconds,
+            max_sessions=max_sessions,
+            max_bytes=max_bytes,
+            id_prefix=id_prefix,
+        )
+
+    def model_version(self) -> str:
+        """Version of the loaded model (source data hash), e.g. for HTTP ETags."""
+        return self.ai.source_hash or ""
+
+    def _session(self, session_id: Optional[str]):
+        """Look up a live session (ApiError 404 if missing, unknown or expired)."""
+        session = self.sessions.get(session_id)
+        if session is None:
+            raise ApiError(404, SESSION_NOT_FOUND)
+        return session
+
+    def start(self, session_id: Optional[str] = None) -> Dict:
+        """
+        Start a new game (or restart) and return the initial state.
+        Reuses the session if it is still live, otherwise creates one.
+        """
+        session = self.sessions.get(session_id)
+        if session is None:
+            session = self.sessions.create()
+
+        with session.lock:
+            self.sessions.reset(session)
+            game = self.ai.for_state(session.state)
+            return build_state(game, session.session_id, allow_guess=False)  # never guess immediately
+
+    def answer(self, session_id: Optional[str], question_id, answer_code) -> Dict:
+        """
+        Apply an answer to a question and return the next state.
+
+        Args:
+            session_id: Caller's session
+            question_id: Question index (int or numeric string)
+            answer_code: UI answer code (see ANSWER_CODES)
+        """
+        session = self._session(session_id)
+        if question_id is None or answer_code is None:
+            raise ApiError(400, "Missing 'questionId' or 'answer'")
+
+        try:
+            q_idx = int(question_id)
+        except (TypeError, ValueError):
+            raise ApiError(400, "Invalid 'questionId'")
+        answer_code = str(answer_code)
+        if answer_code not in ANSWER_CODES:
+            raise ApiError(400, f"Invalid answer '{answer_code}'")
+        user_answer, lk_correct, lk_incorrect = ANSWER_CODES[answer_code]
+
+        with session.lock:
+            game = self.ai.for_state(session.state)
+
+            # Update probabilities (DecisionTreeAI handles "dont_know" by not updating)
+            game.update_probabilities(
+                q_idx,
+                user_answer,
+                likelihood_correct=lk_correct,
+                likelihood_incorrect=lk_incorrect,
+            )
+
+            return build_state(game, session.session_id, allow_guess=True)
+
+    def next_question(self, session_id: Optional[str]) -> Dict:
+        """Get the next state without changing probabilities (e.g. after a wrong guess)."""
+        session = self._session(session_id)
+        with session.lock:
+            game = self.ai.for_state(session.state)
+            return build_state(game, session.session_id, allow_guess=True)
+
+    def guess_feedback(self, session_id: Optional[str], correct: bool) -> Dict:
+        """
+        Score the last guess: boost it if correct, penalize it otherwise.
+        """
+        session = self._session(session_id)
+        with session.lock:
+            game = self.ai.for_state(session.state)
+            last_guess_name = game.state.last_guess
+            if last_guess_name is None:
+                raise ApiError(400, "No active guess to score")
+
+            if correct:
+                # Boost the correct character's probability (optional)
+                game.boost_character(last_guess_name)
+                msg = "Great! I'll remember that."
+            else:
+                # Strongly penalize the wrong guess and continue
+                game.penalize_wrong_guess(last_guess_name)
+                msg = "Got it — updating my beliefs and continuing."
+
+            # Clear stored guess
+            game.state.last_guess = None
+
+        return {"ok": True, "message": msg}
+
+    def suggest(self, query: str, limit=DEFAULT_SUGGESTIONS) -> Dict:
+        """
+        Autocomplete a character name (no session needed).
+
+        Args:
+            query: Text typed so far
+            limit: Maximum suggestions (int or numeric string, capped at MAX_SUGGESTIONS)
+
+        Returns:
+            {"query", "suggestions": [{name}]}
+        """
+        try:
+            limit = int(limit)
+        except (TypeError, ValueError):
+            raise ApiError(400, "Invalid 'limit'")
+        limit = max(0, min(limit, MAX_SUGGESTIONS))
+
+        names = self.ai.suggest_characters(query, limit)
+        return {"query": query, "suggestions": [{"name": name} for name in names]}
+
+
+def _init_worker(data_dir: str, id_prefix: str):
+    """
+    Load the engine and start this worker process's game service.
+
+    Args:
+        data_dir: Data directory (the model snapshot in it is memory-mapped, so
+                  all workers share its pages)
+        id_prefix: Session id prefix of this worker (routes a session's requests back to it)
+    """
+    global _worker_service
+    _worker_service = GameService(create_engine(Path(data_dir), quiet=True), id_prefix=id_prefix)
+
+
+def _call_worker(method: str, args: tuple):
+    """
+    Run a GameService method in this worker process.
+
+    Returns:
+        (status, body): 200 and the method's result, or the ApiError status and {"error": message}
+    """
+    try:
+        return 200, getattr(_worker_service, method)(*args)
+    except ApiError as e:
+        return e.status, {"error": e.message}
@@ -11,18 +11,93 @@ Methods to implement:
     - reset()
 """
 
+import copy
 import json
 import math
 import numpy as np
 from pathlib import Path
-from typing import Dict, List, Tuple, Optional, Set
-from sklearn.tree import DecisionTreeClassifier
+from typing import Dict, List, Tuple, Optional, Set, Union
 
 # Handle both relative and absolute imports
 try:
+    from .bitset import PackedTraitMatrix
     from .feature_extractor import FeatureExtractor
+    from .guess_policy import GuessPolicy
+    from .name_index import MIN_MATCH_SCORE, NameIndex
+    from .opening_book import OPENING_QUESTIONS, OpeningBook
+    from .transposition import DEFAULT_CACHE_BYTES, TranspositionCache
+    from .redundancy import RedundancyRules
+    from .scoring import PosteriorScorer
+    from .session import GameState
+    from .snapshot import (
+        ModelSnapshot, SnapshotError, encode_snapshot, load_snapshot, source_hash, write_snapshot
+    )
+    from .tree_runtime import FlatTree
+    from .trait_index import InvertedTraitIndex
+    from .information_gain import InformationGainSelector, _entropy_terms
 except ImportError:
+    from indinator.bitset import PackedTraitMatrix
     from indinator.feature_extractor import FeatureExtractor
+    from indinator.guess_policy import GuessPolicy
+    from indinator.name_index import MIN_MATCH_SCORE, NameIndex
+    from indinator.opening_book import OPENING_QUESTIONS, OpeningBook
+    from indinator.transposition import DEFAULT_CACHE_BYTES, TranspositionCache
+    from indinator.redundancy import RedundancyRules
+    from indinator.scoring import PosteriorScorer
+    from indinator.session import GameState
+    from indinator.snapshot import (
+        ModelSnapshot, SnapshotError, encode_snapshot, load_snapshot, source_hash, write_snapshot
+    )
+    from indinator.tree_runtime import FlatTree
+    from indinator.trait_index import InvertedTraitIndex
+    from indinator.information_gain import InformationGainSelector, _entropy_terms
+
+# Available probability scoring implementations
+# - 'vectorized': NumPy word operations over the packed trait matrix (default)
+# - 'incremental': running per-character accumulators, one feature column per answer
+# - 'reference': original per-character Python loop (for cross-checking)
+SCORING_MODES = ('vectorized', 'incremental', 'reference')
+
+# Available question selection strategies (after the opening priority questions)
+# - 'tree': walk the Decision Tree, fall back to feature importance (default)
+# - 'information_gain': expected entropy reduction over the full probability vector
+# - 'soft_tree': walk the tree down both branches of uncertain answers, weighted by
+#   answer confidence, and ask the reachable split with the best weighted gain
+# - 'ensemble': walk an ensemble of randomized trees and ask the most voted frontier feature
+QUESTION_STRATEGIES = ('tree', 'information_gain', 'soft_tree', 'ensemble')
+
+# Default number of trees for the 'ensemble' strategy
+DEFAULT_ENSEMBLE_SIZE = 16
+
+# Tie-break order of question groups in the opening priority selection (others: 9)
+BROAD_GROUP_ORDER = {
+    'source': 0,
+    'world': 1,
+    'setting': 2,
+    'identity': 3,
+    'role': 4,
+    'affiliation': 5,
+    'abilities': 6,
+    'appearance': 7,
+    'personality': 8
+}
+
+# Redundancy rule table looked up next to questions.json (see redundancy.py)
+REDUNDANCY_RULES_FILENAME = 'redundancy_rules.json'
+
+# Marks a transposition cache miss (None is a valid cached "no question left")
+_NOT_CACHED = object()
+
+
+def _state_attribute(name: str) -> property:
+    """Create a property that reads/writes an attribute of the engine's current GameState."""
+    def getter(self):
+        return getattr(self.state, name)
+    
+    def setter(self, value):
+        setattr(self.state, name, value)
+    
+    return property(getter, setter, doc=f"Current game's {name} (stored on self.state)")
 
 
 class DecisionTreeAI:
@@ -30,11 +105,20 @@ class DecisionTreeAI:
     Decision Tree AI Engine for character guessing.
     
     Uses scikit-learn's DecisionTreeClassifier to learn optimal question selection
-    based on information gain (entropy-based splitting).
+    based on information gain (entropy-based splitting). scikit-learn is only
+    needed for training; gameplay walks the exported FlatTree arrays.
     """
     
     def __init__(self, traits_file: str, questions_file: str, characters_file: str = None,
-                 max_depth: int = 20, min_samples_split: int = 2):
+                 max_depth: int = 20, min_samples_split: int = 2,
+                 scoring_mode: str = 'vectorized',
+                 snapshot_file: Union[str, ModelSnapshot, None] = None,
+                 question_strategy: str = 'tree',
+                 answer_likelihoods: Optional[Dict[str, Tuple[float, float]]] = None,
+                 guess_policy: Optional[GuessPolicy] = None,
+                 cache_bytes: Optional[int] = DEFAULT_CACHE_BYTES,
+                 redundancy_rules_file: Optional[str] = None,
+                 ensemble_size: int = DEFAULT_ENSEMBLE_SIZE):
         """
         Initialize the Decision Tree AI engine.
         
@@ -44,87 +128,456 @@ class DecisionTreeAI:
             characters_file: Path to characters.json (optional, for compatibility)
             max_depth: Maximum depth of the decision tree (default: 20)
             min_samples_split: Minimum samples required to split a node (default: 2)
+            scoring_mode: Probability scoring implementation, one of SCORING_MODES
+                         (default: 'vectorized'; 'reference' uses the original loop)
+            snapshot_file: Optional path to a precompiled model snapshot (see snapshot.py).
+                          Used instead of parsing JSON and training when it is valid
+                          for the current data files; otherwise the model is built as usual.
+                          An already read ModelSnapshot (e.g. from shared memory) is also accepted.
+            question_strategy: Question selection strategy, one of QUESTION_STRATEGIES
+                              (default: 'tree')
+            answer_likelihoods: Soft answer model for 'information_gain', mapping answer ->
+                               (P(answer | no trait), P(answer | trait)); e.g.
+                               information_gain.DEFAULT_ANSWER_LIKELIHOODS. None = exact answers.
+            guess_policy: Guessing thresholds and guess feedback factors
+                         (default: GuessPolicy(), the original hand-tuned values)
+            cache_bytes: Memory budget of the transposition cache shared by all games
+                        (see transposition.py; default: 8 MB, 0 or None = no cache)
+            redundancy_rules_file: Rules for skipping redundant questions (see redundancy.py;
+                                  default: redundancy_rules.json next to questions_file)
+            ensemble_size: Number of randomized trees for question_strategy='ensemble'
         """
-        # Initialize feature extractor
+        if scoring_mode not in SCORING_MODES:
+            raise ValueError(f"Unknown scoring_mode '{scoring_mode}' (expected one of {SCORING_MODES})")
+        if question_strategy not in QUESTION_STRATEGIES:
+            raise ValueError(f"Unknown question_strategy '{question_strategy}' (expected one of {QUESTION_STRATEGIES})")
+        self.scoring_mode = scoring_mode
+        self.question_strategy = question_strategy
+        self.answer_likelihoods = answer_likelihoods
+        self.guess_policy = guess_policy or GuessPolicy()
+        self.traits_file = traits_file
+        self.questions_file = questions_file
+        self.max_depth = max_depth
+        self.min_samples_split = min_samples_split
+        self.cache_bytes = cache_bytes
+        self.ensemble_size = ensemble_size
+        self.redundancy_rules_file = redundancy_rules_file or str(
+            Path(questions_file).parent / REDUNDANCY_RULES_FILENAME
+        )
+        
+        # Fast path: memory-map a precompiled snapshot (no JSON parsing, no training)
+        snapshot = None
+        if snapshot_file:
+            snapshot = self._open_snapshot(snapshot_file, traits_file, questions_file)
+        
+        if snapshot is not None:
+            self._init_from_snapshot(snapshot)
+        else:
+            self._init_from_source(traits_file, questions_file)
+        
+        self.num_characters = len(self.characters)
+        
+        # Name -> character index, and fuzzy name lookup for revealed answers (see find_character)
+        self.character_ids = {name: idx for idx, name in enumerate(self.characters)}
+        self.name_index = NameIndex(self.characters)
+        
+        # Vectorized scorer over the packed trait matrix (rows follow self.characters)
+        self.scorer = PosteriorScorer(self.trait_matrix, self.feature_extractor.feature_names, self.trait_index)
+        
+        # Feature index asked by each question (-1 if the question has no trait)
+        self.question_features = self.feature_extractor.question_feature
+        
+        # Questions askable in a fresh game (those about a trait); each game narrows
+        # its own copy as answers come in (see _update_eligible_questions)
+        self.initial_eligible_questions = np.array(
+            [bool(question.get('trait', '')) for question in self.questions], dtype=bool
+        )
+        
+        # Questions in opening priority order: priority, then broadness (stable by index)
+        self.priority_order = np.array(sorted(
+            range(len(self.questions)),
+            key=lambda q_idx: (self.questions[q_idx].get('priority', 99),
+                               BROAD_GROUP_ORDER.get(self.questions[q_idx].get('group', ''), 9))
+        ), dtype=np.int64)
+        
+        # Expected-information-gain scorer (only built for that strategy)
+        self.gain_selector = None
+        if question_strategy == 'information_gain':
+            self.gain_selector = InformationGainSelector(self.X_train, answer_likelihoods)
+        
+        # Randomized trees voting on the next question (only built for that strategy;
+        # loaded from the snapshot when it has a matching ensemble)
+        self.ensemble = None
+        if question_strategy == 'ensemble':
+            if snapshot is not None and snapshot.metadata['params'].get('ensemble_size') == ensemble_size:
+                self.ensemble = [
+                    FlatTree.from_arrays({
+                        name: snapshot[f'ensemble{i}_{name}'] for name in FlatTree.ARRAY_NAMES
+                    })
+                    for i in range(ensemble_size)
+                ]
+            else:
+                if snapshot is not None:
+                    print(f"[WARN] Model snapshot has no ensemble of {ensemble_size} trees; training one "
+                          f"(rebuild it with scripts/build_snapshot.py --ensemble-size {ensemble_size})")
+                self.ensemble = self._train_ensemble(self.X_train, self.y_train)
+        
+        # Characters passing through each tree node, as (node, character) pairs so a
+        # bincount gives every node's probability mass (only built for the soft tree strategy)
+        self.membership_nodes = None
+        self.membership_characters = None
+        if question_strategy == 'soft_tree':
+            self.membership_nodes, self.membership_characters = self.flat_tree.node_membership(self.X_train)
+        
+        # Initialize game state (will be reset at start of each game)
+        self.reset()
+        
+        # Posteriors and next questions shared between games in the same position
+        self.transposition_cache = TranspositionCache(cache_bytes) if cache_bytes else None
+        
+        # Precomputed opening questions (loaded from the snapshot, or played out now)
+        if snapshot is not None and 'opening_book' in snapshot.metadata:
+            self.opening_book = OpeningBook.from_dict(snapshot.metadata['opening_book'])
+        else:
+            self.opening_book = OpeningBook.build(self)
+    
+    def _init_from_source(self, traits_file: str, questions_file: str):
+        """
+        Build the model from the JSON data files and train the Decision Tree.
+        
+        Args:
+            traits_file: Path to traits_flat.json
+            questions_file: Path to questions.json
+        """
+        # Initialize feature extractor (parses both JSON files once)
         print("[INIT] Initializing feature extractor...")
         self.feature_extractor = FeatureExtractor(traits_file, questions_file)
         
-        # Load questions for compatibility with existing code
-        self.questions = self._load_json(questions_file)
+        # Share the parsed questions with the feature extractor
+        self.questions = self.feature_extractor.questions
         
-        # Get character list
-        self.characters = sorted(self.feature_extractor.traits.keys())
-        self.num_characters = len(self.characters)
+        # Hash of the source data (stored in snapshots to detect stale ones)
+        self.source_hash = source_hash(*self._source_paths(traits_file, questions_file))
+        
+        # Compile the redundancy rules into question bitmasks
+        self.redundancy = self._compile_redundancy_rules()
         
         # Build training data
         print("[INIT] Building training data...")
         X, y, character_list = self.feature_extractor.build_feature_matrix()
         
-        # Store training data
-        self.X_train = X
+        # Store training data (character_list is sorted, same as the traits keys)
+        self._X_train = X
+        self.trait_matrix = PackedTraitMatrix.from_dense(X)
+        
+        # Inverted index: trait -> sorted ids of the characters that have it
+        self.trait_index = InvertedTraitIndex.from_matrix(self.trait_matrix)
         self.y_train = y
         self.character_list = character_list
+        self.characters = list(character_list)
         
         # Train Decision Tree
         print("[INIT] Training Decision Tree...")
-        self.tree = DecisionTreeClassifier(
-            max_depth=max_depth,
-            min_samples_split=min_samples_split,
+        self.tree = self._train_tree(X, y)
+        
+        # Flat copy of the tree's arrays, used for all traversal during gameplay
+        self.flat_tree = FlatTree.from_sklearn(self.tree)
+        
+        print(f"[OK] Decision Tree trained:")
+        print(f"   Depth: {self.flat_tree.get_depth()}")
+        print(f"   Leaves: {self.flat_tree.get_n_leaves()}")
+        print(f"   Features used: {np.sum(self.flat_tree.feature_importances_ > 0)}")
+    
+    def _train_tree(self, X: np.ndarray, y: np.ndarray):
+        """
+        Fit the scikit-learn Decision Tree.
+        
+        scikit-learn is imported here rather than at module level: it is slow to
+        import and only needed when training, not when serving from a snapshot.
+        
+        Args:
+            X: Feature matrix (n_characters × n_features)
+            y: Character labels
+            
+        Returns:
+            Fitted DecisionTreeClassifier
+        """
+        from sklearn.tree import DecisionTreeClassifier
+        
+        tree = DecisionTreeClassifier(
+            max_depth=self.max_depth,
+            min_samples_split=self.min_samples_split,
             criterion='entropy',  # Use information gain (ID3/C4.5 style)
             random_state=42  # For reproducibility
         )
+        tree.fit(X, y)
+        return tree
+    
+    def _train_ensemble(self, X: np.ndarray, y: np.ndarray) -> List[FlatTree]:
+        """
+        Fit ensemble_size randomized trees for the 'ensemble' strategy.
         
-        self.tree.fit(X, y)
+        Every tree sees all characters (no bootstrap, so each still separates
+        every character) but considers a random 80% of the features at each
+        split, so the trees disagree about which trait to ask next.
+        Trees are fitted in parallel on all CPUs.
         
-        print(f"[OK] Decision Tree trained:")
-        print(f"   Depth: {self.tree.get_depth()}")
-        print(f"   Leaves: {self.tree.get_n_leaves()}")
-        print(f"   Features used: {np.sum(self.tree.feature_importances_ > 0)}")
+        Args:
+            X: Feature matrix (n_characters × n_features)
+            y: Character labels
+            
+        Returns:
+            List of FlatTree
+        """
+        from sklearn.ensemble import RandomForestClassifier
+        
+        print(f"[INIT] Training {self.ensemble_size} randomized trees...")
+        forest = RandomForestClassifier(
+            n_estimators=self.ensemble_size,
+            max_depth=self.max_depth,
+            min_samples_split=self.min_samples_split,
+            criterion='entropy',
+            max_features=0.8,
+            bootstrap=False,
+            n_jobs=-1,
+            random_state=42  # For reproducibility
+        )
+        forest.fit(X, y)
+        return [FlatTree.from_sklearn(estimator) for estimator in forest.estimators_]
+    
+    def _open_snapshot(self, snapshot_file: Union[str, ModelSnapshot], traits_file: str,
+                       questions_file: str) -> Optional[ModelSnapshot]:
+        """
+        Load a snapshot if it matches the current data files and tree parameters.
         
-        # Initialize game state (will be reset at start of each game)
-        self.reset()
+        Args:
+            snapshot_file: Path to the snapshot, or an already read ModelSnapshot
+            traits_file: Path to traits_flat.json (for the staleness check)
+            questions_file: Path to questions.json (for the staleness check)
+            
+        Returns:
+            ModelSnapshot, or None if it is missing, invalid or stale
+        """
+        traits_path = self._resolve_path(traits_file)
+        questions_path = self._resolve_path(questions_file)
+        try:
+            if traits_path.exists() and questions_path.exists():
+                expected_hash = source_hash(*self._source_paths(traits_file, questions_file))
+            else:
+                # Deployed without the JSON sources - trust the snapshot as-is
+                print("[WARN] Source data not found; using snapshot without validation")
+                expected_hash = None
+            if isinstance(snapshot_file, ModelSnapshot):
+                snapshot = snapshot_file
+                if expected_hash is not None and snapshot.source_hash != expected_hash:
+                    raise SnapshotError("Snapshot is stale (source data changed); rebuild it")
+            else:
+                snapshot = load_snapshot(snapshot_file, expected_hash)
+        except SnapshotError as e:
+            print(f"[WARN] Not using model snapshot: {e}")
+            return None
         
-        # Cache source traits for redundancy checks (skip asking multiple source questions once one is confirmed)
-        self.source_traits = [
-            trait for trait in self.feature_extractor.trait_to_index
-            if trait.startswith('source_')
-        ]
+        params = snapshot.metadata.get('params', {})
+        if params.get('max_depth') != self.max_depth or params.get('min_samples_split') != self.min_samples_split:
+            print("[WARN] Not using model snapshot: built with different tree parameters")
+            return None
+        
+        return snapshot
+    
+    def _init_from_snapshot(self, snapshot: ModelSnapshot):
+        """
+        Set up the model from a memory-mapped snapshot.
+        
+        Args:
+            snapshot: Validated snapshot (see _open_snapshot)
+        """
+        print("[INIT] Loading model snapshot...")
+        metadata = snapshot.metadata
+        
+        self.questions = metadata['questions']
+        self.characters = list(metadata['characters'])
+        self.source_hash = snapshot.source_hash
+        
+        # Packed trait matrix is a read-only view into the mapped file
+        # (the dense X_train is only unpacked if something asks for it)
+        self.trait_matrix = PackedTraitMatrix(snapshot['X_bits'], len(metadata['feature_names']))
+        if 'trait_index_indptr' in snapshot.arrays:
+            self.trait_index = InvertedTraitIndex(
+                *(snapshot['trait_index_' + name] for name in InvertedTraitIndex.ARRAY_NAMES),
+                self.trait_matrix.num_characters
+            )
+        else:
+            self.trait_index = InvertedTraitIndex.from_matrix(self.trait_matrix)
+        self.feature_extractor = FeatureExtractor.from_arrays(
+            metadata['feature_names'], self.questions, self.characters, self.trait_matrix
+        )
+        if 'redundancy_yes_masks' in snapshot.arrays:
+            self.redundancy = RedundancyRules.from_arrays(
+                {name: snapshot['redundancy_' + name] for name in RedundancyRules.ARRAY_NAMES},
+                len(self.questions)
+            )
+        else:
+            self.redundancy = self._compile_redundancy_rules()
+        self._X_train = None
+        self.y_train = np.array(self.characters)
+        self.character_list = list(self.characters)
+        
+        # No sklearn estimator - gameplay only needs the flat tree arrays
+        self.tree = None
+        self.flat_tree = FlatTree.from_arrays({
+            name: snapshot['tree_' + name] for name in FlatTree.ARRAY_NAMES
+        })
+        
+        print(f"[OK] Snapshot loaded:")
+        print(f"   Characters: {len(self.characters)}")
+        print(f"   Features (traits): {self.trait_matrix.num_features}")
+        print(f"   Questions: {len(self.questions)}")
+        print(f"   Tree nodes: {self.flat_tree.node_count}")
+    
+    def save_snapshot(self, snapshot_file: str):
+        """
+        Write this model to a snapshot file for fast startup.
+        
+        Stores the packed trait matrix and its inverted index, the trait/question index maps and the
+        flattened tree arrays, tagged with the source data hash.
+        
+        Args:
+            snapshot_file: Output path
+        """
+        write_snapshot(snapshot_file, self.source_hash, *self._snapshot_contents())
+    
+    def snapshot_bytes(self) -> bytes:
+        """
+        Serialize this model as snapshot bytes (same contents as save_snapshot writes).
+        
+        Returns:
+            Snapshot bytes, readable with snapshot.read_snapshot()
+        """
+        return encode_snapshot(self.source_hash, *self._snapshot_contents())
+    
+    def _snapshot_contents(self) -> Tuple[Dict, Dict[str, np.ndarray]]:
+        """
+        Collect the metadata and arrays stored in a snapshot.
+        
+        Returns:
+            (metadata, arrays)
+        """
+        arrays = {
+            'X_bits': self.trait_matrix.words,
+            'question_feature': self.question_features,
+        }
+        for name, arr in self.trait_index.to_arrays().items():
+            arrays['trait_index_' + name] = arr
+        for name, arr in self.flat_tree.to_arrays().items():
+            arrays['tree_' + name] = arr
+        for name, arr in self.redundancy.to_arrays().items():
+            arrays['redundancy_' + name] = arr
+        for i, tree in enumerate(self.ensemble or []):
+            for name, arr in tree.to_arrays().items():
+                arrays[f'ensemble{i}_{name}'] = arr
+        
+        metadata = {
+            'params': {
+                'max_depth': self.max_depth,
+                'min_samples_split': self.min_samples_split,
+                'ensemble_size': len(self.ensemble) if self.ensemble else 0,
+            },
+            'characters': self.characters,
+            'feature_names': self.feature_extractor.feature_names,
+            'questions': self.questions,
+            'opening_book': self.opening_book.to_dict(),
+        }
+        return metadata, arrays
+    
+    @property
+    def X_train(self) -> np.ndarray:
+        """
+        Dense binary feature matrix (n_characters × n_features, int8).
+        
+        Gameplay works on the packed trait_matrix; the dense matrix is kept from
+        training, or unpacked on first use when loaded from a snapshot.
+        """
+        if self._X_train is None:
+            self._X_train = self.trait_matrix.to_dense()
+        return self._X_train
     
     def reset(self):
         """
         Reset the game state for a new game.
         
-        Initializes:
+        Replaces self.state with a fresh GameState:
         - Current feature vector (all unknown: -1)
         - Known mask (all False)
         - Asked questions set
         - Question history
-        - Character probabilities (for compatibility)
+        - Character probabilities (uniform)
         """
-        # Create initial feature vector (all unknown)
-        self.current_feature_vector = np.full(
-            len(self.feature_extractor.feature_names), 
-            -1, 
-            dtype=np.int8
-        )
+        self.state = self.new_state()
+    
+    def new_state(self) -> GameState:
+        """
+        Create a fresh per-game state for this model.
         
-        # Create mask tracking which features are known
-        self.known_mask = np.zeros(
-            len(self.feature_extractor.feature_names), 
-            dtype=bool
+        Returns:
+            GameState with nothing known and uniform probabilities
+        """
+        return GameState(
+            len(self.feature_extractor.feature_names),
+            self.num_characters,
+            score_accumulator=self.scorer.new_accumulator(),
+            eligible_questions=self.initial_eligible_questions.copy()
         )
+    
+    def for_state(self, state: GameState) -> 'DecisionTreeAI':
+        """
+        Get an engine view that plays the given game state.
         
-        # Track asked questions
-        self.asked_questions: Set[int] = set()
-        self.question_history: List[Dict] = []
-        
-        # Track answer confidence for each trait (for probabilistic answers)
-        # Maps trait_name -> confidence (1.0 for yes/no, 0.75 for probably/probably_not)
-        self.answer_confidence: Dict[str, float] = {}
+        The view shares everything read-only with this engine (feature matrix,
+        tree, questions) and only swaps the per-game state, so creating one is
+        cheap. Used to serve many concurrent games from one loaded model.
         
-        # Character probabilities (for compatibility with existing code)
-        # Initialize with uniform distribution
-        self.probabilities = [1.0 / self.num_characters] * self.num_characters
+        Args:
+            state: Game state to operate on (modified by the view's methods)
+            
+        Returns:
+            Shallow copy of this engine bound to state
+        """
+        view = copy.copy(self)
+        view.state = state
+        return view
+    
+    # Per-game attributes live on self.state (see GameState)
+    current_feature_vector = _state_attribute('current_feature_vector')
+    known_mask = _state_attribute('known_mask')
+    asked_questions = _state_attribute('asked_questions')
+    question_history = _state_attribute('question_history')
+    answer_confidence = _state_attribute('answer_confidence')
+    confidence_vector = _state_attribute('confidence_vector')
+    score_accumulator = _state_attribute('score_accumulator')
+    
+    
+    @property
+    def log_weights(self) -> np.ndarray:
+        """Current game's belief state as log-weights (stored on self.state)."""
+        return self.state.log_weights
+    
+    @log_weights.setter
+    def log_weights(self, value: np.ndarray):
+        self.state.log_weights = value
+        self.state.probabilities = None
+    
+    @property
+    def probabilities(self) -> np.ndarray:
+        """Current game's probabilities (normalized from log_weights on first read after a change)."""
+        if self.state.probabilities is None:
+            self.state.probabilities = PosteriorScorer.normalize_log(self.state.log_weights)
+        return self.state.probabilities
+    
+    @probabilities.setter
+    def probabilities(self, value: np.ndarray):
+        with np.errstate(divide='ignore'):
+            self.state.log_weights = np.log(value)
+        self.state.probabilities = value
     
     def select_best_question(self) -> Optional[int]:
         """
@@ -136,69 +589,77 @@ class DecisionTreeAI:
         3. When we hit a node that splits on an unknown feature, ask about that feature
         4. If we can't traverse (all needed features unknown), use feature importance
         
+        With question_strategy='information_gain', steps 2-4 are replaced by picking
+        the question with the highest expected information gain. With 'soft_tree',
+        step 2 follows both branches of uncertain answers (see _select_by_soft_tree).
+        
+        Opening questions come from the opening book; later choices are shared
+        between games in the same position through the transposition cache.
+        
+        Returns:
+            Question index, or None if no more questions available
+        """
+        # Early game: precomputed in the opening book while the game follows it
+        if len(self.asked_questions) < OPENING_QUESTIONS:
+            book_question = self.opening_book.lookup(self.state.opening_key)
+            if book_question is not None:
+                return book_question
+        
+        # Same answers (and guess feedback since) as an earlier game: same question
+        cache = self.transposition_cache
+        answer_key = self.state.answer_key
+        if cache is None or answer_key is None:
+            return self._select_question()
+        key = ('question', answer_key, self.state.adjustments)
+        question_idx = cache.get(key, _NOT_CACHED)
+        if question_idx is _NOT_CACHED:
+            question_idx = self._select_question()
+            cache.put(key, question_idx, cache.entry_size(len(answer_key) + len(self.state.adjustments)))
+        return question_idx
+    
+    def _select_question(self) -> Optional[int]:
+        """
+        Select the next question for the current state (see select_best_question).
+        
         Returns:
             Question index, or None if no more questions available
         """
         questions_asked = len(self.asked_questions)
         
         # Early game: prioritize broad categories by question priority
-        if questions_asked < 5:
+        if questions_asked < OPENING_QUESTIONS:
             priority_question = self._select_priority_question()
             if priority_question is not None:
                 return priority_question
         
-        # Get tree structure
-        tree = self.tree.tree_
-        
-        # Traverse tree starting from root
-        node = 0  # Start at root node
-        max_depth = 100  # Prevent infinite loops
-        depth = 0
-        
-        while depth < max_depth:
-            depth += 1
+        if self.question_strategy == 'information_gain':
+            return self._select_by_information_gain()
+        if self.question_strategy == 'soft_tree':
+            return self._select_by_soft_tree()
+        if self.question_strategy == 'ensemble':
+            return self._select_by_ensemble()
+        
+        # Follow known answers down the tree to the first split on an unknown feature
+        # (resuming from where the last walk stopped: answers only ever extend the path)
+        node = self.flat_tree.find_frontier(self.known_mask, self.current_feature_vector, self.state.tree_node)
+        self.state.tree_node = node
+        
+        # A leaf means the tree thinks we've narrowed down enough, but we might
+        # still have many candidates, so fall through to feature importance
+        if not self.flat_tree.is_leaf(node):
+            # Feature is unknown - this is our next question!
+            feature_idx = self.flat_tree.feature_list[node]
             
-            # Check if this is a leaf node
-            if tree.children_left[node] == tree.children_right[node]:
-                # Leaf node reached - this means the tree thinks we've narrowed down enough
-                # But we might still have many candidates, so use feature importance instead
-                # Don't return None here - use fallback to find a good question
-                break
+            # Find the questions that ask about this feature
+            question_indices = self.feature_extractor.questions_for_feature(feature_idx)
             
-            # Get the feature this node splits on
-            feature_idx = tree.feature[node]
+            # Pick the first question we haven't asked yet and isn't redundant
+            live = question_indices[self.state.eligible_questions[question_indices]]
+            if live.size:
+                return int(live[0])
             
-            # Check if this feature is known
-            if self.known_mask[feature_idx]:
-                # Feature is known - follow the branch
-                feature_value = self.current_feature_vector[feature_idx]
-                threshold = tree.threshold[node]
-                
-                # Binary features: 0 or 1, threshold is typically 0.5
-                if feature_value <= threshold:
-                    node = tree.children_left[node]
-                else:
-                    node = tree.children_right[node]
-            else:
-                # Feature is unknown - this is our next question!
-                # Map feature index to trait name
-                trait_name = self.feature_extractor.index_to_trait[feature_idx]
-                
-                # Find a question that asks about this trait
-                question_indices = self.feature_extractor.trait_to_questions.get(trait_name, [])
-                
-                # Pick the first question we haven't asked yet and isn't redundant
-                for q_idx in question_indices:
-                    if q_idx in self.asked_questions:
-                        continue
-                    if self._is_redundant_question(q_idx):
-                        continue
-                    return q_idx
-                
-                # If all questions for this trait were asked, continue traversal
-                # (This shouldn't happen, but handle it gracefully)
-                # Use feature importance as fallback
-                break
+            # If all questions for this trait were asked, use feature importance as fallback
+            # (This shouldn't happen, but handle it gracefully)
         
         # Fallback: Use feature importance to pick best unknown feature
         return self._select_by_feature_importance()
@@ -214,7 +675,7 @@ class DecisionTreeAI:
             Question index, or None if no questions available
         """
         # Get feature importances from the tree
-        importances = self.tree.feature_importances_
+        importances = self.flat_tree.feature_importances_
         
         # Find unknown features
         unknown_indices = np.where(~self.known_mask)[0]
@@ -223,29 +684,30 @@ class DecisionTreeAI:
             # All features known - should make guess
             return None
         
+        # Only features that still have an askable question can be picked
+        eligible = self.state.eligible_questions
+        askable = np.zeros(len(self.known_mask), dtype=bool)
+        features = self.question_features[eligible]
+        askable[features[features >= 0]] = True
+        unknown_indices = unknown_indices[askable[unknown_indices]]
+        
         # Get top candidates (characters with highest probability)
         # Focus on traits that help distinguish between likely candidates
-        top_candidates = self.get_top_characters(10)  # Top 10 candidates
-        top_chars = [char for char, _ in top_candidates]
+        top_rows = self._top_rows(10)  # Top 10 candidates
+        
+        # Trait bits of the top candidates (len(top_rows) × n_features)
+        top_bits = self.trait_matrix.to_dense(top_rows)
         
         # Calculate information gain for each unknown feature
         scored_features = []
         
         for feature_idx in unknown_indices:
-            trait_name = self.feature_extractor.index_to_trait[feature_idx]
             importance = importances[feature_idx]
             
             # Calculate information gain: how well does this trait split top candidates?
             # Count how many top candidates have this trait vs don't
-            has_trait = 0
-            no_trait = 0
-            
-            for char in top_chars:
-                char_traits = self.feature_extractor.traits.get(char, {})
-                if char_traits.get(trait_name, 0) == 1:
-                    has_trait += 1
-                else:
-                    no_trait += 1
+            has_trait = int(np.count_nonzero(top_bits[:, feature_idx]))
+            no_trait = len(top_rows) - has_trait
             
             # Information gain: prefer traits that split candidates roughly 50/50
             # Perfect split (50/50) = maximum information gain
@@ -270,234 +732,166 @@ class DecisionTreeAI:
             # Weight: 70% information gain, 30% feature importance
             combined_score = 0.7 * info_gain + 0.3 * importance
             
-            scored_features.append((feature_idx, trait_name, combined_score, info_gain, importance))
+            scored_features.append((feature_idx, combined_score, info_gain, importance))
         
         # Sort by combined score (highest first)
-        scored_features.sort(key=lambda x: x[2], reverse=True)
+        scored_features.sort(key=lambda x: x[1], reverse=True)
         
         # Try each feature in order until we find one with an unasked question
-        for feature_idx, trait_name, combined_score, info_gain, importance in scored_features:
-            # Find a question for this trait
-            question_indices = self.feature_extractor.trait_to_questions.get(trait_name, [])
+        for feature_idx, combined_score, info_gain, importance in scored_features:
+            # Find the questions for this feature
+            question_indices = self.feature_extractor.questions_for_feature(feature_idx)
             
             # Pick first unasked, non-redundant question
-            for q_idx in question_indices:
-                if q_idx in self.asked_questions:
-                    continue
-                if self._is_redundant_question(q_idx):
-                    continue
-                return q_idx
+            live = question_indices[eligible[question_indices]]
+            if live.size:
+                return int(live[0])
         
         # No questions available for any unknown feature
         return None
     
-    def _select_priority_question(self) -> Optional[int]:
+    def _select_by_information_gain(self) -> Optional[int]:
         """
-        Pick next question by lowest priority value, skipping known traits and redundancy.
-        Ensures we start with broad categories (source/world/setting/identity/role) before specifics.
+        Select the question with the highest expected entropy reduction.
+        
+        Gains are computed for every feature at once under the full probability
+        vector (see InformationGainSelector), optionally with soft answer likelihoods.
+        
+        Returns:
+            Question index, or None if no questions available
         """
-        # Build list of candidate questions that are unasked, not redundant, and trait unknown
-        candidates = []
-        for q_idx, q in enumerate(self.questions):
-            if q_idx in self.asked_questions:
-                continue
-            if self._is_redundant_question(q_idx):
-                continue
-            trait = q.get('trait', '')
-            if not trait:
-                continue
-            feat_idx = self.feature_extractor.trait_to_index.get(trait, -1)
-            if feat_idx >= 0 and self.known_mask[feat_idx]:
-                continue
-            prio = q.get('priority', 99)
-            group = q.get('group', '')
-            candidates.append((prio, group, q_idx))
-        
-        if not candidates:
+        features = self.question_features
+        
+        # Askable questions about a trait (unasked, trait unknown, not redundant)
+        candidates = np.flatnonzero(self.state.eligible_questions & (features >= 0))
+        if candidates.size == 0:
             return None
         
-        # Sort by priority, then by a broadness order for tie-breaking
-        broad_order = {
-            'source': 0,
-            'world': 1,
-            'setting': 2,
-            'identity': 3,
-            'role': 4,
-            'affiliation': 5,
-            'abilities': 6,
-            'appearance': 7,
-            'personality': 8
-        }
-        candidates.sort(key=lambda x: (x[0], broad_order.get(x[1], 9)))
-        return candidates[0][2]
+        gains = self.gain_selector.expected_gain(self.probabilities)[features[candidates]]
+        
+        # Highest gain first (ties: lowest question index)
+        order = np.lexsort((candidates, -gains))
+        return int(candidates[order[0]])
     
-    def _select_franchise_question(self) -> Optional[int]:
+    def _select_by_ensemble(self) -> Optional[int]:
         """
-        Select a franchise question for early game (first 1-3 questions).
+        Select a question by letting the randomized trees vote.
         
-        Prioritizes movie/anime/video_game questions first. If user answers "yes"
-        to any of these, we skip asking the others.
+        Each tree is walked to its frontier (resuming from the game's cached
+        nodes, like the single tree) and votes for the feature it splits on there.
+        A feature's score is its votes times the entropy of its yes/no split under
+        the current probabilities, so a split that the earlier (possibly wrong)
+        answers have already made lopsided loses to one that still divides the
+        likely characters.
         
         Returns:
-            Question index for a franchise question, or None if none available
-        """
-        # Priority franchise questions: movie, anime, video_game
-        priority_traits = ['franchise_movie', 'franchise_anime', 'franchise_video_game']
-        
-        # Check if we've already answered "yes" to any priority question
-        # If so, don't ask franchise questions (user already narrowed it down)
-        for trait_name in priority_traits:
-            if trait_name in self.feature_extractor.trait_to_index:
-                feature_idx = self.feature_extractor.trait_to_index[trait_name]
-                if self.known_mask[feature_idx]:
-                    # This trait is known - check if it's "yes" (value = 1)
-                    if self.current_feature_vector[feature_idx] == 1:
-                        # User answered yes to one of the priority questions
-                        # Skip asking other franchise questions
-                        return None
-        
-        # Find the priority franchise questions (movie, anime, video_game)
-        priority_questions = []
-        for q_idx, question in enumerate(self.questions):
-            if q_idx in self.asked_questions:
-                continue
-            
-            trait_name = question.get('trait', '')
-            if trait_name in priority_traits:
-                # Check if this trait is still unknown
-                if trait_name in self.feature_extractor.trait_to_index:
-                    feature_idx = self.feature_extractor.trait_to_index[trait_name]
-                    if not self.known_mask[feature_idx]:
-                        priority_questions.append((q_idx, trait_name))
-        
-        # Return the first unasked priority question (in order: movie, anime, video_game)
-        if priority_questions:
-            # Sort by priority order
-            priority_order = {trait: idx for idx, trait in enumerate(priority_traits)}
-            priority_questions.sort(key=lambda x: priority_order.get(x[1], 999))
-            for q_idx, _ in priority_questions:
-                if not self._is_redundant_question(q_idx):
-                    return q_idx
-        
-        # If no priority questions available, fall back to other franchise questions
-        # Find all unasked franchise questions
-        franchise_questions = []
-        
-        for q_idx, question in enumerate(self.questions):
-            if q_idx in self.asked_questions:
-                continue
+            Question index, or None if no questions available
+        """
+        if self.state.ensemble_nodes is None:
+            self.state.ensemble_nodes = [0] * len(self.ensemble)
+        nodes = self.state.ensemble_nodes
+        
+        votes = np.zeros(len(self.known_mask), dtype=np.float64)
+        for i, tree in enumerate(self.ensemble):
+            node = tree.find_frontier(self.known_mask, self.current_feature_vector, nodes[i])
+            nodes[i] = node
+            if not tree.is_leaf(node):
+                votes[tree.feature_list[node]] += 1
+        
+        candidates = np.flatnonzero(votes)
+        if candidates.size:
+            # Probability mass of the characters having each voted trait (from the
+            # inverted index, so views never unpack the dense matrix)
+            probabilities = self.probabilities
+            total = probabilities.sum()
+            yes_mass = np.array([
+                probabilities[self.trait_index.characters_with(feature_idx)].sum()
+                for feature_idx in candidates
+            ])
+            p_yes = yes_mass / total if total > 0 else 0.5
+            scores = votes[candidates] * (_entropy_terms(p_yes) + _entropy_terms(1.0 - p_yes))
             
-            # Check if this is a franchise question (but not a priority one)
-            trait_name = question.get('trait', '')
-            if trait_name.startswith('franchise_') and trait_name not in priority_traits:
-                # Check if this trait is still unknown
-                if trait_name in self.feature_extractor.trait_to_index:
-                    feature_idx = self.feature_extractor.trait_to_index[trait_name]
-                    if not self.known_mask[feature_idx]:
-                        franchise_questions.append(q_idx)
-        
-        if not franchise_questions:
-            return None
+            # Best score first (ties: more votes, then lowest feature index)
+            order = np.lexsort((candidates, -votes[candidates], -scores))
+            eligible = self.state.eligible_questions
+            for feature_idx in candidates[order]:
+                question_indices = self.feature_extractor.questions_for_feature(feature_idx)
+                live = question_indices[eligible[question_indices]]
+                if live.size:
+                    return int(live[0])
+        
+        # Every tree is at a leaf: fall back to feature importance
+        return self._select_by_feature_importance()
+    
+    def _select_by_soft_tree(self) -> Optional[int]:
+        """
+        Select a question with a probabilistic walk of the Decision Tree.
         
-        # Prioritize by feature importance (most important franchise traits first)
-        importances = self.tree.feature_importances_
+        "probably"/"probably not" answers send part of the walk down the other
+        branch (see FlatTree.soft_frontier), so one wrong uncertain answer doesn't
+        lock the game into the wrong subtree. Every reachable split on an unknown
+        feature is scored by its reach probability times the entropy of the split
+        under the current probabilities of the characters at that node; a feature
+        reached at several nodes sums its scores.
         
-        # Score each franchise question by its trait's importance
-        scored_questions = []
-        for q_idx in franchise_questions:
-            question = self.questions[q_idx]
-            trait_name = question.get('trait', '')
+        Returns:
+            Question index, or None if no questions available
+        """
+        tree = self.flat_tree
+        nodes, reach = tree.soft_frontier(self.known_mask, self.current_feature_vector, self.confidence_vector)
+        
+        if nodes.size:
+            # Probability mass of the characters at each node and in its right (has trait) branch
+            mass = np.bincount(self.membership_nodes, weights=self.probabilities[self.membership_characters],
+                               minlength=tree.node_count)
+            node_mass = mass[nodes]
+            right_mass = mass[tree.children_right[nodes]]
+            p_yes = np.divide(right_mass, node_mass, out=np.zeros_like(node_mass), where=node_mass > 0)
+            gain = _entropy_terms(p_yes) + _entropy_terms(1.0 - p_yes)
             
-            # Get feature index for this trait
-            if trait_name in self.feature_extractor.trait_to_index:
-                feature_idx = self.feature_extractor.trait_to_index[trait_name]
-                importance = importances[feature_idx]
-                scored_questions.append((q_idx, importance))
-        
-        if not scored_questions:
+            features = tree.feature[nodes]
+            scores = np.zeros(len(self.known_mask), dtype=np.float64)
+            np.add.at(scores, features, reach * gain)
+            weights = np.zeros(len(self.known_mask), dtype=np.float64)
+            np.add.at(weights, features, reach)
+            
+            # Best score first (ties: more reach, then lowest feature index)
+            candidates = np.unique(features)
+            order = np.lexsort((candidates, -weights[candidates], -scores[candidates]))
+            eligible = self.state.eligible_questions
+            for feature_idx in candidates[order]:
+                question_indices = self.feature_extractor.questions_for_feature(feature_idx)
+                live = question_indices[eligible[question_indices]]
+                if live.size:
+                    return int(live[0])
+        
+        # Every reachable branch ends in a leaf: fall back to feature importance
+        return self._select_by_feature_importance()
+    
+    def _select_priority_question(self) -> Optional[int]:
+        """
+        Pick next question by lowest priority value, skipping known traits and redundancy.
+        Ensures we start with broad categories (source/world/setting/identity/role) before specifics.
+        """
+        # First askable question (unasked, not redundant, trait unknown) in priority order
+        order = self.priority_order
+        candidates = order[self.state.eligible_questions[order]]
+        if candidates.size == 0:
             return None
-        
-        # Sort by importance (highest first) and return the best one
-        scored_questions.sort(key=lambda x: x[1], reverse=True)
-        for q_idx, _ in scored_questions:
-            if not self._is_redundant_question(q_idx):
-                return q_idx
-        return None
-
-    def _is_redundant_question(self, question_idx: int) -> bool:
+        return int(candidates[0])
+    
+    def _redundant_questions(self) -> np.ndarray:
         """
-        Determine if a question is redundant given already known answers.
+        Determine which questions are redundant given already known answers.
         
-        Currently skips additional source_* questions once any source_* trait is confirmed yes,
+        Applies the compiled redundancy rules (see redundancy.py), e.g. skips
+        additional source_* questions once any source_* trait is confirmed yes,
         to avoid wasting turns on mutually exclusive media-origin questions.
+        
+        Returns:
+            Boolean array, one entry per question
         """
-        trait = self.feature_extractor.question_to_trait.get(question_idx, '')
-        if not trait:
-            return False
-        
-        # Skip redundant source questions if any source is already confirmed yes
-        if trait.startswith('source_') and self.source_traits:
-            for src_trait in self.source_traits:
-                idx = self.feature_extractor.trait_to_index.get(src_trait, -1)
-                if idx >= 0 and self.known_mask[idx] and self.current_feature_vector[idx] == 1:
-                    return True
-        
-        # Skip franchise questions that conflict with a confirmed source medium
-        if trait.startswith('franchise_'):
-            # Map franchises to their primary source medium
-            franchise_media = {
-                'franchise_star_wars': 'source_movie',
-                'franchise_harry_potter': 'source_movie',
-                'franchise_lotr': 'source_movie',
-                'franchise_marvel': 'source_comic_manga',
-                'franchise_dc': 'source_comic_manga',
-                'franchise_naruto': 'source_anime',
-                'franchise_one_piece': 'source_anime',
-                'franchise_dragon_ball': 'source_anime',
-                'franchise_pokemon': 'source_anime',
-                'franchise_mario': 'source_video_game',
-                'franchise_zelda': 'source_video_game',
-                'franchise_witcher': 'source_video_game',
-                'franchise_halo': 'source_video_game',
-                'franchise_got': 'source_tv_streaming',
-                'franchise_breaking_bad': 'source_tv_streaming',
-                'franchise_stranger_things': 'source_tv_streaming',
-                'franchise_pirates': 'source_movie',
-                'franchise_matrix': 'source_movie',
-                'franchise_incredibles': 'source_movie',
-                'franchise_toy_story': 'source_movie',
-                'franchise_shrek': 'source_movie',
-                'franchise_frozen': 'source_movie',
-                'franchise_demon_slayer': 'source_anime',
-                'franchise_avatar_tla': 'source_cartoon',
-                'franchise_walking_dead': 'source_tv_streaming',
-                'franchise_sonic': 'source_video_game',
-            }
-            needed_source = franchise_media.get(trait)
-            if needed_source:
-                idx = self.feature_extractor.trait_to_index.get(needed_source, -1)
-                if idx >= 0 and self.known_mask[idx]:
-                    # If we know the source and it's a mismatch, skip
-                    if self.current_feature_vector[idx] != 1:
-                        return True
-                # Also skip other franchises that don't align once a source is confirmed yes
-                for src_trait in self.source_traits:
-                    sidx = self.feature_extractor.trait_to_index.get(src_trait, -1)
-                    if sidx >= 0 and self.known_mask[sidx] and self.current_feature_vector[sidx] == 1:
-                        if src_trait != needed_source:
-                            return True
-        
-        # Skip other franchises once one franchise is confirmed yes
-        if trait.startswith('franchise_'):
-            for q_idx in self.asked_questions:
-                asked_trait = self.feature_extractor.question_to_trait.get(q_idx, '')
-                if asked_trait.startswith('franchise_'):
-                    a_idx = self.feature_extractor.trait_to_index.get(asked_trait, -1)
-                    if a_idx >= 0 and self.known_mask[a_idx] and self.current_feature_vector[a_idx] == 1:
-                        # Already confirmed a franchise -> skip other franchises
-                        return True
-        
-        return False
+        return self.redundancy.redundant_questions(self.current_feature_vector, self.known_mask)
     
     def update_probabilities(self, question_idx: int, user_answer: str,
                             likelihood_correct: float = 0.95, 
@@ -522,13 +916,33 @@ class DecisionTreeAI:
             # Invalid question index - skip update
             return
         
+        # Follow the opening book (leaves it if this wasn't the book question)
+        if self.state.opening_key is not None:
+            self.state.opening_key = self.opening_book.advance(self.state.opening_key, question_idx, user_answer)
+        
         # Get question and trait info
         question = self.questions[question_idx]
         trait = question.get('trait', '')
+        feature_idx = int(self.question_features[question_idx])
+        was_known = feature_idx >= 0 and bool(self.known_mask[feature_idx])
+        
+        # Position for the transposition cache: the set of (trait, answer) pairs, plus
+        # ('asked', question) for answers that set no trait (they only make the question
+        # unaskable). Keying on the trait keeps equal positions equal even if several
+        # questions ask about the same trait. Answering a question or trait again makes
+        # the order matter, so such games are no longer cached.
+        if self.state.answer_key is not None:
+            if question_idx in self.asked_questions or was_known:
+                self.state.answer_key = None
+            elif feature_idx >= 0 and user_answer in ("yes", "no", "probably", "probably_not"):
+                self.state.answer_key = self.state.answer_key | {(feature_idx, user_answer)}
+            else:
+                self.state.answer_key = self.state.answer_key | {('asked', question_idx)}
         
         # Handle "don't know" - don't update the feature, just mark question as asked
         if user_answer == "dont_know":
             self.asked_questions.add(question_idx)
+            self.state.eligible_questions[question_idx] = False
             self.question_history.append({
                 'question': question.get('question', ''),
                 'trait': trait,
@@ -549,6 +963,8 @@ class DecisionTreeAI:
         # Store answer confidence for this trait
         if trait:
             self.answer_confidence[trait] = confidence
+            if feature_idx >= 0:
+                self.confidence_vector[feature_idx] = confidence
         
         # Update feature vector using feature extractor
         self.current_feature_vector, self.known_mask = \
@@ -559,8 +975,18 @@ class DecisionTreeAI:
                 self.known_mask
             )
         
+        # A changed answer can change the path through the tree: walk again from the root
+        if was_known:
+            self.state.tree_node = 0
+            self.state.ensemble_nodes = None
+        
+        # Keep incremental accumulators in sync (touches only this feature's column)
+        if self.scoring_mode == 'incremental':
+            self._accumulate_answer(feature_idx, was_known)
+        
         # Track question in history
         self.asked_questions.add(question_idx)
+        self._update_eligible_questions(question_idx, feature_idx, was_known)
         
         # Map answer to display string
         answer_display = {
@@ -578,18 +1004,184 @@ class DecisionTreeAI:
         
         # Update character probabilities
         # Use Decision Tree to predict probabilities based on current known features
-        self._update_probabilities_from_tree()
+        # (rescoring replaces earlier guess penalties, so the answers alone are the key)
+        self.state.adjustments = ()
+        cache = self.transposition_cache
+        answer_key = self.state.answer_key
+        if cache is None or answer_key is None:
+            self._update_probabilities_from_tree()
+            return
+        key = ('posterior', answer_key)
+        cached = cache.get(key)
+        if cached is not None:
+            self.log_weights = cached.copy()
+        else:
+            self._update_probabilities_from_tree()
+            cache.put(key, self.log_weights.copy(),
+                      cache.entry_size(len(answer_key), self.log_weights.nbytes))
+    
+    def _update_eligible_questions(self, question_idx: int, feature_idx: int, was_known: bool):
+        """
+        Narrow the game's eligible questions after an answer.
+        
+        Args:
+            question_idx: Question that was answered
+            feature_idx: Feature index of its trait (-1 if none)
+            was_known: Whether the feature was already known before this answer
+        """
+        eligible = self.state.eligible_questions
+        eligible[question_idx] = False
+        if feature_idx < 0 or not self.known_mask[feature_idx]:
+            return
+        
+        if was_known:
+            # Same trait answered again - redundancy from the old answer may no
+            # longer apply, so start over from the current state
+            self.state.eligible_questions = self._eligible_questions()
+            return
+        
+        # Questions about this trait are settled; drop those the answer makes redundant
+        eligible[self.feature_extractor.questions_for_feature(feature_idx)] = False
+        eligible &= ~self.redundancy.redundant_after(
+            feature_idx, int(self.current_feature_vector[feature_idx])
+        )
+    
+    def _eligible_questions(self) -> np.ndarray:
+        """
+        Compute the askable questions of the current state from scratch.
+        
+        Returns:
+            Boolean array: question is about a trait, unasked, its trait unknown and not redundant
+        """
+        features = self.question_features
+        eligible = self.initial_eligible_questions & ~self._redundant_questions()
+        eligible[features >= 0] &= ~self.known_mask[features[features >= 0]]
+        if self.asked_questions:
+            eligible[np.fromiter(self.asked_questions, dtype=np.int64)] = False
+        return eligible
     
     def _update_probabilities_from_tree(self):
         """
         Update character probabilities using a weighted Bayesian-style approach.
         
+        Uses a match-counting approach with stronger penalties for mismatches
+        to quickly narrow down candidates (see _reference_probabilities for the rules).
+        The work is done by the implementation selected with scoring_mode; the
+        scores become the game's new log-weights (normalized when next read).
+        """
+        if self.scoring_mode == 'reference':
+            scores = np.asarray(self._reference_probabilities(), dtype=np.float64)
+        elif self.scoring_mode == 'incremental':
+            scores = self._incremental_scores()
+        else:
+            scores = self._vectorized_scores()
+        self.log_weights = np.log(scores)
+    
+    def _accumulate_answer(self, feature_idx: int, was_known: bool):
+        """
+        Fold a newly answered feature into the incremental accumulators.
+        
+        Args:
+            feature_idx: Feature index of the answered trait (-1 if none)
+            was_known: Whether the feature was already known before this answer
+        """
+        if feature_idx < 0 or not self.known_mask[feature_idx]:
+            return
+        
+        if was_known:
+            # Same trait answered again - its old contribution can't be removed
+            # column by column, so rebuild from the current state
+            self.scorer.rebuild(self.score_accumulator, self.current_feature_vector, self.known_mask)
+        else:
+            self.scorer.accumulate(
+                self.score_accumulator,
+                feature_idx,
+                int(self.current_feature_vector[feature_idx])
+            )
+    
+    def _incremental_scores(self) -> np.ndarray:
+        """
+        Incremental implementation of the probability update.
+        
+        Scores characters from the running match counts and hard filter kept in
+        self.score_accumulator, so each answer costs one feature column instead
+        of a rescore against every known trait. Results are identical to the
+        vectorized full rescore.
+        
+        Returns:
+            Array of unnormalized scores (same order as self.characters)
+        """
+        return self.scorer.score_accumulated(
+            self.score_accumulator,
+            self.known_mask,
+            self.confidence_vector
+        )
+    
+    def _vectorized_scores(self) -> np.ndarray:
+        """
+        Vectorized implementation of the probability update.
+        
+        Computes match counts, confidence weights and the hard franchise/source
+        filter as matrix operations over X_train (see PosteriorScorer).
+        
+        Returns:
+            Array of unnormalized scores (same order as self.characters)
+        """
+        return self.scorer.score(
+            self.current_feature_vector,
+            self.known_mask,
+            self.confidence_vector
+        )
+    
+    def _incremental_probabilities(self) -> np.ndarray:
+        """Probabilities from the incremental scorer (see _incremental_scores)."""
+        return PosteriorScorer.normalize(self._incremental_scores())
+    
+    def _vectorized_probabilities(self) -> np.ndarray:
+        """Probabilities from the vectorized scorer (see _vectorized_scores)."""
+        return PosteriorScorer.normalize(self._vectorized_scores())
+    
+    def compare_scoring_modes(self) -> float:
+        """
+        Cross-check the vectorized scorer against the reference implementation.
+        
+        Evaluates both on the current game state without modifying it.
+        
+        Returns:
+            Maximum absolute difference between the two probability vectors
+        """
+        reference = np.asarray(self._reference_probabilities())
+        vectorized = self._vectorized_probabilities()
+        return float(np.max(np.abs(reference - vectorized)))
+    
+    def incremental_matches_full_rescore(self) -> bool:
+        """
+        Check that the incremental accumulators reproduce a full rescore exactly.
+        
+        Only meaningful with scoring_mode='incremental' (accumulators are not
+        maintained in the other modes).
+        
+        Returns:
+            True if both probability vectors are bit-for-bit equal
+        """
+        return bool(np.array_equal(self._incremental_probabilities(), self._vectorized_probabilities()))
+    
+    def _reference_probabilities(self) -> List[float]:
+        """
+        Reference implementation of the probability update (one Python loop per character).
+        
+        Kept as the ground truth for the vectorized scorer; select it with
+        scoring_mode='reference' or compare both with compare_scoring_modes().
+        
         Uses a match-counting approach with stronger penalties for mismatches
         to quickly narrow down candidates. The more traits we know, the more
         aggressive we become at eliminating non-matching characters.
         
         For certain answers (yes/no), mismatches are penalized heavily.
         For probabilistic answers (probably/probably_not), mismatches are penalized less.
+        
+        Returns:
+            List of probabilities (same order as self.characters)
         """
         # Get known traits from current feature vector
         known_traits = {}
@@ -601,8 +1193,7 @@ class DecisionTreeAI:
         
         if not known_traits:
             # No traits known yet - uniform distribution
-            self.probabilities = [1.0 / self.num_characters] * self.num_characters
-            return
+            return [1.0 / self.num_characters] * self.num_characters
         
         num_known_traits = len(known_traits)
         
@@ -697,10 +1288,9 @@ class DecisionTreeAI:
         total_score = sum(character_scores)
         
         if total_score > 0:
-            self.probabilities = [score / total_score for score in character_scores]
-        else:
-            # Fallback: uniform distribution
-            self.probabilities = [1.0 / self.num_characters] * self.num_characters
+            return [score / total_score for score in character_scores]
+        # Fallback: uniform distribution
+        return [1.0 / self.num_characters] * self.num_characters
     
     def get_best_guess(self) -> Tuple[str, float]:
         """
@@ -709,12 +1299,11 @@ class DecisionTreeAI:
         Returns:
             Tuple of (character_name, confidence) where confidence is 0-1
         """
-        # Find character with highest probability
-        max_prob = max(self.probabilities)
-        max_idx = self.probabilities.index(max_prob)
+        # Find character with highest probability (first one on ties)
+        max_idx = int(np.argmax(self.probabilities))
         best_character = self.characters[max_idx]
         
-        return best_character, max_prob
+        return best_character, float(self.probabilities[max_idx])
     
     def get_top_characters(self, n: int = 5) -> List[Tuple[str, float]]:
         """
@@ -726,86 +1315,54 @@ class DecisionTreeAI:
         Returns:
             List of (character_name, probability) tuples, sorted by probability (descending)
         """
-        # Create list of (character, probability) pairs
-        char_probs = list(zip(self.characters, self.probabilities))
-        
-        # Sort by probability (descending)
-        char_probs.sort(key=lambda x: x[1], reverse=True)
+        probs = self.probabilities
+        return [(self.characters[i], float(probs[i])) for i in self._top_rows(n)]
+    
+    def _top_rows(self, n: int) -> np.ndarray:
+        """
+        Get the character indices of the top N most probable characters.
         
-        # Return top N
-        return char_probs[:n]
+        Args:
+            n: Number of top characters to return
+            
+        Returns:
+            Character indices, sorted by probability (descending), ties in character order
+        """
+        probs = self.probabilities
+        n = min(max(n, 0), probs.size)
+        if n == 0:
+            return np.empty(0, dtype=np.int64)
+        
+        # Partition out the n largest without sorting the whole array
+        kth_largest = np.partition(probs, probs.size - n)[probs.size - n]
+        above = np.flatnonzero(probs > kth_largest)
+        # Fill remaining slots with ties in character order (matches a stable sort)
+        ties = np.flatnonzero(probs == kth_largest)[:n - above.size]
+        top = np.concatenate([above, ties])
+        
+        # Sort the selected few by probability (descending), then character order
+        return top[np.lexsort((top, -probs[top]))]
     
-    def should_make_guess(self, threshold: float = 0.7, max_candidates: int = 5) -> bool:
+    def should_make_guess(self, threshold: float = None, max_candidates: int = None) -> bool:
         """
         Decide if we should make a guess based on confidence threshold and candidate count.
         
         Uses adaptive thresholds: lower threshold when we have fewer candidates,
-        higher threshold when we have more candidates.
+        higher threshold when we have more candidates. All the numbers involved
+        come from self.guess_policy (see GuessPolicy).
         
         Args:
             threshold: Base confidence threshold (0-1). If top character's probability
-                      exceeds this, we should guess.
-            max_candidates: Maximum number of candidates allowed before guessing (default: 3)
+                      exceeds this, we should guess. (default: guess_policy.threshold, 0.7)
+            max_candidates: Maximum number of candidates allowed before guessing
+                           (default: guess_policy.max_candidates, 5)
                       
         Returns:
             True if we should make a guess, False otherwise
         """
-        if not self.probabilities:
-            return False
-        
-        # Get confidence of top character
-        max_prob = max(self.probabilities)
-        
-        questions_asked = len(self.asked_questions)
-        
-        # Safety check: Don't guess with very low confidence (below 5%)
-        # This prevents premature guesses even if candidate count is low
-        if max_prob < 0.05:
-            return False
-        
-        # For early questions (<20), only guess if confidence is extremely high (>95%)
-        if questions_asked < 20 and max_prob < 0.95:
-            return False
-        
-        # Early stopping: If we have very high confidence (>90%), guess immediately
-        # (applies once we're beyond the early-question guard above)
-        if max_prob >= 0.90:
-            return True
-        
-        # Check number of remaining candidates
-        # Use a higher threshold (0.5%) to only count meaningful candidates
-        remaining_candidates = len(self.get_remaining_candidates(min_prob=0.005))
-
-        # Adaptive threshold: lower threshold when fewer candidates
-        # More aggressive thresholds to encourage earlier guessing
-        if remaining_candidates == 1:
-            # Only one candidate - guess if confidence > 15%
-            adaptive_threshold = 0.15
-        elif remaining_candidates == 2:
-            # Two candidates - guess if confidence > 35%
-            adaptive_threshold = 0.35
-        elif remaining_candidates == 3:
-            # Three candidates - use lower threshold (55% instead of base)
-            adaptive_threshold = min(threshold, 0.55)
-        elif remaining_candidates == 4:
-            # Four candidates - use moderate threshold
-            adaptive_threshold = min(threshold, 0.60)
-        elif remaining_candidates <= 5:
-            # Five candidates - use slightly softer base
-            adaptive_threshold = min(threshold, 0.70)
-        elif remaining_candidates <= 8:
-            # 6-8 candidates - modestly higher
-            adaptive_threshold = min(0.90, threshold + 0.05)
-        else:
-            # More than 8 candidates - need higher confidence
-            adaptive_threshold = min(0.95, threshold + 0.10)
-
-        # Check if we have too many candidates
-        if remaining_candidates > max_candidates and max_prob < adaptive_threshold:
-            return False  # Too many candidates with low confidence, don't guess yet
-
-        # Check adaptive confidence threshold
-        return bool(max_prob >= adaptive_threshold)
+        return self.guess_policy.should_guess(
+            self.probabilities, len(self.asked_questions), threshold, max_candidates
+        )
     
     def get_stats(self) -> Dict:
         """
@@ -825,7 +1382,7 @@ class DecisionTreeAI:
         
         return {
             'questions_asked': len(self.asked_questions),
-            'entropy': self.entropy(self.probabilities),
+            'entropy': float(self.entropy(self.probabilities)),
             'top_character': top_5[0] if top_5 else ('Unknown', 0.0),
             'top_5': top_5,
             'remaining_candidates': len(candidates),
@@ -842,12 +1399,14 @@ class DecisionTreeAI:
         Lower entropy = less uncertainty (fewer characters, closer to answer)
         
         Args:
-            probabilities: List of probabilities (should sum to 1)
+            probabilities: List or array of probabilities (should sum to 1)
             
         Returns:
             Entropy value in bits (typically 0-7 for 100 characters)
         """
-        return -sum(p * math.log2(p) for p in probabilities if p > 1e-10)
+        probs = np.asarray(probabilities, dtype=np.float64)
+        probs = probs[probs > 1e-10]
+        return float(-np.sum(probs * np.log2(probs)))
     
     def get_remaining_candidates(self, min_prob: float = 0.001) -> List[str]:
         """
@@ -860,108 +1419,163 @@ class DecisionTreeAI:
         Returns:
             List of character names that are still possible
         """
-        return [
-            char for char, prob in zip(self.characters, self.probabilities)
-            if prob >= min_prob
-        ]
+        return [self.characters[i] for i in np.flatnonzero(self.probabilities >= min_prob)]
+    
+    def probabilities_as_list(self) -> List[float]:
+        """
+        Get character probabilities as a plain Python list.
+        
+        Compatibility view for callers that expect the old list-based state
+        (e.g. JSON serialization); self.probabilities itself is a NumPy array.
+        
+        Returns:
+            List of probabilities (same order as self.characters)
+        """
+        return self.probabilities.tolist()
+    
+    def _scale_probability(self, idx: int, factor: float):
+        """
+        Multiply one character's weight, deferring renormalization.
+        
+        Adds log(factor) to the character's log-weight, so repeated penalties
+        never underflow, and marks the probabilities stale; the probabilities
+        property renormalizes (one log-sum-exp pass) on the next read, however
+        many adjustments came in between.
+        """
+        self.state.log_weights[idx] += math.log(factor) if factor > 0 else -math.inf
+        self.state.probabilities = None
     
     def find_character(self, name: str) -> Optional[str]:
         """
         Find character with fuzzy name matching.
         
-        Tries multiple matching strategies:
-        1. Exact match (case-insensitive)
-        2. Partial match (substring)
-        3. Word match (any word overlap)
+        Uses the prebuilt name index (see name_index.py): exact matches
+        (ignoring case, accents and punctuation) win, then the best ranked
+        partial, word or misspelled match.
         
         Args:
-            name: Partial or full character name (e.g., "harry", "Harry Potter", "potter")
+            name: Partial or full character name (e.g., "harry", "Harry Potter", "potter", "hary poter")
             
         Returns:
             Full character name if found, None otherwise
         """
-        name_lower = name.lower().strip()
-        
-        # Exact match first (most reliable)
-        for char in self.characters:
-            if char.lower() == name_lower:
-                return char
+        idx = self.name_index.best_match(name)
+        return self.characters[idx] if idx is not None else None
+    
+    def find_characters(self, name: str, limit: int = 5,
+                        min_score: float = MIN_MATCH_SCORE) -> List[Tuple[str, float]]:
+        """
+        Find the best matching characters for a name.
         
-        # Partial match (substring)
-        # Example: "harry" matches "Harry Potter"
-        for char in self.characters:
-            if name_lower in char.lower() or char.lower() in name_lower:
-                return char
+        Args:
+            name: Partial, full or misspelled character name
+            limit: Maximum number of matches
+            min_score: Minimum match score (1.0 = exact match)
+            
+        Returns:
+            List of (character name, score), best first
+        """
+        return [
+            (self.characters[idx], score)
+            for idx, score in self.name_index.search(name, limit)
+            if score >= min_score
+        ]
+    
+    def suggest_characters(self, prefix: str, limit: int = 8) -> List[str]:
+        """
+        Autocomplete a character name as the player types it.
         
-        # Word match (any word in name)
-        # Example: "potter" matches "Harry Potter"
-        name_words = set(name_lower.split())
-        for char in self.characters:
-            char_words = set(char.lower().split())
-            if name_words & char_words:  # Any word overlap
-                return char
+        Prefix matches (on the full name or any later word) come first; if
+        there are none, the best fuzzy matches are suggested instead, so
+        typos still get suggestions.
         
-        return None
+        Args:
+            prefix: Text typed so far (e.g. "harr", "spider-m", "hary pot")
+            limit: Maximum number of suggestions
+            
+        Returns:
+            Character names, best first
+        """
+        indices = self.name_index.complete(prefix, limit)
+        if not indices:
+            indices = [idx for idx, score in self.name_index.search(prefix, limit) if score >= MIN_MATCH_SCORE]
+        return [self.characters[idx] for idx in indices]
     
-    def penalize_wrong_guess(self, character: str, penalty_factor: float = 0.01):
+    def penalize_wrong_guess(self, character: str, penalty_factor: float = None):
         """
         Drastically reduce probability of a character after wrong guess.
         
         Args:
             character: Name of character that was guessed incorrectly
             penalty_factor: Multiply probability by this factor (0.01 = 99% reduction)
-                           Lower values = stronger penalty
+                           Lower values = stronger penalty (default: guess_policy.penalty_factor)
         """
-        if character in self.characters:
-            idx = self.characters.index(character)
-            self.probabilities[idx] *= penalty_factor
-            
-            # Normalize probabilities
-            total = sum(self.probabilities)
-            if total > 0:
-                self.probabilities = [p / total for p in self.probabilities]
-            else:
-                # Fallback: uniform distribution
-                self.probabilities = [1.0 / self.num_characters] * self.num_characters
+        idx = self.character_ids.get(character)
+        if idx is not None:
+            self.penalize_id(idx, penalty_factor)
             
             # Only print penalty message in verbose mode (not during benchmarks)
             # This reduces noise during large-scale testing
             # Uncomment the line below if you want to see penalty messages:
             # print(f"   🔻 Reduced probability of {character} by {(1-penalty_factor)*100:.0f}%")
     
-    def boost_character(self, character: str, boost_factor: float = 100.0) -> Optional[str]:
+    def penalize_id(self, idx: int, penalty_factor: float = None):
+        """
+        Reduce the probability of a character by index (see penalize_wrong_guess).
+        
+        O(1): the probabilities are renormalized on next read.
+        
+        Args:
+            idx: Character index (position in self.characters)
+            penalty_factor: Multiply probability by this factor (default: guess_policy.penalty_factor)
+        """
+        if penalty_factor is None:
+            penalty_factor = self.guess_policy.penalty_factor
+        self._scale_probability(idx, penalty_factor)
+        self.state.adjustments += (('penalize', idx, penalty_factor),)
+    
+    def boost_character(self, character: str, boost_factor: float = None) -> Optional[str]:
         """
         Increase probability of a character (e.g., when user reveals correct answer).
         
-        Uses fuzzy matching to find the character, then boosts its probability.
+        Exact names are looked up directly; anything else goes through fuzzy
+        matching (see find_character), then the probability is boosted.
         
         Args:
             character: Name of character to boost (can be partial, e.g., "harry")
-            boost_factor: Multiply probability by this factor (default: 100.0 = 100x increase)
+            boost_factor: Multiply probability by this factor
+                         (default: guess_policy.boost_factor, 100.0 = 100x increase)
             
         Returns:
             Full character name if found, None otherwise
         """
-        # Try to find character with fuzzy matching
-        found_char = self.find_character(character)
+        idx = self.character_ids.get(character)
+        if idx is None:
+            idx = self.name_index.best_match(character)
         
-        if found_char:
-            idx = self.characters.index(found_char)
-            self.probabilities[idx] *= boost_factor
-            
-            # Normalize probabilities
-            total = sum(self.probabilities)
-            if total > 0:
-                self.probabilities = [p / total for p in self.probabilities]
-            else:
-                # Fallback: uniform distribution
-                self.probabilities = [1.0 / self.num_characters] * self.num_characters
-            
+        if idx is not None:
+            self.boost_id(idx, boost_factor)
+            found_char = self.characters[idx]
             print(f"   🔺 Boosted probability of {found_char}")
             return found_char
         
         return None
     
+    def boost_id(self, idx: int, boost_factor: float = None):
+        """
+        Increase the probability of a character by index (see boost_character).
+        
+        O(1): the probabilities are renormalized on next read.
+        
+        Args:
+            idx: Character index (position in self.characters)
+            boost_factor: Multiply probability by this factor (default: guess_policy.boost_factor)
+        """
+        if boost_factor is None:
+            boost_factor = self.guess_policy.boost_factor
+        self._scale_probability(idx, boost_factor)
+        self.state.adjustments += (('boost', idx, boost_factor),)
+    
     def get_confirmation_question(self, character: str) -> Optional[Tuple[int, str]]:
         """
         Find the most distinctive trait question for a character to ask as confirmation.
@@ -976,50 +1590,47 @@ class DecisionTreeAI:
         Returns:
             Tuple of (question_index, trait_name) or None if no good question found
         """
-        if character not in self.characters:
+        char_idx = self.character_ids.get(character)
+        if char_idx is None:
             return None
         
-        # Get character's traits
-        char_traits = self.feature_extractor.traits[character]
+        # Get character's traits (feature indices, in feature order)
+        char_features = self.trait_matrix.row_features(char_idx)
         
         # Get top 5 candidates to find discriminating traits
         top_candidates = self.get_top_characters(5)
         top_chars = [char for char, _ in top_candidates]
         
+        # Trait bits of the OTHER top candidates
+        other_rows = [self.character_ids[c] for c in top_chars if c != character]
+        other_bits = self.trait_matrix.to_dense(other_rows)
+        
         # Find traits that distinguish the target from other top candidates
         discriminating_traits = []
         
-        for trait_name, value in char_traits.items():
-            if value == 1:  # Target character has this trait
-                # Check how many of the OTHER top candidates also have it
-                other_top_with_trait = 0
-                for c in top_chars:
-                    if c != character:
-                        other_traits = self.feature_extractor.traits.get(c, {})
-                        if other_traits.get(trait_name, 0) == 1:
-                            other_top_with_trait += 1
-                
-                # Count total characters with this trait (for rarity)
-                total_with_trait = sum(
-                    1 for c in self.characters
-                    if self.feature_extractor.traits.get(c, {}).get(trait_name, 0) == 1
-                )
-                
-                # Prefer traits that:
-                # 1. The target has but other top candidates DON'T (high discrimination)
-                # 2. Are rare overall (good confirmation)
-                if trait_name in self.feature_extractor.trait_to_questions:
-                    question_indices = self.feature_extractor.trait_to_questions[trait_name]
-                    for q_idx in question_indices:
-                        if q_idx not in self.asked_questions:
-                            # Score: heavily weight discrimination from top candidates
-                            discrimination_score = (len(top_chars) - other_top_with_trait) * 1000
-                            rarity_bonus = max(0, (10 - total_with_trait)) * 10
-                            total_score = discrimination_score + rarity_bonus
-                            
-                            discriminating_traits.append((
-                                q_idx, trait_name, total_score, other_top_with_trait, total_with_trait
-                            ))
+        for feature_idx in char_features.tolist():
+            trait_name = self.feature_extractor.feature_names[feature_idx]
+            # Check how many of the OTHER top candidates also have it
+            other_top_with_trait = int(np.count_nonzero(other_bits[:, feature_idx]))
+            
+            # Count total characters with this trait (for rarity)
+            total_with_trait = self.trait_index.cardinality(feature_idx)
+            
+            # Prefer traits that:
+            # 1. The target has but other top candidates DON'T (high discrimination)
+            # 2. Are rare overall (good confirmation)
+            question_indices = self.feature_extractor.questions_for_feature(feature_idx)
+            if question_indices.size:
+                for q_idx in question_indices.tolist():
+                    if q_idx not in self.asked_questions:
+                        # Score: heavily weight discrimination from top candidates
+                        discrimination_score = (len(top_chars) - other_top_with_trait) * 1000
+                        rarity_bonus = max(0, (10 - total_with_trait)) * 10
+                        total_score = discrimination_score + rarity_bonus
+                        
+                        discriminating_traits.append((
+                            q_idx, trait_name, total_score, other_top_with_trait, total_with_trait
+                        ))
         
         # Sort by discrimination score (prefer traits unique among top candidates)
         if discriminating_traits:
@@ -1028,11 +1639,42 @@ class DecisionTreeAI:
         
         return None
     
-    def _load_json(self, filepath: str) -> dict:
-        """Load JSON file."""
+    def _source_paths(self, traits_file: str, questions_file: str) -> List[Path]:
+        """Source data files covered by the snapshot content hash (the rules file if present)."""
+        paths = [self._resolve_path(traits_file), self._resolve_path(questions_file)]
+        rules_path = self._resolve_path(self.redundancy_rules_file)
+        if rules_path.exists():
+            paths.append(rules_path)
+        return paths
+    
+    def _compile_redundancy_rules(self) -> RedundancyRules:
+        """
+        Load the redundancy rule table and compile it for this model's questions.
+        
+        Returns:
+            RedundancyRules (without rules if the rule file is missing)
+        """
+        rules = None
+        if self._resolve_path(self.redundancy_rules_file).exists():
+            rules = self._load_json(self.redundancy_rules_file)
+        else:
+            print(f"[WARN] Redundancy rules not found ({self.redundancy_rules_file}); no questions are skipped")
+        return RedundancyRules.compile(
+            rules,
+            self.feature_extractor.feature_names,
+            [question.get('trait', '') for question in self.questions]
+        )
+    
+    @staticmethod
+    def _resolve_path(filepath: str) -> Path:
+        """Resolve a data file path (as given, or relative to the project root)."""
         path = Path(filepath)
         if not path.exists():
             # Try relative to project root
             path = Path(__file__).parent.parent / filepath
-        with open(path, 'r', encoding='utf-8') as f:
+        return path
+    
+    def _load_json(self, filepath: str) -> dict:
+        """Load JSON file."""
+        with open(self._resolve_path(filepath), 'r', encoding='utf-8') as f:
             return json.load(f)
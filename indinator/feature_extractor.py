@@ -8,6 +8,11 @@ import numpy as np
 from pathlib import Path
 from typing import Dict, List, Set, Tuple
 
+try:
+    from .bitset import PackedTraitMatrix
+except ImportError:
+    from indinator.bitset import PackedTraitMatrix
+
 
 class FeatureExtractor:
     """
@@ -27,17 +32,75 @@ class FeatureExtractor:
             questions_file: Path to questions.json (list of questions with trait names)
         """
         # Load data files
-        self.traits = self._load_json(traits_file)
+        self._traits = self._load_json(traits_file)
         self.questions = self._load_json(questions_file)
         
+        # Prebuilt packed matrix (only set when created from a snapshot)
+        self._matrix = None
+        self._characters = None
+        
         # Get all unique trait names across all characters
         # This creates our feature space (one feature per trait)
         all_traits = set()
-        for character_traits in self.traits.values():
+        for character_traits in self._traits.values():
             all_traits.update(character_traits.keys())
         
         # Sort traits for consistent ordering (important for feature indices)
-        self.feature_names = sorted(all_traits)
+        self._build_index_maps(sorted(all_traits))
+        
+        print(f"[OK] Feature extractor initialized:")
+        print(f"   Characters: {len(self._traits)}")
+        print(f"   Features (traits): {len(self.feature_names)}")
+        print(f"   Questions: {len(self.questions)}")
+    
+    @classmethod
+    def from_arrays(cls, feature_names: List[str], questions: List[Dict],
+                    characters: List[str], matrix: PackedTraitMatrix) -> 'FeatureExtractor':
+        """
+        Create a feature extractor from an already built trait matrix.
+        
+        Used when loading a model snapshot: no JSON is parsed, and the
+        character -> traits mapping is only rebuilt from the matrix if something asks for it.
+        
+        Args:
+            feature_names: Trait name for each column of the matrix (sorted)
+            questions: List of question dicts (same as questions.json)
+            characters: Character name for each row of the matrix (sorted)
+            matrix: Packed binary trait matrix (n_characters × n_features)
+            
+        Returns:
+            FeatureExtractor equivalent to one built from the JSON files
+        """
+        extractor = cls.__new__(cls)
+        extractor._traits = None
+        extractor._matrix = matrix
+        extractor._characters = list(characters)
+        extractor.questions = questions
+        extractor._build_index_maps(list(feature_names))
+        return extractor
+    
+    @property
+    def traits(self) -> Dict[str, Dict[str, int]]:
+        """
+        Character -> {trait_name: value} mapping (traits_flat.json contents).
+        
+        Rebuilt lazily from the trait matrix when created with from_arrays().
+        """
+        if self._traits is None:
+            self._traits = {
+                character: {self.feature_names[idx]: 1 for idx in self._matrix.row_features(row)}
+                for row, character in enumerate(self._characters)
+            }
+        return self._traits
+    
+    def _build_index_maps(self, feature_names: List[str]):
+        """
+        Build the trait and question lookup tables for a feature space.
+        
+        Args:
+            feature_names: Sorted list of trait names (one per feature)
+        """
+        self.feature_names = feature_names
         
         # Create mapping: trait_name -> feature_index
         # Example: "abilities_magic" -> 42
@@ -64,10 +127,35 @@ class FeatureExtractor:
                     self.trait_to_questions[trait] = []
                 self.trait_to_questions[trait].append(q_idx)
         
-        print(f"[OK] Feature extractor initialized:")
-        print(f"   Characters: {len(self.traits)}")
-        print(f"   Features (traits): {len(self.feature_names)}")
-        print(f"   Questions: {len(self.questions)}")
+        # Dense integer versions of the question lookups (no string keys on hot paths):
+        # - question_feature[q]: feature index asked by question q (-1 if none)
+        # - feature_question_indptr / feature_question_indices: CSR feature -> questions;
+        #   the questions about feature f are indices[indptr[f]:indptr[f + 1]] (in question order)
+        self.question_feature = np.array([
+            self.trait_to_index.get(question.get('trait', ''), -1) for question in self.questions
+        ], dtype=np.int32)
+        has_feature = np.flatnonzero(self.question_feature >= 0)
+        # Stable sort keeps each feature's questions in question order
+        self.feature_question_indices = has_feature[
+            np.argsort(self.question_feature[has_feature], kind='stable')
+        ].astype(np.int32)
+        counts = np.bincount(self.question_feature[has_feature], minlength=len(self.feature_names))
+        self.feature_question_indptr = np.zeros(len(self.feature_names) + 1, dtype=np.int32)
+        np.cumsum(counts, out=self.feature_question_indptr[1:])
+    
+    def questions_for_feature(self, feature_idx: int) -> np.ndarray:
+        """
+        Get the questions that ask about a feature.
+        
+        Args:
+            feature_idx: Feature index
+            
+        Returns:
+            Question indices (int32 array view, in question order)
+        """
+        return self.feature_question_indices[
+            self.feature_question_indptr[feature_idx]:self.feature_question_indptr[feature_idx + 1]
+        ]
     
     def build_feature_matrix(self) -> Tuple[np.ndarray, np.ndarray, List[str]]:
         """
@@ -83,6 +171,10 @@ class FeatureExtractor:
             y: Labels array (n_characters) - character names
             character_list: List of character names in same order as rows
         """
+        # Matrix already built (loaded from a snapshot)
+        if self._matrix is not None:
+            return self._matrix.to_dense(), np.array(self._characters), list(self._characters)
+        
         # Get list of characters (sorted for consistency)
         character_list = sorted(self.traits.keys())
         n_characters = len(character_list)
@@ -227,18 +319,11 @@ class FeatureExtractor:
         if answer == "dont_know":
             return feature_vector, known_mask
         
-        # Get the trait this question asks about
-        trait_name = self.get_question_trait(question_idx)
-        
-        if not trait_name:
-            # Question doesn't map to a trait, nothing to update
-            return feature_vector, known_mask
-        
-        # Get the feature index for this trait
-        feature_idx = self.get_trait_index(trait_name)
+        # Get the feature this question asks about
+        feature_idx = int(self.question_feature[question_idx])
         
         if feature_idx == -1:
-            # Trait not in feature space, nothing to update
+            # Question doesn't map to a trait in the feature space, nothing to update
             return feature_vector, known_mask
         
         # Map answer to binary value
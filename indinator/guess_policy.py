@@ -0,0 +1,159 @@
+"""
+Guessing Policy
+Holds every tunable number behind DecisionTreeAI's "should I guess now?"
+decision and its wrong/right guess feedback, so they can be swept
+(see sweep.py) instead of hand-tuned in code.
+
+The defaults reproduce the engine's original hard-coded behavior exactly.
+"""
+
+from typing import Dict
+
+import numpy as np
+
+
+class GuessPolicy:
+    """
+    When to guess, and how strongly to react to guess feedback.
+
+    Decision order (see should_guess):
+    1. Never guess below min_confidence.
+    2. Before early_questions questions, only guess at early_confidence or above.
+    3. Always guess at instant_confidence or above.
+    4. Otherwise compare the top probability to an adaptive threshold that
+       depends on how many candidates have at least candidate_min_prob:
+       - 1 candidate: one_candidate_threshold
+       - 2 candidates: two_candidate_threshold
+       - 3/4/5 candidates: min(threshold, few_candidate_caps[0/1/2])
+       - up to several_candidates: min(several_cap, threshold + several_margin)
+       - more: min(many_cap, threshold + many_margin)
+       With more than max_candidates candidates, the threshold must be met too.
+    """
+
+    # Parameters (and defaults) in a stable order, for to_dict()/from_dict() and sweeps
+    DEFAULTS = {
+        'threshold': 0.7,
+        'max_candidates': 5,
+        'min_confidence': 0.05,
+        'early_questions': 20,
+        'early_confidence': 0.95,
+        'instant_confidence': 0.90,
+        'candidate_min_prob': 0.005,
+        'one_candidate_threshold': 0.15,
+        'two_candidate_threshold': 0.35,
+        'few_candidate_caps': (0.55, 0.60, 0.70),
+        'several_candidates': 8,
+        'several_margin': 0.05,
+        'several_cap': 0.90,
+        'many_margin': 0.10,
+        'many_cap': 0.95,
+        'penalty_factor': 0.01,
+        'boost_factor': 100.0,
+    }
+
+    def __init__(self, **params):
+        """
+        Create a policy.
+
+        Args:
+            **params: Any of DEFAULTS (base threshold, ladder values, penalty_factor
+                      for wrong guesses, boost_factor for revealed characters)
+        """
+        unknown = set(params) - set(self.DEFAULTS)
+        if unknown:
+            raise ValueError(f"Unknown guess policy parameters: {sorted(unknown)}")
+        for name, default in self.DEFAULTS.items():
+            value = params.get(name, default)
+            setattr(self, name, tuple(value) if isinstance(default, tuple) else value)
+
+    @classmethod
+    def from_dict(cls, params: Dict) -> 'GuessPolicy':
+        """Create a policy from a dict (e.g. a sweep result); missing keys use defaults."""
+        return cls(**params)
+
+    def to_dict(self) -> Dict:
+        """All parameters as a JSON-serializable dict."""
+        return {
+            name: list(getattr(self, name)) if isinstance(default, tuple) else getattr(self, name)
+            for name, default in self.DEFAULTS.items()
+        }
+
+    def replace(self, **params) -> 'GuessPolicy':
+        """Copy of this policy with some parameters changed."""
+        return GuessPolicy(**{**self.to_dict(), **params})
+
+    def __repr__(self) -> str:
+        changed = {
+            name: value for name, value in self.to_dict().items()
+            if value != GuessPolicy().to_dict()[name]
+        }
+        return f"GuessPolicy({', '.join(f'{k}={v!r}' for k, v in changed.items())})"
+
+    def adaptive_threshold(self, remaining_candidates: int, threshold: float) -> float:
+        """
+        Get the confidence needed to guess with this many candidates left.
+
+        Args:
+            remaining_candidates: Characters with probability >= candidate_min_prob
+            threshold: Base confidence threshold
+
+        Returns:
+            Confidence threshold for the top character
+        """
+        if remaining_candidates == 1:
+            return self.one_candidate_threshold
+        if remaining_candidates == 2:
+            return self.two_candidate_threshold
+        if remaining_candidates == 3:
+            return min(threshold, self.few_candidate_caps[0])
+        if remaining_candidates == 4:
+            return min(threshold, self.few_candidate_caps[1])
+        if remaining_candidates <= 5:
+            return min(threshold, self.few_candidate_caps[2])
+        if remaining_candidates <= self.several_candidates:
+            return min(self.several_cap, threshold + self.several_margin)
+        return min(self.many_cap, threshold + self.many_margin)
+
+    def should_guess(self, probabilities: np.ndarray, questions_asked: int,
+                     threshold: float = None, max_candidates: int = None) -> bool:
+        """
+        Decide whether to guess the top character now.
+
+        Args:
+            probabilities: Probability per character
+            questions_asked: Questions asked so far in this game
+            threshold: Base confidence threshold (default: self.threshold)
+            max_candidates: Candidate count above which the threshold must be met
+                            (default: self.max_candidates)
+
+        Returns:
+            True if we should make a guess, False otherwise
+        """
+        if probabilities.size == 0:
+            return False
+        threshold = self.threshold if threshold is None else threshold
+        max_candidates = self.max_candidates if max_candidates is None else max_candidates
+
+        max_prob = float(probabilities.max())
+
+        # Safety check: Don't guess with very low confidence
+        if max_prob < self.min_confidence:
+            return False
+
+        # For early questions, only guess if confidence is extremely high
+        if questions_asked < self.early_questions and max_prob < self.early_confidence:
+            return False
+
+        # Early stopping: very high confidence, guess immediately
+        if max_prob >= self.instant_confidence:
+            return True
+
+        # Only count meaningful candidates
+        remaining_candidates = int(np.count_nonzero(probabilities >= self.candidate_min_prob))
+        adaptive_threshold = self.adaptive_threshold(remaining_candidates, threshold)
+
+        # Too many candidates with low confidence, don't guess yet
+        if remaining_candidates > max_candidates and max_prob < adaptive_threshold:
+            return False
+
+        return bool(max_prob >= adaptive_threshold)
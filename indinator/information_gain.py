@@ -0,0 +1,99 @@
+"""
+Expected Information Gain for Question Selection
+Scores every trait by how much asking about it is expected to reduce the
+entropy of the current character distribution.
+
+For a trait f, let q_f = P(character has f) = Σ_c p_c · X[c, f], which for all
+traits at once is a single matrix-vector product p @ X. With answers that
+follow the trait exactly, the expected entropy reduction is the binary
+entropy H(q_f). With noisy/soft answers described by likelihoods
+L[a, x] = P(answer a | trait value x), it is the mutual information
+
+    I(C; A) = H(A) - [(1 - q_f) · H(L[:, 0]) + q_f · H(L[:, 1])]
+    where P(a) = (1 - q_f) · L[a, 0] + q_f · L[a, 1]
+"""
+
+import numpy as np
+from typing import Dict, Optional, Tuple
+
+# P(answer | trait value) as (value = 0, value = 1) for each possible answer.
+# Models players who sometimes answer "probably"/"probably not" or slip up.
+DEFAULT_ANSWER_LIKELIHOODS: Dict[str, Tuple[float, float]] = {
+    'yes': (0.03, 0.80),
+    'probably': (0.05, 0.12),
+    'probably_not': (0.12, 0.05),
+    'no': (0.80, 0.03),
+}
+
+
+def _entropy_terms(p: np.ndarray) -> np.ndarray:
+    """Elementwise -p * log2(p), with 0 for p == 0."""
+    p = np.asarray(p, dtype=np.float64)
+    out = np.zeros_like(p)
+    positive = p > 0
+    out[positive] = -p[positive] * np.log2(p[positive])
+    return out
+
+
+class InformationGainSelector:
+    """
+    Computes the expected information gain of every feature under a probability vector.
+    """
+
+    def __init__(self, X: np.ndarray,
+                 answer_likelihoods: Optional[Dict[str, Tuple[float, float]]] = None):
+        """
+        Initialize the selector.
+
+        Args:
+            X: Binary feature matrix (n_characters × n_features)
+            answer_likelihoods: Optional soft answer model mapping answer ->
+                               (P(answer | no trait), P(answer | trait)).
+                               None = answers always match the trait (yes/no only).
+        """
+        # float32 copy so p @ X runs as a single BLAS matrix-vector product
+        self.X = np.ascontiguousarray(X, dtype=np.float32)
+
+        self.likelihoods = None
+        if answer_likelihoods is not None:
+            # Shape (n_answers, 2): column 0 = trait absent, column 1 = trait present
+            self.likelihoods = np.array(list(answer_likelihoods.values()), dtype=np.float64)
+            if not np.allclose(self.likelihoods.sum(axis=0), 1.0):
+                raise ValueError("Answer likelihoods must sum to 1 for each trait value")
+            # Entropy of the answer given the trait value: H(A | x=0), H(A | x=1)
+            self._answer_entropy = _entropy_terms(self.likelihoods).sum(axis=0)
+
+    def trait_probabilities(self, probabilities: np.ndarray) -> np.ndarray:
+        """
+        Get the probability that the hidden character has each trait.
+
+        Args:
+            probabilities: Probability per character
+
+        Returns:
+            q: Probability per feature (float64)
+        """
+        q = probabilities.astype(np.float32) @ self.X
+        return np.clip(q.astype(np.float64), 0.0, 1.0)
+
+    def expected_gain(self, probabilities: np.ndarray) -> np.ndarray:
+        """
+        Get the expected entropy reduction (in bits) from asking about each feature.
+
+        Args:
+            probabilities: Probability per character (should sum to 1)
+
+        Returns:
+            Expected information gain per feature
+        """
+        q = self.trait_probabilities(probabilities)
+
+        if self.likelihoods is None:
+            # Deterministic answers: gain = entropy of the yes/no answer
+            return _entropy_terms(q) + _entropy_terms(1.0 - q)
+
+        # Soft answers: P(answer) for every answer × feature
+        answer_probs = np.outer(self.likelihoods[:, 0], 1.0 - q) + np.outer(self.likelihoods[:, 1], q)
+        answer_entropy = _entropy_terms(answer_probs).sum(axis=0)
+        noise_entropy = (1.0 - q) * self._answer_entropy[0] + q * self._answer_entropy[1]
+        return np.maximum(answer_entropy - noise_entropy, 0.0)
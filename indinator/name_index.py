@@ -0,0 +1,305 @@
+"""
+Character Name Index
+Fuzzy lookup of character names typed by the player.
+
+Names are normalized (accents stripped, lowercase, punctuation -> spaces) and
+split into tokens. The index keeps:
+
+- normalized full name -> character, for exact matches
+- token trigram -> characters having it (each token padded with spaces, so
+  "harry" gives " ha", "har", "arr", "rry", "ry ")
+
+A lookup collects candidates from the postings of the query's trigrams
+(rarest first, up to a budget, so common trigrams of a large catalog don't
+make it scan everything), keeps those sharing the most trigrams, and ranks
+them by token similarity:
+
+- a query token scores 1.0 against an equal name token, PREFIX_SCORE against
+  a name token it starts, else 1 - edit distance / length
+- a name's score combines how well the query tokens are covered by its tokens
+  and how well its tokens are covered by the query, so "harry" and "potter"
+  find "Harry Potter", typos like "hary poter" still match, and a query
+  containing the full name ("harry potter the wizard") matches it too
+- the query and name are also compared with spaces removed, so "spiderman"
+  finds "Spider-Man"
+
+Ties keep catalog order (earlier characters first).
+
+For autocompletion the index also keeps sorted arrays of normalized names
+and of every word-suffix of a name ("potter" for "Harry Potter"), so the
+names starting with what the player typed so far are one bisect away.
+"""
+
+import bisect
+import re
+import unicodedata
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+# Score of a query token that is a prefix of a name token ("herm" -> "hermione")
+PREFIX_SCORE = 0.9
+
+# Minimum score for find_character to accept a match
+MIN_MATCH_SCORE = 0.7
+
+# Candidates taken from the postings lists, and ranked with edit distance
+MAX_POSTING_IDS = 20000
+MAX_CANDIDATES = 32
+
+# Completions examined per lookup (bounds latency for short prefixes of a large catalog)
+MAX_COMPLETION_SCAN = 200
+
+_SEPARATORS = re.compile(r'[\W_]+')
+
+
+def normalize_name(name: str) -> str:
+    """
+    Normalize a name for matching.
+
+    Args:
+        name: Name as typed or stored (e.g. "Zoë  O'Neill")
+
+    Returns:
+        Lowercase name without accents, words separated by single spaces ("zoe o neill")
+    """
+    text = unicodedata.normalize('NFKD', name)
+    text = ''.join(ch for ch in text if not unicodedata.combining(ch)).lower()
+    return _SEPARATORS.sub(' ', text).strip()
+
+
+def token_trigrams(token: str) -> List[str]:
+    """Trigrams of a token padded with one space on each side."""
+    padded = f' {token} '
+    return [padded[i:i + 3] for i in range(len(padded) - 2)]
+
+
+def edit_distance(a: str, b: str, max_distance: Optional[int] = None) -> int:
+    """
+    Levenshtein distance (insertions, deletions and substitutions cost 1).
+
+    Args:
+        a: First string
+        b: Second string
+        max_distance: Stop early once the distance is known to exceed this
+                      (then max_distance + 1 is returned)
+
+    Returns:
+        Number of edits to turn a into b
+    """
+    if len(a) < len(b):
+        a, b = b, a
+    if max_distance is None:
+        max_distance = len(a)
+    if len(a) - len(b) > max_distance:
+        return max_distance + 1
+    previous = list(range(len(b) + 1))
+    for i, ch_a in enumerate(a, 1):
+        current = [i]
+        for j, ch_b in enumerate(b, 1):
+            current.append(min(previous[j] + 1,
+                               current[j - 1] + 1,
+                               previous[j - 1] + (ch_a != ch_b)))
+        if min(current) > max_distance:
+            return max_distance + 1
+        previous = current
+    return previous[-1]
+
+
+def token_similarity(typed: str, token: str) -> float:
+    """
+    Similarity of a typed token to a name token (0.0 to 1.0).
+
+    Args:
+        typed: Token from the query
+        token: Token from a name
+
+    Returns:
+        1.0 if equal, PREFIX_SCORE if typed starts token, else 1 - edit distance / length
+        (0.0 when that would be below MIN_MATCH_SCORE)
+    """
+    if typed == token:
+        return 1.0
+    if len(typed) >= 2 and token.startswith(typed):
+        return PREFIX_SCORE
+    longest = max(len(typed), len(token))
+    max_distance = int(longest * (1.0 - MIN_MATCH_SCORE))
+    distance = edit_distance(typed, token, max_distance)
+    if distance > max_distance:
+        return 0.0
+    return 1.0 - distance / longest
+
+
+class NameIndex:
+    """
+    Prebuilt index over character names for fuzzy, ranked lookups.
+    """
+
+    def __init__(self, names: Sequence[str]):
+        """
+        Build the index.
+
+        Args:
+            names: Character names (results refer to positions in this list)
+        """
+        self.names = list(names)
+        normalized = [normalize_name(name) for name in self.names]
+        self.tokens: List[Tuple[str, ...]] = [tuple(name.split()) for name in normalized]
+
+        # First character with each normalized name (catalog order wins)
+        self.exact: Dict[str, int] = {}
+        postings: Dict[str, List[int]] = {}
+        for idx, (name, tokens) in enumerate(zip(normalized, self.tokens)):
+            self.exact.setdefault(name, idx)
+            for gram in {gram for token in tokens for gram in token_trigrams(token)}:
+                postings.setdefault(gram, []).append(idx)
+        self.postings: Dict[str, np.ndarray] = {
+            gram: np.array(ids, dtype=np.int32) for gram, ids in postings.items()
+        }
+
+        # Sorted (key, name index) arrays for prefix completion: full names,
+        # and the names from their second word on ("potter", "vader")
+        full = sorted((name, idx) for idx, name in enumerate(normalized) if name)
+        inner = sorted(
+            (' '.join(tokens[start:]), idx)
+            for idx, tokens in enumerate(self.tokens)
+            for start in range(1, len(tokens))
+        )
+        self._full_keys = [key for key, _ in full]
+        self._full_ids = [idx for _, idx in full]
+        self._inner_keys = [key for key, _ in inner]
+        self._inner_ids = [idx for _, idx in inner]
+
+    def __len__(self) -> int:
+        return len(self.names)
+
+    def search(self, query: str, limit: int = 5) -> List[Tuple[int, float]]:
+        """
+        Rank the names matching a query.
+
+        Args:
+            query: Partial, full or misspelled name (e.g. "harry", "hary poter")
+            limit: Maximum number of results
+
+        Returns:
+            (name index, score) pairs, best first; scores are 0.0-1.0 (1.0 = exact)
+        """
+        text = normalize_name(query)
+        if not text or limit <= 0:
+            return []
+        query_tokens = text.split()
+        compact = ''.join(query_tokens)
+
+        exact = self.exact.get(text)
+        if exact is not None and limit == 1:
+            return [(exact, 1.0)]
+        candidates = self._candidates(query_tokens)
+
+        similarity_cache: Dict[Tuple[str, str], float] = {}
+
+        def best_similarity(typed: str, tokens: Sequence[str]) -> float:
+            best = 0.0
+            for token in tokens:
+                key = (typed, token)
+                score = similarity_cache.get(key)
+                if score is None:
+                    score = similarity_cache[key] = token_similarity(typed, token)
+                if score > best:
+                    best = score
+            return best
+
+        results = []
+        for idx in candidates.tolist():
+            if idx == exact:
+                continue
+            name_tokens = self.tokens[idx]
+            query_coverage = sum(best_similarity(t, name_tokens) for t in query_tokens) / len(query_tokens)
+            name_coverage = sum(best_similarity(t, query_tokens) for t in name_tokens) / len(name_tokens)
+            score = 0.8 * max(query_coverage, name_coverage) + 0.2 * min(query_coverage, name_coverage)
+            if len(name_tokens) != len(query_tokens):
+                score = max(score, 0.95 * token_similarity(compact, ''.join(name_tokens)))
+            if score > 0.0:
+                results.append((-score, idx))
+        results.sort()
+
+        ranked = [(idx, round(-neg_score, 4)) for neg_score, idx in results[:limit]]
+        if exact is not None:
+            ranked = [(exact, 1.0)] + ranked[:limit - 1]
+        return ranked
+
+    def complete(self, prefix: str, limit: int = 8) -> List[int]:
+        """
+        Names starting with a typed prefix, for autocompletion.
+
+        Names whose first word matches come before names matched on a later
+        word ("pot" -> "Potter ..." before "Harry Potter"); within each group
+        shorter names come first, then catalog order. At most
+        MAX_COMPLETION_SCAN entries per group are examined.
+
+        Args:
+            prefix: Text typed so far (normalized like names, e.g. "spider-m")
+            limit: Maximum number of completions
+
+        Returns:
+            Name indices, best first
+        """
+        text = normalize_name(prefix)
+        if not text or limit <= 0:
+            return []
+        if prefix[-1:].isspace():
+            text += ' '
+
+        results: List[int] = []
+        seen = set()
+        for keys, ids in ((self._full_keys, self._full_ids), (self._inner_keys, self._inner_ids)):
+            lo = bisect.bisect_left(keys, text)
+            hi = min(bisect.bisect_left(keys, text + '\uffff'), lo + MAX_COMPLETION_SCAN)
+            for idx in sorted(ids[lo:hi], key=lambda idx: (len(self.names[idx]), idx)):
+                if idx not in seen:
+                    seen.add(idx)
+                    results.append(idx)
+            if len(results) >= limit:
+                break
+        return results[:limit]
+
+    def best_match(self, query: str, min_score: float = MIN_MATCH_SCORE) -> Optional[int]:
+        """
+        Best matching name index, or None if nothing scores at least min_score.
+        """
+        results = self.search(query, limit=1)
+        if results and results[0][1] >= min_score:
+            return results[0][0]
+        return None
+
+    def _candidates(self, query_tokens: Sequence[str]) -> np.ndarray:
+        """
+        Names sharing the most trigrams with the query.
+
+        Args:
+            query_tokens: Normalized query tokens
+
+        Returns:
+            Up to MAX_CANDIDATES name indices (most shared trigrams first, then catalog order)
+        """
+        grams = {gram for token in query_tokens for gram in token_trigrams(token)}
+        if not grams & self.postings.keys():
+            return np.zeros(0, dtype=np.int32)
+
+        # Rarest trigrams first, within the budget (always at least one list,
+        # truncated to its first names if even that is over budget); equal counts
+        # go by trigram, so results don't depend on set order (string hashing)
+        lists = [self.postings[gram]
+                 for gram in sorted(grams & self.postings.keys(), key=lambda g: (len(self.postings[g]), g))]
+        selected = [lists[0][:MAX_POSTING_IDS]]
+        total = len(selected[0])
+        for ids in lists[1:]:
+            if total + len(ids) > MAX_POSTING_IDS:
+                break
+            selected.append(ids)
+            total += len(ids)
+
+        ids, counts = np.unique(np.concatenate(selected), return_counts=True)
+        if ids.size > MAX_CANDIDATES:
+            order = np.lexsort((ids, -counts))[:MAX_CANDIDATES]
+            ids = np.sort(ids[order])
+        return ids
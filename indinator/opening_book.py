@@ -0,0 +1,130 @@
+"""
+Opening Book
+Precomputed first questions of every game.
+
+For the first OPENING_QUESTIONS turns DecisionTreeAI picks questions by
+priority (see DecisionTreeAI._select_priority_question). That choice only
+depends on which questions were asked and whether each answer made the trait
+known-yes, known-no or stayed unknown, so it is the same for every game
+with the same answer sequence. The book maps each such sequence, written as a
+string of answer classes ("1" yes/probably, "0" no/probably_not,
+"?" don't know), to the question to ask next:
+
+    ""    -> first question
+    "1"   -> second question after a yes/probably
+    "1?0" -> fourth question after yes, don't know, no
+
+It is built once (stored in model snapshots) so opening moves are dict lookups.
+"""
+
+from typing import Dict, Optional
+
+# Number of opening turns that use priority ordering
+OPENING_QUESTIONS = 5
+
+# Answer -> answer class (anything else, e.g. "dont_know", leaves the trait unknown)
+ANSWER_CLASSES = {
+    'yes': '1',
+    'probably': '1',
+    'no': '0',
+    'probably_not': '0',
+}
+UNKNOWN_CLASS = '?'
+
+# One representative answer per class, used when building the book
+_CLASS_ANSWERS = {'1': 'yes', '0': 'no', UNKNOWN_CLASS: 'dont_know'}
+
+
+def answer_class(answer: str) -> str:
+    """Get the answer class ("1", "0" or "?") of an answer."""
+    return ANSWER_CLASSES.get(answer, UNKNOWN_CLASS)
+
+
+class OpeningBook:
+    """
+    Answer-class sequence -> next question index, for the opening turns.
+    """
+
+    def __init__(self, moves: Dict[str, int], depth: int = OPENING_QUESTIONS):
+        """
+        Initialize from prebuilt moves.
+
+        Args:
+            moves: Answer-class sequence -> question index
+            depth: Number of opening turns covered
+        """
+        self.moves = moves
+        self.depth = depth
+
+    @classmethod
+    def build(cls, ai, depth: int = OPENING_QUESTIONS) -> 'OpeningBook':
+        """
+        Play out every answer-class sequence of the opening.
+
+        Args:
+            ai: DecisionTreeAI (its current game is not touched)
+            depth: Number of opening turns to cover
+
+        Returns:
+            OpeningBook with one move per reachable sequence shorter than depth
+        """
+        moves = {}
+        pending = ['']
+        while pending:
+            key = pending.pop()
+            # Replay the sequence on a scratch game, off-book (so ai.opening_book,
+            # which may not exist yet, is never consulted)
+            game = ai.for_state(ai.new_state())
+            game.state.opening_key = None
+            for i, cls_char in enumerate(key):
+                game.update_probabilities(moves[key[:i]], _CLASS_ANSWERS[cls_char])
+            question_idx = game._select_priority_question()
+            if question_idx is None:
+                continue
+            moves[key] = question_idx
+            if len(key) + 1 < depth:
+                pending.extend(key + cls_char for cls_char in _CLASS_ANSWERS)
+        return cls(dict(sorted(moves.items())), depth)
+
+    @classmethod
+    def from_dict(cls, data: Dict) -> 'OpeningBook':
+        """Load a book saved with to_dict()."""
+        return cls({key: int(q_idx) for key, q_idx in data['moves'].items()}, int(data['depth']))
+
+    def to_dict(self) -> Dict:
+        """JSON-serializable form (stored in model snapshots)."""
+        return {'depth': self.depth, 'moves': self.moves}
+
+    def __len__(self) -> int:
+        return len(self.moves)
+
+    def lookup(self, key: Optional[str]) -> Optional[int]:
+        """
+        Get the book move for a position.
+
+        Args:
+            key: Answer-class sequence so far (None = game has left the book)
+
+        Returns:
+            Question index, or None if the position is not in the book
+        """
+        if key is None:
+            return None
+        return self.moves.get(key)
+
+    def advance(self, key: Optional[str], question_idx: int, answer: str) -> Optional[str]:
+        """
+        Get the position after answering a question.
+
+        Args:
+            key: Answer-class sequence so far (None = already off-book)
+            question_idx: Question that was answered
+            answer: The answer
+
+        Returns:
+            New answer-class sequence, or None if the game left the book
+            (the answered question was not the book move)
+        """
+        if key is None or self.moves.get(key) != question_idx:
+            return None
+        return key + answer_class(answer)
@@ -0,0 +1,201 @@
+"""
+Parallel Self-Play Evaluation
+Runs the self-play simulation (see simulation.py) on a pool of worker processes.
+
+The model is serialized once as snapshot bytes and placed in a single
+multiprocessing.shared_memory block; every worker builds its engine from a
+zero-copy read_snapshot() view of that block, so the model is neither
+retrained nor copied per process. Games are fanned out in chunks and the
+per-game results merged back in game order.
+
+A ParallelEvaluator keeps the pool and the shared block alive across runs
+(e.g. all trials of a sweep). Each game's answers are seeded by its game
+number, so a parallel run gives exactly the same games as a serial
+simulate() with the same settings.
+"""
+
+import contextlib
+import io
+import multiprocessing
+import os
+import time
+from multiprocessing import shared_memory
+from typing import Dict, List, Optional, Sequence, Tuple
+
+try:
+    from .decision_tree_engine import DecisionTreeAI
+    from .guess_policy import GuessPolicy
+    from .simulation import AnswerModel, run_config, run_games, schedule_games, summarize
+    from .snapshot import read_snapshot
+except ImportError:
+    from indinator.decision_tree_engine import DecisionTreeAI
+    from indinator.guess_policy import GuessPolicy
+    from indinator.simulation import AnswerModel, run_config, run_games, schedule_games, summarize
+    from indinator.snapshot import read_snapshot
+
+# Chunks per worker (more = better load balancing, fewer = less overhead)
+CHUNKS_PER_WORKER = 4
+
+# Per-process state set up by _init_worker
+_worker_ai = None
+_worker_memory = None
+
+
+def _init_worker(memory_name: str, size: int, engine_options: Dict):
+    """
+    Attach to the shared snapshot and build this worker's engine.
+
+    Args:
+        memory_name: Name of the shared memory block holding the snapshot
+        size: Snapshot size in bytes (the block may be rounded up to a page)
+        engine_options: Keyword arguments for DecisionTreeAI
+    """
+    global _worker_ai, _worker_memory
+    # Keep the block attached for as long as the engine's arrays point into it
+    _worker_memory = shared_memory.SharedMemory(name=memory_name)
+    snapshot = read_snapshot(_worker_memory.buf[:size])
+    with contextlib.redirect_stdout(io.StringIO()):
+        _worker_ai = DecisionTreeAI(snapshot_file=snapshot, **engine_options)
+
+
+def _play_chunk(args: Tuple[List[Tuple[int, str]], AnswerModel, int, GuessPolicy, Dict]) -> List[Dict]:
+    """Play one chunk of games on this worker's engine."""
+    games, answer_model, seed, guess_policy, game_options = args
+    _worker_ai.guess_policy = guess_policy
+    return run_games(_worker_ai, games, answer_model, seed=seed, **game_options)
+
+
+def _chunks(games: List[Tuple[int, str]], num_chunks: int) -> List[List[Tuple[int, str]]]:
+    """Split games into at most num_chunks contiguous, similarly sized chunks."""
+    num_chunks = max(1, min(num_chunks, len(games)))
+    size, extra = divmod(len(games), num_chunks)
+    chunks = []
+    start = 0
+    for i in range(num_chunks):
+        end = start + size + (1 if i < extra else 0)
+        chunks.append(games[start:end])
+        start = end
+    return chunks
+
+
+class ParallelEvaluator:
+    """
+    A process pool whose workers all play against one shared-memory copy of a model.
+
+    Create once and call evaluate() as often as needed (e.g. once per sweep
+    trial); the snapshot is shared and the workers' engines built only once.
+    Use as a context manager, or call close() when done.
+    """
+
+    def __init__(self, ai: DecisionTreeAI, workers: Optional[int] = None):
+        """
+        Share the model and start the workers.
+
+        Args:
+            ai: DecisionTreeAI whose model (and engine settings) the workers use
+            workers: Number of worker processes (default: number of CPUs)
+        """
+        self.ai = ai
+        self.workers = workers or os.cpu_count() or 1
+
+        engine_options = {
+            'traits_file': ai.traits_file,
+            'questions_file': ai.questions_file,
+            'max_depth': ai.max_depth,
+            'min_samples_split': ai.min_samples_split,
+            'scoring_mode': ai.scoring_mode,
+            'question_strategy': ai.question_strategy,
+            'answer_likelihoods': ai.answer_likelihoods,
+            'cache_bytes': ai.cache_bytes,
+            'redundancy_rules_file': ai.redundancy_rules_file,
+            'ensemble_size': ai.ensemble_size,
+        }
+
+        data = ai.snapshot_bytes()
+        self._memory = shared_memory.SharedMemory(create=True, size=len(data))
+        try:
+            self._memory.buf[:len(data)] = data
+            self._pool = multiprocessing.Pool(
+                self.workers, initializer=_init_worker,
+                initargs=(self._memory.name, len(data), engine_options)
+            )
+        except Exception:
+            self._release_memory()
+            raise
+
+    def evaluate(self, characters: Optional[Sequence[str]] = None,
+                 answer_model: Optional[AnswerModel] = None, seed: int = 0, repeats: int = 1,
+                 guess_policy: Optional[GuessPolicy] = None, **game_options) -> Dict:
+        """
+        Play every character on the pool and report accuracy and speed.
+
+        Args:
+            characters: Characters to play (default: all of the AI's characters)
+            answer_model: How the player answers (default: always truthful yes/no)
+            seed: Run seed (same seed + settings = same games as simulate())
+            repeats: Games per character
+            guess_policy: Guess policy to play with (default: the AI's)
+            **game_options: Passed to play_game (max_questions, confidence_threshold, min_questions)
+
+        Returns:
+            Report dict (see simulation.summarize), with the worker count in its config
+        """
+        characters = list(self.ai.characters if characters is None else characters)
+        answer_model = answer_model or AnswerModel()
+        guess_policy = guess_policy or self.ai.guess_policy
+
+        games = schedule_games(characters, repeats)
+        tasks = [
+            (chunk, answer_model, seed, guess_policy, game_options)
+            for chunk in _chunks(games, self.workers * CHUNKS_PER_WORKER)
+        ]
+
+        start = time.perf_counter()
+        results = [result for chunk in self._pool.map(_play_chunk, tasks) for result in chunk]
+        elapsed = time.perf_counter() - start
+
+        results.sort(key=lambda r: r['game'])
+        config = run_config(self.ai, characters, answer_model, seed, repeats, game_options)
+        config['guess_policy'] = guess_policy.to_dict()
+        config['workers'] = self.workers
+        return summarize(results, elapsed, config)
+
+    def close(self):
+        """Stop the workers and free the shared memory."""
+        self._pool.terminate()
+        self._pool.join()
+        self._release_memory()
+
+    def _release_memory(self):
+        self._memory.close()
+        self._memory.unlink()
+
+    def __enter__(self) -> 'ParallelEvaluator':
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+def evaluate_parallel(ai: DecisionTreeAI, characters: Optional[Sequence[str]] = None,
+                      answer_model: Optional[AnswerModel] = None, seed: int = 0, repeats: int = 1,
+                      workers: Optional[int] = None, **game_options) -> Dict:
+    """
+    Play every character against the AI on a process pool and report accuracy and speed.
+
+    One-off version of ParallelEvaluator.evaluate() (starts and stops the pool).
+
+    Args:
+        ai: DecisionTreeAI whose model (and engine settings) the workers use
+        characters: Characters to play (default: all of the AI's characters)
+        answer_model: How the player answers (default: always truthful yes/no)
+        seed: Run seed (same seed + settings = same games as simulate())
+        repeats: Games per character
+        workers: Number of worker processes (default: number of CPUs)
+        **game_options: Passed to play_game (max_questions, confidence_threshold, min_questions)
+
+    Returns:
+        Report dict (see simulation.summarize), with the worker count in its config
+    """
+    with ParallelEvaluator(ai, workers) as evaluator:
+        return evaluator.evaluate(characters, answer_model, seed, repeats, **game_options)
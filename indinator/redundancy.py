@@ -0,0 +1,158 @@
+"""
+Redundancy Rules
+Declarative rules for questions that become pointless once other traits are
+known, compiled into question bitmasks.
+
+Rules are loaded from data/redundancy_rules.json:
+
+- {"type": "exclusive", "prefix": "source_"}
+    Once any trait with the prefix is confirmed yes, questions about traits
+    with the prefix are redundant (e.g. a character has one media origin).
+- {"type": "requires", "group": "source_", "traits": {"franchise_dc": "source_comic_manga", ...}}
+    A question about a listed trait is redundant once its required trait is
+    known no, or once another trait of the group is confirmed yes.
+
+Compiling turns the rules into one question bitmask per (feature, answer):
+the questions made redundant when that feature is known yes (or no). The
+redundant questions of a game are the OR of the masks of its known features,
+so a game can also remove them one answer at a time (redundant_after).
+Bitmasks use the layout of bitset.py (question q is bit q % 64 of word q // 64).
+"""
+
+from typing import Dict, List, Optional, Sequence
+
+import numpy as np
+
+try:
+    from .bitset import WORD_BITS, _pack_bits
+except ImportError:
+    from indinator.bitset import WORD_BITS, _pack_bits
+
+RULE_TYPES = ('exclusive', 'requires')
+
+
+class RedundancyRules:
+    """
+    Compiled redundancy rules: question bitmasks per known feature value.
+    """
+
+    # Snapshot array names (see DecisionTreeAI._snapshot_contents)
+    ARRAY_NAMES = ('yes_masks', 'no_masks')
+
+    def __init__(self, yes_masks: np.ndarray, no_masks: np.ndarray, num_questions: int):
+        """
+        Initialize from compiled masks.
+
+        Args:
+            yes_masks: uint64 array (n_features × words); row f = questions redundant once f is yes
+            no_masks: uint64 array (n_features × words); row f = questions redundant once f is no
+            num_questions: Number of questions (bits per row)
+        """
+        self.yes_masks = yes_masks
+        self.no_masks = no_masks
+        self.num_questions = num_questions
+
+    @classmethod
+    def compile(cls, rules: Optional[Dict], feature_names: Sequence[str],
+                question_traits: Sequence[str]) -> 'RedundancyRules':
+        """
+        Compile a rule table into bitmasks.
+
+        Args:
+            rules: Parsed rule file ({"rules": [...]}), or None for no rules
+            feature_names: Feature (trait) names, in feature order
+            question_traits: Trait asked by each question ('' if none)
+
+        Returns:
+            RedundancyRules for this model
+        """
+        num_features = len(feature_names)
+        num_questions = len(question_traits)
+        yes_bits = np.zeros((num_features, num_questions), dtype=bool)
+        no_bits = np.zeros((num_features, num_questions), dtype=bool)
+
+        feature_index = {name: idx for idx, name in enumerate(feature_names)}
+        question_traits = np.array(question_traits, dtype=object)
+
+        def features_with_prefix(prefix: str) -> List[int]:
+            return [idx for idx, name in enumerate(feature_names) if name.startswith(prefix)]
+
+        def questions_where(predicate) -> np.ndarray:
+            return np.array([bool(trait) and predicate(trait) for trait in question_traits], dtype=bool)
+
+        for rule in (rules or {}).get('rules', []):
+            rule_type = rule.get('type')
+            if rule_type == 'exclusive':
+                prefix = rule['prefix']
+                group_questions = questions_where(lambda trait: trait.startswith(prefix))
+                for feature_idx in features_with_prefix(prefix):
+                    yes_bits[feature_idx] |= group_questions
+            elif rule_type == 'requires':
+                group = features_with_prefix(rule['group'])
+                for trait, required in rule['traits'].items():
+                    trait_questions = questions_where(lambda t: t == trait)
+                    required_idx = feature_index.get(required, -1)
+                    if required_idx >= 0:
+                        no_bits[required_idx] |= trait_questions
+                    for feature_idx in group:
+                        if feature_idx != required_idx:
+                            yes_bits[feature_idx] |= trait_questions
+            else:
+                raise ValueError(f"Unknown redundancy rule type '{rule_type}' (expected one of {RULE_TYPES})")
+
+        num_words = max(1, -(-num_questions // WORD_BITS))
+        return cls(_pack_bits(yes_bits, num_words), _pack_bits(no_bits, num_words), num_questions)
+
+    @classmethod
+    def from_arrays(cls, arrays: Dict[str, np.ndarray], num_questions: int) -> 'RedundancyRules':
+        """Rebuild from arrays saved with to_arrays()."""
+        return cls(arrays['yes_masks'], arrays['no_masks'], num_questions)
+
+    def to_arrays(self) -> Dict[str, np.ndarray]:
+        """Arrays to store in a snapshot."""
+        return {'yes_masks': self.yes_masks, 'no_masks': self.no_masks}
+
+    def redundant_words(self, feature_vector: np.ndarray, known_mask: np.ndarray) -> np.ndarray:
+        """
+        Bitmask of the questions made redundant by the known answers.
+
+        Args:
+            feature_vector: Answered trait values (-1 = unknown)
+            known_mask: Which features are known
+
+        Returns:
+            uint64 word array (one bit per question)
+        """
+        words = np.bitwise_or.reduce(self.yes_masks[known_mask & (feature_vector == 1)], axis=0)
+        words |= np.bitwise_or.reduce(self.no_masks[known_mask & (feature_vector == 0)], axis=0)
+        return words
+
+    def redundant_after(self, feature_idx: int, value: int) -> np.ndarray:
+        """
+        Questions made redundant by one known feature value.
+
+        Args:
+            feature_idx: Feature that became known
+            value: Its value (1 = yes, 0 = no)
+
+        Returns:
+            Boolean array, one entry per question
+        """
+        words = (self.yes_masks if value == 1 else self.no_masks)[feature_idx]
+        bits = np.unpackbits(words.view(np.uint8), bitorder='little')
+        return bits[:self.num_questions].astype(bool)
+
+    def redundant_questions(self, feature_vector: np.ndarray, known_mask: np.ndarray) -> np.ndarray:
+        """
+        Which questions are redundant given the known answers.
+
+        Args:
+            feature_vector: Answered trait values (-1 = unknown)
+            known_mask: Which features are known
+
+        Returns:
+            Boolean array, one entry per question
+        """
+        words = self.redundant_words(feature_vector, known_mask)
+        bits = np.unpackbits(words.view(np.uint8), bitorder='little')
+        return bits[:self.num_questions].astype(bool)
@@ -0,0 +1,342 @@
+"""
+Vectorized Posterior Scoring for Decision Tree AI
+Computes character scores as matrix operations over the bit-packed trait matrix
+(see bitset.PackedTraitMatrix).
+
+The scoring rules are identical to DecisionTreeAI's reference (per-character loop)
+implementation: match/mismatch counting, confidence weighting and the hard
+franchise/source filter. Only the way they are evaluated changes.
+
+Scores can be computed from scratch (PosteriorScorer.score) or from running
+per-character accumulators that are updated one feature column per answer
+(ScoreAccumulator + PosteriorScorer.accumulate / score_accumulated).
+
+Games keep their belief state as log-weights (log of the scores, plus any
+guess penalties/boosts added as log-factors) and only turn them into
+probabilities when they are read (PosteriorScorer.normalize_log).
+"""
+
+import numpy as np
+from typing import List, Optional
+
+try:
+    from .bitset import PackedTraitMatrix
+    from .trait_index import InvertedTraitIndex
+except ImportError:
+    from indinator.bitset import PackedTraitMatrix
+    from indinator.trait_index import InvertedTraitIndex
+
+# Traits that act as hard filters once confirmed "yes" (and get extra weight)
+HARD_TRAIT_PREFIXES = ('franchise_', 'source_')
+
+# Minimum confidence weight for franchise/source traits
+HARD_TRAIT_MIN_CONFIDENCE = 1.2
+
+# Score given to characters that fail the hard filter (not clamped)
+HARD_FILTER_SCORE = 1e-9
+
+# Minimum score for characters that pass the hard filter
+MIN_SCORE = 0.0001
+
+
+class ScoreAccumulator:
+    """
+    Running per-character state for incremental scoring.
+
+    Holds everything about the known traits that differs between characters:
+    - match_count: number of known traits each character matches
+      (mismatches are num_known - match_count)
+    - hard_ok: characters that have every confirmed franchise/source trait
+      (None until a hard trait is confirmed)
+
+    The confidence weight is the same for every character, so it is not
+    accumulated per character (see PosteriorScorer.confidence_scale).
+    """
+
+    def __init__(self, num_characters: int):
+        """
+        Initialize empty accumulators (nothing known yet).
+
+        Args:
+            num_characters: Number of characters (rows of the feature matrix)
+        """
+        self.match_count = np.zeros(num_characters, dtype=np.int32)
+        self.num_known = 0
+        self.hard_ok: Optional[np.ndarray] = None
+
+
+class PosteriorScorer:
+    """
+    Scores every character against the known traits in a single pass.
+
+    Works directly on the packed trait matrix (n_characters × n_features bits),
+    so each update is a handful of word-wide NumPy operations instead of a
+    Python loop over characters and traits.
+    """
+
+    def __init__(self, matrix: PackedTraitMatrix, feature_names: List[str],
+                 trait_index: Optional[InvertedTraitIndex] = None):
+        """
+        Initialize the scorer.
+
+        Args:
+            matrix: Packed binary trait matrix (n_characters × n_features)
+            feature_names: Trait name for each column of the matrix
+            trait_index: Inverted index over the same matrix (built if not given)
+        """
+        self.matrix = matrix
+        self.trait_index = trait_index if trait_index is not None else InvertedTraitIndex.from_matrix(matrix)
+        self.num_characters, self.num_features = matrix.shape
+
+        # Columns that are franchise_/source_ traits
+        self.hard_feature_mask = np.array(
+            [name.startswith(HARD_TRAIT_PREFIXES) for name in feature_names],
+            dtype=bool
+        )
+
+    def effective_weights(self, features: np.ndarray, confidence: np.ndarray) -> np.ndarray:
+        """
+        Get the weights used for confidence scaling of the given features.
+
+        Args:
+            features: Feature indices
+            confidence: Answer confidence per feature (1.0 for yes/no, 0.75 for probably)
+
+        Returns:
+            Weight per given feature (franchise/source traits are raised to at least 1.2)
+        """
+        weights = confidence[features]
+        return np.where(
+            self.hard_feature_mask[features],
+            np.maximum(weights, HARD_TRAIT_MIN_CONFIDENCE),
+            weights
+        )
+
+    def confidence_scale(self, known: np.ndarray, confidence: np.ndarray) -> float:
+        """
+        Get the multiplier applied to every score from the average answer confidence.
+
+        The weights are summed in feature order with Python floats so the result is
+        bit-for-bit identical to the reference implementation.
+
+        Args:
+            known: Sorted indices of known features
+            confidence: Answer confidence per feature
+
+        Returns:
+            Scale factor (0.5 + 0.5 * average confidence), or 1.0 if nothing is known
+        """
+        if known.size == 0:
+            return 1.0
+        total_weight = sum(self.effective_weights(known, confidence).tolist())
+        if total_weight <= 0:
+            return 1.0
+        avg_confidence = total_weight / known.size
+        return 0.5 + 0.5 * avg_confidence
+
+    def hard_filter(self, feature_vector: np.ndarray, known: np.ndarray) -> Optional[np.ndarray]:
+        """
+        Find characters that have every confirmed franchise/source trait.
+
+        Args:
+            feature_vector: Current feature vector (-1 unknown, 0/1 known)
+            known: Sorted indices of known features
+
+        Returns:
+            Boolean mask over characters, or None if no hard trait is confirmed
+        """
+        hard_yes = known[(feature_vector[known] == 1) & self.hard_feature_mask[known]]
+        if hard_yes.size == 0:
+            return None
+        # Intersect the postings of the confirmed traits (rarest first)
+        return self.trait_index.mask(hard_yes.tolist())
+
+    def count_matches(self, feature_vector: np.ndarray, known_mask: np.ndarray) -> np.ndarray:
+        """
+        Count how many known traits each character matches.
+
+        Args:
+            feature_vector: Current feature vector (-1 unknown, 0/1 known)
+            known_mask: Boolean mask of known features
+
+        Returns:
+            Match count per character (int array)
+        """
+        return self.matrix.count_matches(feature_vector, known_mask)
+
+    def scores_from_counts(self, match_count: np.ndarray, num_known: int, scale: float,
+                           hard_ok: Optional[np.ndarray]) -> np.ndarray:
+        """
+        Turn match counts into (unnormalized) character scores.
+
+        Mirrors the reference rules exactly:
+        - Perfect match: 1 + 0.3m + 0.1m^1.5
+        - Complete mismatch: 0.00001 / 3^mismatches
+        - Partial match: ratio * 0.25^mismatches * bonus(ratio)
+        Then scale by confidence, clamp to MIN_SCORE and apply the hard filter.
+
+        Args:
+            match_count: Match count per character
+            num_known: Number of known traits
+            scale: Confidence scale from confidence_scale()
+            hard_ok: Hard filter mask from hard_filter() (None = no filter)
+
+        Returns:
+            Score per character (float64 array)
+        """
+        matches = match_count.astype(np.float64)
+        mismatches = num_known - matches
+        match_ratio = matches / num_known
+
+        # Partial match: ratio with exponential mismatch penalty and ratio bonus
+        bonus = np.select(
+            [match_ratio >= 0.9, match_ratio >= 0.8, match_ratio >= 0.7],
+            [2.0, 1.5, 1.2],
+            default=0.8
+        )
+        scores = match_ratio * (0.25 ** mismatches) * bonus
+
+        # Perfect match: exponential bonus for the number of matching traits
+        perfect = mismatches == 0
+        scores[perfect] = 1.0 + matches[perfect] * 0.3 + matches[perfect] ** 1.5 * 0.1
+
+        # Complete mismatch: very low score with exponential decay
+        none = matches == 0
+        scores[none] = 0.00001 / (3.0 ** mismatches[none])
+
+        scores *= scale
+        np.maximum(scores, MIN_SCORE, out=scores)
+
+        if hard_ok is not None:
+            scores[~hard_ok] = HARD_FILTER_SCORE
+
+        return scores
+
+    def score(self, feature_vector: np.ndarray, known_mask: np.ndarray,
+              confidence: np.ndarray) -> np.ndarray:
+        """
+        Score every character against the current known traits.
+
+        Args:
+            feature_vector: Current feature vector (-1 unknown, 0/1 known)
+            known_mask: Boolean mask of known features
+            confidence: Answer confidence per feature
+
+        Returns:
+            Score per character (float64 array, unnormalized)
+        """
+        known = np.flatnonzero(known_mask)
+        if known.size == 0:
+            return np.ones(self.num_characters, dtype=np.float64)
+
+        match_count = self.count_matches(feature_vector, known_mask)
+        scale = self.confidence_scale(known, confidence)
+        hard_ok = self.hard_filter(feature_vector, known)
+        return self.scores_from_counts(match_count, known.size, scale, hard_ok)
+
+    def new_accumulator(self) -> ScoreAccumulator:
+        """Create empty accumulators for a new game."""
+        return ScoreAccumulator(self.num_characters)
+
+    def accumulate(self, accumulator: ScoreAccumulator, feature_idx: int, value: int):
+        """
+        Add one newly known feature to the accumulators.
+
+        Only reads column feature_idx of the trait matrix.
+
+        Args:
+            accumulator: Accumulators to update (modified in place)
+            feature_idx: Feature that just became known
+            value: Answered value for the feature (0 or 1)
+        """
+        has_trait = self.matrix.column(feature_idx)
+        accumulator.match_count += (has_trait == bool(value))
+        accumulator.num_known += 1
+
+        # Confirmed franchise/source trait: narrow the hard filter
+        if value == 1 and self.hard_feature_mask[feature_idx]:
+            if accumulator.hard_ok is None:
+                accumulator.hard_ok = has_trait
+            else:
+                accumulator.hard_ok &= has_trait
+
+    def rebuild(self, accumulator: ScoreAccumulator, feature_vector: np.ndarray,
+                known_mask: np.ndarray):
+        """
+        Recompute the accumulators from scratch.
+
+        Needed when a known feature changes value (e.g. the same question is
+        answered twice), since that cannot be undone column by column.
+
+        Args:
+            accumulator: Accumulators to reset (modified in place)
+            feature_vector: Current feature vector (-1 unknown, 0/1 known)
+            known_mask: Boolean mask of known features
+        """
+        known = np.flatnonzero(known_mask)
+        accumulator.num_known = int(known.size)
+        if known.size == 0:
+            accumulator.match_count[:] = 0
+            accumulator.hard_ok = None
+            return
+        accumulator.match_count[:] = self.count_matches(feature_vector, known_mask)
+        accumulator.hard_ok = self.hard_filter(feature_vector, known)
+
+    def score_accumulated(self, accumulator: ScoreAccumulator, known_mask: np.ndarray,
+                          confidence: np.ndarray) -> np.ndarray:
+        """
+        Score every character from the running accumulators.
+
+        Gives exactly the same result as score() for the same game state.
+
+        Args:
+            accumulator: Accumulators for the current game
+            known_mask: Boolean mask of known features
+            confidence: Answer confidence per feature
+
+        Returns:
+            Score per character (float64 array, unnormalized)
+        """
+        if accumulator.num_known == 0:
+            return np.ones(self.num_characters, dtype=np.float64)
+
+        scale = self.confidence_scale(np.flatnonzero(known_mask), confidence)
+        return self.scores_from_counts(
+            accumulator.match_count, accumulator.num_known, scale, accumulator.hard_ok
+        )
+
+    @staticmethod
+    def normalize(scores: np.ndarray) -> np.ndarray:
+        """
+        Normalize scores to a probability distribution.
+
+        Args:
+            scores: Non-negative score per character
+
+        Returns:
+            Probabilities summing to 1 (uniform if all scores are zero)
+        """
+        total = scores.sum()
+        if total > 0:
+            return scores / total
+        return np.full(scores.shape, 1.0 / scores.size)
+
+    @staticmethod
+    def normalize_log(log_weights: np.ndarray) -> np.ndarray:
+        """
+        Normalize log-weights to a probability distribution (stable log-sum-exp).
+
+        Subtracting the largest log-weight before exponentiating keeps the
+        leading candidates exact however small the raw weights have become.
+
+        Args:
+            log_weights: Log of the unnormalized weight per character (-inf = impossible)
+
+        Returns:
+            Probabilities summing to 1 (uniform if every weight is zero)
+        """
+        top = log_weights.max()
+        if not np.isfinite(top):
+            return np.full(log_weights.shape, 1.0 / log_weights.size)
+        weights = np.exp(log_weights - top)
+        return weights / weights.sum()
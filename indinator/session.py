@@ -0,0 +1,239 @@
+"""
+Per-session Game State
+Separates the small mutable state of one game from the shared, read-only model
+(feature matrix, decision tree, questions) so one process can serve many players.
+"""
+
+import secrets
+import threading
+import time
+from collections import OrderedDict
+from typing import Callable, Dict, FrozenSet, List, Optional, Set, Tuple
+
+import numpy as np
+
+
+class GameState:
+    """
+    Mutable state of a single game.
+
+    Everything DecisionTreeAI changes while a game is played lives here:
+    - current_feature_vector: answered trait values (-1 = unknown)
+    - known_mask: which features are known
+    - log_weights: log of each character's unnormalized weight (same order as the model's characters)
+    - probabilities: the normalized weights, computed from log_weights when read (None = stale)
+    - asked_questions / question_history: what has been asked and answered
+    - eligible_questions: questions that can still be asked (unasked, trait unknown, not redundant)
+    - answer_confidence / confidence_vector: confidence of each answered trait
+    - score_accumulator: running match counts for incremental scoring
+    - tree_node: deepest decision tree node reached by the known answers (walks resume here)
+    - ensemble_nodes: the same per tree of the 'ensemble' strategy (None until first used)
+    - opening_key: position in the opening book ("" at the start, None once off-book)
+    - answer_key / adjustments: position for the transposition cache (trait answers, None
+      if not cacheable) and guess penalties/boosts since the last rescore
+    - last_guess: name of the last guess shown to the player (for feedback)
+    """
+
+    def __init__(self, num_features: int, num_characters: int, score_accumulator=None,
+                 eligible_questions: Optional[np.ndarray] = None):
+        """
+        Create a fresh game state (nothing known, uniform probabilities).
+
+        Args:
+            num_features: Number of features (traits) in the model
+            num_characters: Number of characters in the model
+            score_accumulator: Empty ScoreAccumulator for incremental scoring
+            eligible_questions: Boolean array of the questions askable in a fresh game
+                                (owned by this state from now on)
+        """
+        self.current_feature_vector = np.full(num_features, -1, dtype=np.int8)
+        self.known_mask = np.zeros(num_features, dtype=bool)
+
+        self.asked_questions: Set[int] = set()
+        self.question_history: List[Dict] = []
+        self.eligible_questions = eligible_questions
+
+        # Maps trait_name -> confidence (1.0 for yes/no, 0.75 for probably/probably_not)
+        self.answer_confidence: Dict[str, float] = {}
+        self.confidence_vector = np.ones(num_features, dtype=np.float64)
+
+        self.score_accumulator = score_accumulator
+
+        self.tree_node = 0
+        self.ensemble_nodes: Optional[List[int]] = None
+
+        self.opening_key: Optional[str] = ''
+
+        self.answer_key: Optional[FrozenSet[Tuple]] = frozenset()
+        self.adjustments: Tuple = ()
+
+        self.log_weights = np.zeros(num_characters, dtype=np.float64)
+        self.probabilities: Optional[np.ndarray] = np.full(num_characters, 1.0 / num_characters,
+                                                           dtype=np.float64)
+
+        self.last_guess: Optional[str] = None
+
+    def nbytes(self) -> int:
+        """
+        Approximate memory used by this state (arrays plus a rough per-entry cost).
+
+        Returns:
+            Size estimate in bytes
+        """
+        size = (
+            self.current_feature_vector.nbytes
+            + self.known_mask.nbytes
+            + self.confidence_vector.nbytes
+            + self.log_weights.nbytes
+        )
+        if self.probabilities is not None:
+            size += self.probabilities.nbytes
+        if self.eligible_questions is not None:
+            size += self.eligible_questions.nbytes
+        if self.score_accumulator is not None:
+            size += self.score_accumulator.match_count.nbytes
+            if self.score_accumulator.hard_ok is not None:
+                size += self.score_accumulator.hard_ok.nbytes
+        # Sets, dicts and history entries: ~100 bytes per entry is a safe estimate
+        size += 100 * (len(self.asked_questions) + len(self.question_history) + len(self.answer_confidence)
+                       + len(self.answer_key or ()) + len(self.adjustments))
+        return size
+
+
+class Session:
+    """A game state registered in a SessionStore."""
+
+    def __init__(self, session_id: str, state: GameState):
+        self.session_id = session_id
+        self.state = state
+        self.last_access = time.monotonic()
+        # Size estimate as of the last access (kept in the store's running total)
+        self.nbytes = state.nbytes()
+        # Serializes requests of the same player (e.g. double-clicked answers)
+        self.lock = threading.Lock()
+
+
+class SessionStore:
+    """
+    Thread-safe, session-keyed store of game states.
+
+    Sessions are kept in least-recently-used order. They are evicted when idle
+    for longer than ttl_seconds, and the least recently used ones are dropped
+    when max_sessions or max_bytes would be exceeded.
+    """
+
+    def __init__(self, state_factory: Callable[[], GameState], ttl_seconds: float = 1800.0,
+                 max_sessions: int = 10000, max_bytes: Optional[int] = None, id_prefix: str = ''):
+        """
+        Initialize an empty store.
+
+        Args:
+            state_factory: Creates a fresh GameState (e.g. DecisionTreeAI.new_state)
+            ttl_seconds: Idle time after which a session expires (default: 30 minutes)
+            max_sessions: Maximum number of live sessions (default: 10000)
+            max_bytes: Optional cap on the total estimated size of all states
+            id_prefix: Prepended to every session id (e.g. to tell which server process owns it)
+        """
+        self.state_factory = state_factory
+        self.ttl_seconds = ttl_seconds
+        self.max_sessions = max_sessions
+        self.max_bytes = max_bytes
+        self.id_prefix = id_prefix
+
+        self._sessions: "OrderedDict[str, Session]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._total_bytes = 0
+        self.evictions = 0
+
+    def create(self) -> Session:
+        """
+        Start a new session with a fresh game state.
+
+        Returns:
+            The new Session
+        """
+        session = Session(self.id_prefix + secrets.token_urlsafe(16), self.state_factory())
+        with self._lock:
+            self._evict_expired()
+            self._sessions[session.session_id] = session
+            self._total_bytes += session.nbytes
+            self._enforce_limits()
+        return session
+
+    def get(self, session_id: Optional[str]) -> Optional[Session]:
+        """
+        Look up a session and mark it as recently used.
+
+        Args:
+            session_id: Session id sent by the client
+
+        Returns:
+            The Session, or None if unknown or expired
+        """
+        if not session_id:
+            return None
+        with self._lock:
+            self._evict_expired()
+            session = self._sessions.get(session_id)
+            if session is None:
+                return None
+            session.last_access = time.monotonic()
+            self._sessions.move_to_end(session_id)
+
+            # Refresh the size estimate (history grows as the game goes on)
+            nbytes = session.state.nbytes()
+            self._total_bytes += nbytes - session.nbytes
+            session.nbytes = nbytes
+            self._enforce_limits()
+            return session
+
+    def reset(self, session: Session):
+        """
+        Replace a session's game state with a fresh one (new game, same session).
+
+        Args:
+            session: Session to reset
+        """
+        session.state = self.state_factory()
+
+    def delete(self, session_id: str):
+        """Remove a session (no-op if it doesn't exist)."""
+        with self._lock:
+            session = self._sessions.pop(session_id, None)
+            if session is not None:
+                self._total_bytes -= session.nbytes
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._sessions)
+
+    def total_bytes(self) -> int:
+        """Estimated memory used by all live game states."""
+        with self._lock:
+            return self._total_bytes
+
+    def _evict_expired(self):
+        """Drop sessions idle for longer than the TTL (caller holds the lock)."""
+        cutoff = time.monotonic() - self.ttl_seconds
+        # Sessions are in access order, so expired ones are at the front
+        while self._sessions:
+            oldest = next(iter(self._sessions.values()))
+            if oldest.last_access >= cutoff:
+                break
+            self._pop_oldest()
+
+    def _enforce_limits(self):
+        """Drop least recently used sessions over the caps (caller holds the lock)."""
+        while len(self._sessions) > self.max_sessions:
+            self._pop_oldest()
+
+        if self.max_bytes is not None:
+            # Always keep the most recent session, even if it alone exceeds the cap
+            while self._total_bytes > self.max_bytes and len(self._sessions) > 1:
+                self._pop_oldest()
+
+    def _pop_oldest(self):
+        """Evict the least recently used session (caller holds the lock)."""
+        _, session = self._sessions.popitem(last=False)
+        self._total_bytes -= session.nbytes
+        self.evictions += 1
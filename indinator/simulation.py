@@ -0,0 +1,306 @@
+"""
+Headless Self-Play Simulation
+Plays games against DecisionTreeAI without a human: a simulated player thinks
+of a character and answers every question from that character's ground-truth
+traits, with configurable noise and "probably" / "don't know" rates.
+
+The game loop mirrors AkinatorGame.run (minimum questions before guessing,
+penalize wrong guesses and keep asking, final guess at max_questions).
+
+Reports win rate, average questions, per-step latency percentiles and
+games/second as a stable JSON document (see REPORT_FORMAT_VERSION), so results
+can be compared across releases.
+
+Run with:  python scripts/simulate.py
+"""
+
+import json
+import random
+import time
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+# Bump when keys of the report change meaning (adding keys is compatible)
+REPORT_FORMAT_VERSION = 1
+
+# Latency percentiles reported for a single engine step
+LATENCY_PERCENTILES = (50, 95, 99)
+
+# Game loop settings (same as the CLI game started by main.py)
+DEFAULT_GAME_OPTIONS = {
+    'max_questions': 30,
+    'confidence_threshold': 0.75,
+    'min_questions': 4,
+}
+
+
+class AnswerModel:
+    """
+    How the simulated player answers a question about a trait.
+
+    For each question, in order of the rates:
+    - dont_know_rate: answers "dont_know"
+    - probably_rate: answers "probably" / "probably_not" (in the wrong direction
+      with probability probably_wrong_rate, otherwise the right one)
+    - noise_rate: answers "yes"/"no" wrongly
+    - otherwise: answers "yes"/"no" correctly
+    """
+
+    def __init__(self, noise_rate: float = 0.0, probably_rate: float = 0.0, dont_know_rate: float = 0.0,
+                 probably_wrong_rate: float = 0.0):
+        """
+        Initialize the answer model.
+
+        Args:
+            noise_rate: Probability of a wrong yes/no answer
+            probably_rate: Probability of a "probably"/"probably not" answer
+            dont_know_rate: Probability of a "don't know" answer
+            probably_wrong_rate: Fraction of "probably"/"probably not" answers that are wrong
+        """
+        if min(noise_rate, probably_rate, dont_know_rate) < 0 or noise_rate + probably_rate + dont_know_rate > 1:
+            raise ValueError("Answer rates must be non-negative and sum to at most 1")
+        if not 0 <= probably_wrong_rate <= 1:
+            raise ValueError("probably_wrong_rate must be between 0 and 1")
+        self.noise_rate = noise_rate
+        self.probably_rate = probably_rate
+        self.dont_know_rate = dont_know_rate
+        self.probably_wrong_rate = probably_wrong_rate
+
+    def answer(self, has_trait: Optional[bool], rng: random.Random) -> str:
+        """
+        Answer one question.
+
+        Args:
+            has_trait: Whether the character has the asked trait (None = question has no trait)
+            rng: Random number generator for this game
+
+        Returns:
+            Answer type: "yes", "no", "probably", "probably_not", "dont_know"
+        """
+        r = rng.random()
+        if has_trait is None or r < self.dont_know_rate:
+            return "dont_know"
+        r -= self.dont_know_rate
+        if r < self.probably_rate:
+            if self.probably_wrong_rate and rng.random() < self.probably_wrong_rate:
+                has_trait = not has_trait
+            return "probably" if has_trait else "probably_not"
+        r -= self.probably_rate
+        if r < self.noise_rate:
+            return "no" if has_trait else "yes"
+        return "yes" if has_trait else "no"
+
+    def to_dict(self) -> Dict[str, float]:
+        return {
+            'noise_rate': self.noise_rate,
+            'probably_rate': self.probably_rate,
+            'dont_know_rate': self.dont_know_rate,
+            'probably_wrong_rate': self.probably_wrong_rate,
+        }
+
+
+def game_seed(seed: int, game_number: int) -> int:
+    """
+    Seed for one game's answer RNG.
+
+    Depends only on the run seed and the game's position, so results are the
+    same no matter how games are split across runs or workers.
+    """
+    return seed * 1_000_003 + game_number
+
+
+def play_game(ai, character: str, answer_model: AnswerModel, rng: random.Random,
+              max_questions: int = 30, confidence_threshold: float = 0.75,
+              min_questions: int = 4) -> Dict:
+    """
+    Play one game against the AI with a simulated player.
+
+    Args:
+        ai: DecisionTreeAI (its current game state is reset)
+        character: Character the simulated player thinks of
+        answer_model: How the player answers
+        rng: Random number generator for this game's answers
+        max_questions: Maximum questions before a final guess (default: 30)
+        confidence_threshold: Passed to should_make_guess (default: 0.75, as in main.py)
+        min_questions: Questions asked before guessing is allowed (default: 4, as in main.py)
+
+    Returns:
+        Dict with character, won, questions, guesses and step_latencies (seconds per step)
+    """
+    ai.reset()
+    row = ai.character_ids[character]
+    feature_of_question = ai.question_features
+
+    questions_asked = 0
+    guesses = 0
+    won = False
+    step_latencies: List[float] = []
+
+    def guess() -> bool:
+        nonlocal guesses
+        guesses += 1
+        guessed, _ = ai.get_best_guess()
+        if guessed == character:
+            return True
+        ai.penalize_wrong_guess(guessed)
+        return False
+
+    while questions_asked < max_questions:
+        start = time.perf_counter()
+
+        if questions_asked >= min_questions and ai.should_make_guess(confidence_threshold):
+            if guess():
+                won = True
+                break
+
+        question_idx = ai.select_best_question()
+        if question_idx is None:
+            # Out of questions: final guess (AkinatorGame forces one either way)
+            won = guess()
+            break
+
+        # The player's answer is not part of the engine's latency
+        thinking_start = time.perf_counter()
+        feature_idx = int(feature_of_question[question_idx])
+        has_trait = ai.trait_matrix.has_trait(row, feature_idx) if feature_idx >= 0 else None
+        answer = answer_model.answer(has_trait, rng)
+        thinking = time.perf_counter() - thinking_start
+
+        ai.update_probabilities(question_idx, answer)
+        questions_asked += 1
+        step_latencies.append(time.perf_counter() - start - thinking)
+
+    if not won and questions_asked >= max_questions:
+        won = guess()
+
+    return {
+        'character': character,
+        'won': won,
+        'questions': questions_asked,
+        'guesses': guesses,
+        'step_latencies': step_latencies,
+    }
+
+
+def schedule_games(characters: Sequence[str], repeats: int = 1) -> List[Tuple[int, str]]:
+    """
+    List the games of a run: every character `repeats` times.
+
+    Returns:
+        (game_number, character) pairs
+    """
+    return [
+        (repeat * len(characters) + idx, character)
+        for repeat in range(repeats)
+        for idx, character in enumerate(characters)
+    ]
+
+
+def run_games(ai, games: Sequence[Tuple[int, str]], answer_model: AnswerModel, seed: int = 0,
+              **game_options) -> List[Dict]:
+    """
+    Play a list of games.
+
+    Args:
+        ai: DecisionTreeAI to play against
+        games: (game_number, character) pairs from schedule_games (or a slice of them)
+        answer_model: How the player answers
+        seed: Run seed
+        **game_options: Passed to play_game (max_questions, confidence_threshold, min_questions)
+
+    Returns:
+        Per-game results (see play_game), each with its game number
+    """
+    results = []
+    for game_number, character in games:
+        rng = random.Random(game_seed(seed, game_number))
+        result = play_game(ai, character, answer_model, rng, **game_options)
+        result['game'] = game_number
+        results.append(result)
+    return results
+
+
+def run_config(ai, characters: Sequence[str], answer_model: AnswerModel, seed: int,
+               repeats: int, game_options: Dict) -> Dict:
+    """Settings recorded in a report's "config" section."""
+    return {
+        'seed': seed,
+        'repeats': repeats,
+        'characters': len(characters),
+        'scoring_mode': ai.scoring_mode,
+        'question_strategy': ai.question_strategy,
+        'answers': answer_model.to_dict(),
+        'game': {**DEFAULT_GAME_OPTIONS, **game_options},
+        'guess_policy': ai.guess_policy.to_dict(),
+    }
+
+
+def summarize(results: List[Dict], elapsed_seconds: float, config: Optional[Dict] = None) -> Dict:
+    """
+    Build the report for a set of played games.
+
+    Args:
+        results: Per-game results from play_game / run_games
+        elapsed_seconds: Wall-clock time taken to play them
+        config: Settings to record in the report
+
+    Returns:
+        Report dict (see module docstring)
+    """
+    games = len(results)
+    wins = sum(1 for r in results if r['won'])
+    latencies = np.array([t for r in results for t in r['step_latencies']], dtype=np.float64)
+
+    latency_ms = {'mean': 0.0}
+    latency_ms.update({f'p{p}': 0.0 for p in LATENCY_PERCENTILES})
+    if latencies.size:
+        latency_ms['mean'] = round(float(latencies.mean()) * 1000, 4)
+        for p, value in zip(LATENCY_PERCENTILES, np.percentile(latencies, LATENCY_PERCENTILES)):
+            latency_ms[f'p{p}'] = round(float(value) * 1000, 4)
+
+    return {
+        'format_version': REPORT_FORMAT_VERSION,
+        'config': config or {},
+        'games': games,
+        'wins': wins,
+        'win_rate': round(wins / games, 4) if games else 0.0,
+        'avg_questions': round(sum(r['questions'] for r in results) / games, 4) if games else 0.0,
+        'avg_guesses': round(sum(r['guesses'] for r in results) / games, 4) if games else 0.0,
+        'steps': int(latencies.size),
+        'step_latency_ms': latency_ms,
+        'games_per_second': round(games / elapsed_seconds, 2) if elapsed_seconds > 0 else 0.0,
+        'elapsed_seconds': round(elapsed_seconds, 3),
+        'lost': sorted(r['character'] for r in results if not r['won']),
+    }
+
+
+def simulate(ai, characters: Optional[List[str]] = None, answer_model: Optional[AnswerModel] = None,
+             seed: int = 0, repeats: int = 1, **game_options) -> Dict:
+    """
+    Play every character against the AI and report accuracy and speed.
+
+    Args:
+        ai: DecisionTreeAI to play against
+        characters: Characters to play (default: all of the AI's characters)
+        answer_model: How the player answers (default: always truthful yes/no)
+        seed: Run seed (same seed + settings = same games)
+        repeats: Games per character
+        **game_options: Passed to play_game (max_questions, confidence_threshold, min_questions)
+
+    Returns:
+        Report dict (see summarize)
+    """
+    characters = list(ai.characters if characters is None else characters)
+    answer_model = answer_model or AnswerModel()
+
+    start = time.perf_counter()
+    results = run_games(ai, schedule_games(characters, repeats), answer_model, seed=seed, **game_options)
+    elapsed = time.perf_counter() - start
+
+    return summarize(results, elapsed, run_config(ai, characters, answer_model, seed, repeats, game_options))
+
+
+def format_report(report: Dict) -> str:
+    """Serialize a report as stable JSON (sorted keys, fixed indentation)."""
+    return json.dumps(report, indent=2, sort_keys=True)
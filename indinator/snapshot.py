@@ -0,0 +1,221 @@
+"""
+Precompiled Model Snapshot
+Stores everything DecisionTreeAI needs at startup (packed trait matrix, trait/question
+index maps, flattened tree arrays) in a single versioned binary file that is
+memory-mapped on load, so the server starts without parsing JSON or retraining.
+
+File layout (little-endian):
+    8 bytes   magic b"INDSNAP\\0"
+    4 bytes   format version (uint32)
+    4 bytes   header length in bytes (uint32)
+    header    UTF-8 JSON: source hash, metadata and an array table
+    arrays    raw array data, each aligned to ALIGNMENT bytes
+
+Build one with:  python scripts/build_snapshot.py
+"""
+
+import hashlib
+import json
+import mmap
+import struct
+from pathlib import Path
+from typing import Dict, Optional
+
+import numpy as np
+
+SNAPSHOT_MAGIC = b"INDSNAP\0"
+SNAPSHOT_FORMAT_VERSION = 2
+
+# Alignment of each array inside the file (cache-line sized)
+ALIGNMENT = 64
+
+_PREAMBLE = struct.Struct("<8sII")
+
+
+class SnapshotError(Exception):
+    """Raised when a snapshot file is missing, corrupt, or out of date."""
+
+
+class ModelSnapshot:
+    """
+    A loaded (memory-mapped) snapshot.
+
+    Attributes:
+        source_hash: Content hash of the JSON files the snapshot was built from
+        metadata: JSON metadata (characters, feature names, questions, build params, ...)
+        arrays: Read-only arrays backed by the memory map
+    """
+
+    def __init__(self, source_hash: str, metadata: Dict, arrays: Dict[str, np.ndarray], buffer=None):
+        self.source_hash = source_hash
+        self.metadata = metadata
+        self.arrays = arrays
+        # Keep the mapping alive for as long as the arrays are used
+        self._buffer = buffer
+
+    def __getitem__(self, name: str) -> np.ndarray:
+        return self.arrays[name]
+
+
+def source_hash(*files: str) -> str:
+    """
+    Compute a content hash over the given source files.
+
+    Args:
+        files: Paths to the source JSON files (order matters)
+
+    Returns:
+        Hex SHA-256 digest of the files' bytes
+    """
+    digest = hashlib.sha256()
+    for filepath in files:
+        data = Path(filepath).read_bytes()
+        # Length prefix so moving bytes between files changes the hash
+        digest.update(struct.pack("<Q", len(data)))
+        digest.update(data)
+    return digest.hexdigest()
+
+
+def _aligned(offset: int) -> int:
+    """Round offset up to the next multiple of ALIGNMENT."""
+    return (offset + ALIGNMENT - 1) // ALIGNMENT * ALIGNMENT
+
+
+def encode_snapshot(content_hash: str, metadata: Dict, arrays: Dict[str, np.ndarray]) -> bytes:
+    """
+    Serialize a snapshot to bytes (the exact contents of a snapshot file).
+
+    Args:
+        content_hash: Content hash of the source JSON files (see source_hash())
+        metadata: JSON-serializable metadata
+        arrays: Arrays to store (written in C order)
+
+    Returns:
+        Snapshot bytes, readable with read_snapshot()
+    """
+    arrays = {name: np.ascontiguousarray(arr) for name, arr in arrays.items()}
+
+    # Lay out arrays relative to the start of the data section
+    table = {}
+    offset = 0
+    for name, arr in arrays.items():
+        offset = _aligned(offset)
+        table[name] = {
+            'dtype': arr.dtype.str,
+            'shape': list(arr.shape),
+            'offset': offset,
+        }
+        offset += arr.nbytes
+
+    header = json.dumps({
+        'source_hash': content_hash,
+        'metadata': metadata,
+        'arrays': table,
+    }, ensure_ascii=False).encode('utf-8')
+    data_start = _aligned(_PREAMBLE.size + len(header))
+
+    data = bytearray(data_start + offset)
+    _PREAMBLE.pack_into(data, 0, SNAPSHOT_MAGIC, SNAPSHOT_FORMAT_VERSION, len(header))
+    data[_PREAMBLE.size:_PREAMBLE.size + len(header)] = header
+    for name, arr in arrays.items():
+        start = data_start + table[name]['offset']
+        data[start:start + arr.nbytes] = arr.tobytes()
+    return bytes(data)
+
+
+def write_snapshot(path: str, content_hash: str, metadata: Dict, arrays: Dict[str, np.ndarray]):
+    """
+    Write a snapshot file.
+
+    Args:
+        path: Output file path
+        content_hash: Content hash of the source JSON files (see source_hash())
+        metadata: JSON-serializable metadata
+        arrays: Arrays to store (written in C order)
+    """
+    data = encode_snapshot(content_hash, metadata, arrays)
+
+    path = Path(path)
+    tmp_path = path.with_suffix(path.suffix + '.tmp')
+    with open(tmp_path, 'wb') as f:
+        f.write(data)
+    # Atomic replace so running servers never see a half-written file
+    tmp_path.replace(path)
+
+
+def read_snapshot(buffer) -> ModelSnapshot:
+    """
+    Parse a snapshot from a buffer (mmap, bytes, shared memory, ...).
+
+    Arrays are zero-copy views into the buffer.
+
+    Args:
+        buffer: Object supporting the buffer protocol
+
+    Returns:
+        ModelSnapshot
+
+    Raises:
+        SnapshotError: If the data is not a valid snapshot of this format version
+    """
+    view = memoryview(buffer)
+    if len(view) < _PREAMBLE.size:
+        raise SnapshotError("File too small to be a snapshot")
+
+    magic, version, header_len = _PREAMBLE.unpack_from(view, 0)
+    if magic != SNAPSHOT_MAGIC:
+        raise SnapshotError("Not a model snapshot (bad magic)")
+    if version != SNAPSHOT_FORMAT_VERSION:
+        raise SnapshotError(f"Unsupported snapshot version {version} (expected {SNAPSHOT_FORMAT_VERSION})")
+
+    try:
+        header = json.loads(bytes(view[_PREAMBLE.size:_PREAMBLE.size + header_len]).decode('utf-8'))
+    except ValueError as e:
+        raise SnapshotError(f"Corrupt snapshot header: {e}")
+
+    data_start = _aligned(_PREAMBLE.size + header_len)
+    arrays = {}
+    try:
+        for name, info in header['arrays'].items():
+            dtype = np.dtype(info['dtype'])
+            shape = tuple(info['shape'])
+            count = int(np.prod(shape, dtype=np.int64))
+            start = data_start + int(info['offset'])
+            if start < data_start or start + count * dtype.itemsize > len(view):
+                raise SnapshotError(f"Snapshot truncated (array '{name}')")
+            arrays[name] = np.frombuffer(view, dtype=dtype, count=count, offset=start).reshape(shape)
+        return ModelSnapshot(header['source_hash'], header['metadata'], arrays, buffer)
+    except (KeyError, TypeError, ValueError, AttributeError) as e:
+        raise SnapshotError(f"Corrupt snapshot header: {e!r}")
+
+
+def load_snapshot(path: str, expected_hash: Optional[str] = None) -> ModelSnapshot:
+    """
+    Memory-map a snapshot file.
+
+    Args:
+        path: Snapshot file path
+        expected_hash: If given, the snapshot's source hash must match
+                       (use source_hash() on the current JSON files)
+
+    Returns:
+        ModelSnapshot whose arrays are backed by the read-only mapping
+
+    Raises:
+        SnapshotError: If the file is missing, invalid, or stale
+    """
+    path = Path(path)
+    if not path.exists():
+        raise SnapshotError(f"Snapshot not found: {path}")
+
+    try:
+        with open(path, 'rb') as f:
+            # (an empty file can't be mapped)
+            buffer = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+    except (OSError, ValueError) as e:
+        raise SnapshotError(f"Cannot read snapshot {path}: {e}")
+
+    snapshot = read_snapshot(buffer)
+    if expected_hash is not None and snapshot.source_hash != expected_hash:
+        raise SnapshotError("Snapshot is stale (source data changed); rebuild it")
+    return snapshot
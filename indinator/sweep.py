@@ -0,0 +1,174 @@
+"""
+Guess Policy Sweep
+Plays the self-play simulation (see simulation.py) under many GuessPolicy
+settings (grid or random search) and reports the Pareto frontier of win rate
+vs. average questions: the policies no other policy beats on both.
+
+Run with:  python scripts/sweep.py
+"""
+
+import itertools
+import json
+import random
+import time
+from typing import Dict, List, Optional, Sequence
+
+try:
+    from .guess_policy import GuessPolicy
+    from .parallel_eval import ParallelEvaluator
+    from .simulation import AnswerModel, DEFAULT_GAME_OPTIONS, simulate
+except ImportError:
+    from indinator.guess_policy import GuessPolicy
+    from indinator.parallel_eval import ParallelEvaluator
+    from indinator.simulation import AnswerModel, DEFAULT_GAME_OPTIONS, simulate
+
+# Bump when keys of the report change meaning (adding keys is compatible)
+SWEEP_FORMAT_VERSION = 1
+
+# Default search space: GuessPolicy parameter -> candidate values.
+# ("threshold" is the base confidence threshold, also used as the game's
+# confidence_threshold.) boost_factor is left out: it is only applied once
+# the player reveals the answer, so self-play cannot measure it.
+DEFAULT_SEARCH_SPACE = {
+    'threshold': [0.65, 0.75, 0.85],
+    'early_questions': [10, 15, 20],
+    'early_confidence': [0.85, 0.90, 0.95],
+    'instant_confidence': [0.80, 0.90],
+    'penalty_factor': [0.001, 0.01, 0.1],
+}
+
+
+def grid_candidates(space: Dict[str, Sequence]) -> List[Dict]:
+    """
+    Every combination of the candidate values.
+
+    Args:
+        space: Parameter -> list of values
+
+    Returns:
+        Parameter dicts, in a fixed order
+    """
+    names = list(space)
+    return [dict(zip(names, values)) for values in itertools.product(*(space[n] for n in names))]
+
+
+def random_candidates(space: Dict[str, Sequence], trials: int, seed: int = 0) -> List[Dict]:
+    """
+    Random samples from the search space (duplicates removed).
+
+    Args:
+        space: Parameter -> list of values, or a [low, high] range given as a tuple
+               (sampled uniformly; integers if both ends are integers)
+        trials: Number of samples to draw
+        seed: Sampling seed
+
+    Returns:
+        Parameter dicts
+    """
+    rng = random.Random(seed)
+    candidates = []
+    seen = set()
+    for _ in range(trials):
+        params = {}
+        for name, values in space.items():
+            if isinstance(values, tuple):
+                low, high = values
+                if isinstance(low, int) and isinstance(high, int):
+                    params[name] = rng.randint(low, high)
+                else:
+                    params[name] = round(rng.uniform(low, high), 4)
+            else:
+                params[name] = rng.choice(list(values))
+        key = json.dumps(params, sort_keys=True)
+        if key not in seen:
+            seen.add(key)
+            candidates.append(params)
+    return candidates
+
+
+def pareto_frontier(trials: List[Dict]) -> List[Dict]:
+    """
+    Trials not dominated on (higher win rate, fewer average questions).
+
+    Args:
+        trials: Trial results with "win_rate" and "avg_questions"
+
+    Returns:
+        Frontier trials, fewest questions first
+    """
+    ordered = sorted(trials, key=lambda t: (t['avg_questions'], -t['win_rate']))
+    frontier = []
+    best_win_rate = -1.0
+    for trial in ordered:
+        if trial['win_rate'] > best_win_rate:
+            frontier.append(trial)
+            best_win_rate = trial['win_rate']
+    return frontier
+
+
+def run_sweep(ai, candidates: List[Dict], base_policy: Optional[GuessPolicy] = None,
+              answer_model: Optional[AnswerModel] = None, seed: int = 0, repeats: int = 1,
+              workers: int = 1, **game_options) -> Dict:
+    """
+    Evaluate every candidate policy with self-play.
+
+    All candidates play the same games (same seed), so differences come from
+    the policy alone.
+
+    Args:
+        ai: DecisionTreeAI to play against
+        candidates: Parameter dicts (see grid_candidates / random_candidates)
+        base_policy: Policy the candidates' parameters are applied to (default: the AI's)
+        answer_model: How the simulated player answers (default: always truthful yes/no)
+        seed: Run seed
+        repeats: Games per character per candidate
+        workers: Worker processes (1 = run in this process)
+        **game_options: Passed to play_game (max_questions, min_questions)
+
+    Returns:
+        Report dict with every trial and the Pareto frontier
+    """
+    base_policy = base_policy or ai.guess_policy
+    answer_model = answer_model or AnswerModel()
+
+    evaluator = ParallelEvaluator(ai, workers) if workers != 1 else None
+    original_policy = ai.guess_policy
+    trials = []
+    start = time.perf_counter()
+    try:
+        for trial_idx, params in enumerate(candidates):
+            policy = base_policy.replace(**params)
+            options = {**game_options, 'confidence_threshold': policy.threshold}
+            if evaluator is not None:
+                report = evaluator.evaluate(answer_model=answer_model, seed=seed, repeats=repeats,
+                                            guess_policy=policy, **options)
+            else:
+                ai.guess_policy = policy
+                report = simulate(ai, answer_model=answer_model, seed=seed, repeats=repeats, **options)
+            trials.append({
+                'trial': trial_idx,
+                'params': params,
+                'games': report['games'],
+                'win_rate': report['win_rate'],
+                'avg_questions': report['avg_questions'],
+                'avg_guesses': report['avg_guesses'],
+            })
+    finally:
+        ai.guess_policy = original_policy
+        if evaluator is not None:
+            evaluator.close()
+
+    return {
+        'format_version': SWEEP_FORMAT_VERSION,
+        'config': {
+            'seed': seed,
+            'repeats': repeats,
+            'workers': evaluator.workers if evaluator is not None else 1,
+            'answers': answer_model.to_dict(),
+            'game': {**DEFAULT_GAME_OPTIONS, **game_options},
+            'base_policy': base_policy.to_dict(),
+        },
+        'elapsed_seconds': round(time.perf_counter() - start, 3),
+        'trials': trials,
+        'pareto_frontier': pareto_frontier(trials),
+    }
@@ -0,0 +1,118 @@
+"""
+Inverted Trait Index
+Maps each trait to the sorted ids (rows) of the characters that have it, stored
+in CSR form (one flat id array plus per-trait offsets), with per-trait cardinalities.
+
+Used where the engine needs "which characters have trait f" rather than
+"which traits does character c have": intersecting confirmed hard traits
+(franchise_/source_) and looking up how rare a trait is.
+"""
+
+import numpy as np
+from typing import Iterable
+
+try:
+    from .bitset import PackedTraitMatrix
+except ImportError:
+    from indinator.bitset import PackedTraitMatrix
+
+
+class InvertedTraitIndex:
+    """
+    Trait -> sorted character ids (CSR postings).
+
+    Attributes:
+        indptr: (n_features + 1) offsets; postings of trait f are indices[indptr[f]:indptr[f + 1]]
+        indices: Character ids, sorted within each trait
+        cardinalities: Number of characters with each trait
+    """
+
+    # Array names used when exporting/importing (e.g. in model snapshots)
+    ARRAY_NAMES = ('indptr', 'indices')
+
+    def __init__(self, indptr: np.ndarray, indices: np.ndarray, num_characters: int):
+        """
+        Wrap prebuilt CSR arrays.
+
+        Args:
+            indptr: Per-trait offsets into indices
+            indices: Concatenated sorted character ids
+            num_characters: Number of characters (for building masks)
+        """
+        self.indptr = indptr
+        self.indices = indices
+        self.num_characters = num_characters
+        self.cardinalities = np.diff(indptr)
+
+    @classmethod
+    def from_matrix(cls, matrix: PackedTraitMatrix) -> 'InvertedTraitIndex':
+        """
+        Build the index from a trait matrix.
+
+        Args:
+            matrix: Packed binary trait matrix (n_characters × n_features)
+
+        Returns:
+            InvertedTraitIndex over the matrix's columns
+        """
+        # Nonzeros of the transposed matrix come out grouped by trait, ids ascending
+        features, characters = np.nonzero(matrix.to_dense().T)
+        counts = np.bincount(features, minlength=matrix.num_features)
+        indptr = np.zeros(matrix.num_features + 1, dtype=np.int64)
+        np.cumsum(counts, out=indptr[1:])
+        return cls(indptr, characters.astype(np.int32), matrix.num_characters)
+
+    def to_arrays(self):
+        """Export the CSR arrays (mapping of ARRAY_NAMES -> array)."""
+        return {'indptr': self.indptr, 'indices': self.indices}
+
+    def characters_with(self, feature_idx: int) -> np.ndarray:
+        """
+        Get the characters that have a trait.
+
+        Args:
+            feature_idx: Feature index
+
+        Returns:
+            Sorted character ids (a view, do not modify)
+        """
+        return self.indices[self.indptr[feature_idx]:self.indptr[feature_idx + 1]]
+
+    def cardinality(self, feature_idx: int) -> int:
+        """Number of characters that have a trait."""
+        return int(self.cardinalities[feature_idx])
+
+    def intersect(self, features: Iterable[int]) -> np.ndarray:
+        """
+        Get the characters that have every one of the given traits.
+
+        Postings are intersected rarest first, so the work is bounded by
+        the smallest posting list.
+
+        Args:
+            features: Feature indices (at least one)
+
+        Returns:
+            Sorted character ids
+        """
+        ordered = sorted(features, key=lambda f: self.cardinalities[f])
+        result = self.characters_with(ordered[0])
+        for feature_idx in ordered[1:]:
+            if result.size == 0:
+                break
+            result = np.intersect1d(result, self.characters_with(feature_idx), assume_unique=True)
+        return result
+
+    def mask(self, features: Iterable[int]) -> np.ndarray:
+        """
+        Boolean mask of the characters that have every one of the given traits.
+
+        Args:
+            features: Feature indices (at least one)
+
+        Returns:
+            Boolean mask over characters
+        """
+        mask = np.zeros(self.num_characters, dtype=bool)
+        mask[self.intersect(features)] = True
+        return mask
@@ -0,0 +1,154 @@
+"""
+Transposition Cache
+Shares belief-state results between games that reached the same position.
+
+Many players answer the opening questions the same way, so their games pass
+through identical belief states. A position is identified by the set of
+(trait, answer) pairs given so far, plus the questions answered without
+setting a trait ("don't know"). The order does not matter: scoring only looks
+at the resulting known traits, and question selection at those and the
+questions asked. Which question set a trait doesn't matter either (once a
+trait is known, none of its questions can be asked). Games that answer a
+question or trait twice are not cached. DecisionTreeAI caches two things per
+position:
+
+- the rescored probability vector, keyed by the answer set alone (rescoring
+  replaces any earlier wrong-guess penalties, see update_probabilities)
+- the selected next question, keyed by the answer set plus the guess
+  penalties/boosts applied since the last rescore (they change the
+  probabilities the selection looks at)
+
+Entries are evicted least recently used first when the memory budget is exceeded.
+"""
+
+import threading
+from collections import OrderedDict
+from typing import Dict, Hashable, Optional
+
+# Default memory budget of an engine's cache
+DEFAULT_CACHE_BYTES = 8 * 1024 * 1024
+
+# Rough cost of a cache entry besides its value (key tuples, dict slot): ~100 bytes
+# per (trait, answer) pair, as in SessionStore's estimates
+_ENTRY_OVERHEAD = 200
+_PAIR_BYTES = 100
+
+
+class TranspositionCache:
+    """
+    Thread-safe LRU cache with a memory budget and hit/miss counters.
+
+    Shared by all games of one engine (and its for_state views).
+    """
+
+    def __init__(self, max_bytes: int = DEFAULT_CACHE_BYTES):
+        """
+        Initialize an empty cache.
+
+        Args:
+            max_bytes: Memory budget for all entries (estimated)
+        """
+        self.max_bytes = max_bytes
+
+        self._entries: "OrderedDict[Hashable, tuple]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._total_bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    @staticmethod
+    def entry_size(num_pairs: int, value_bytes: int = 0) -> int:
+        """
+        Estimate the memory used by one entry.
+
+        Args:
+            num_pairs: Number of (trait, answer) pairs in the key
+            value_bytes: Size of the cached value (e.g. ndarray.nbytes)
+
+        Returns:
+            Size estimate in bytes
+        """
+        return _ENTRY_OVERHEAD + _PAIR_BYTES * num_pairs + value_bytes
+
+    def get(self, key: Hashable, default=None):
+        """
+        Look up an entry and mark it as recently used.
+
+        Args:
+            key: Cache key
+            default: Returned on a miss (use a sentinel if None can be cached)
+
+        Returns:
+            The cached value, or default on a miss
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return default
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[0]
+
+    def put(self, key: Hashable, value, nbytes: int):
+        """
+        Store an entry (evicting least recently used ones over the budget).
+
+        Args:
+            key: Cache key
+            value: Value to cache (must not be modified afterwards)
+            nbytes: Size estimate of the entry (see entry_size)
+        """
+        if nbytes > self.max_bytes:
+            return
+        with self._lock:
+            old = self._entries.pop(key, None)
+            if old is not None:
+                self._total_bytes -= old[1]
+            self._entries[key] = (value, nbytes)
+            self._total_bytes += nbytes
+            while self._total_bytes > self.max_bytes:
+                _, (_, evicted_bytes) = self._entries.popitem(last=False)
+                self._total_bytes -= evicted_bytes
+                self.evictions += 1
+
+    def clear(self):
+        """Drop all entries (counters are kept)."""
+        with self._lock:
+            self._entries.clear()
+            self._total_bytes = 0
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._entries)
+
+    def total_bytes(self) -> int:
+        """Estimated memory used by all entries."""
+        with self._lock:
+            return self._total_bytes
+
+    def hit_rate(self) -> Optional[float]:
+        """Fraction of lookups that were hits (None before the first lookup)."""
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups else None
+
+    def stats(self) -> Dict:
+        """
+        Get cache statistics.
+
+        Returns:
+            Dictionary with entries, bytes, max_bytes, hits, misses, hit_rate and evictions
+        """
+        with self._lock:
+            entries = len(self._entries)
+            total_bytes = self._total_bytes
+        return {
+            'entries': entries,
+            'bytes': total_bytes,
+            'max_bytes': self.max_bytes,
+            'hits': self.hits,
+            'misses': self.misses,
+            'hit_rate': self.hit_rate(),
+            'evictions': self.evictions,
+        }
@@ -0,0 +1,237 @@
+"""
+Flat Decision Tree Runtime
+Holds a fitted decision tree as plain NumPy arrays and walks it without
+scikit-learn, so serving processes never import sklearn (it is only needed
+to train the tree; see DecisionTreeAI._train_tree).
+"""
+
+import numpy as np
+from typing import Dict, Tuple
+
+# Guard against malformed trees (real trees are at most max_depth deep)
+MAX_WALK_STEPS = 100
+
+# Soft walks stop following branches reached with less probability than this
+# (0.2 keeps the other branch of one "probably" answer, 0.25, but not of two)
+MIN_REACH = 0.2
+
+
+class FlatTree:
+    """
+    Decision tree stored as parallel node arrays.
+
+    Uses the same layout as scikit-learn's `tree_` object:
+    - feature[node]: feature index the node splits on (negative for leaves)
+    - threshold[node]: split threshold (go left if value <= threshold)
+    - children_left[node] / children_right[node]: child node ids (equal for leaves)
+    - feature_importances_: importance of each feature (sums to 1)
+    """
+
+    # Array names used when exporting/importing (e.g. in model snapshots)
+    ARRAY_NAMES = ('feature', 'threshold', 'children_left', 'children_right', 'feature_importances')
+
+    def __init__(self, feature: np.ndarray, threshold: np.ndarray, children_left: np.ndarray,
+                 children_right: np.ndarray, feature_importances: np.ndarray):
+        """
+        Initialize from node arrays.
+
+        Args:
+            feature: Split feature per node
+            threshold: Split threshold per node
+            children_left: Left child id per node
+            children_right: Right child id per node
+            feature_importances: Importance per feature
+        """
+        self.feature = feature
+        self.threshold = threshold
+        self.children_left = children_left
+        self.children_right = children_right
+        self.feature_importances_ = feature_importances
+        self.node_count = len(feature)
+
+        # Python-list copies for the scalar node-by-node walk
+        # (list indexing is much cheaper than indexing NumPy arrays one element at a time)
+        self.feature_list = feature.tolist()
+        self.threshold_list = threshold.tolist()
+        self.left_list = children_left.tolist()
+        self.right_list = children_right.tolist()
+
+    @classmethod
+    def from_sklearn(cls, classifier) -> 'FlatTree':
+        """
+        Export a fitted sklearn DecisionTreeClassifier.
+
+        Args:
+            classifier: Fitted DecisionTreeClassifier
+
+        Returns:
+            FlatTree with contiguous copies of the classifier's node arrays
+        """
+        tree = classifier.tree_
+        return cls(
+            np.ascontiguousarray(tree.feature, dtype=np.int32),
+            np.ascontiguousarray(tree.threshold, dtype=np.float64),
+            np.ascontiguousarray(tree.children_left, dtype=np.int32),
+            np.ascontiguousarray(tree.children_right, dtype=np.int32),
+            np.ascontiguousarray(classifier.feature_importances_, dtype=np.float64),
+        )
+
+    @classmethod
+    def from_arrays(cls, arrays: Dict[str, np.ndarray]) -> 'FlatTree':
+        """
+        Rebuild a tree from the arrays produced by to_arrays().
+
+        Args:
+            arrays: Mapping of ARRAY_NAMES -> array
+
+        Returns:
+            FlatTree using the given arrays (not copied)
+        """
+        return cls(*(arrays[name] for name in cls.ARRAY_NAMES))
+
+    def to_arrays(self) -> Dict[str, np.ndarray]:
+        """
+        Export the node arrays.
+
+        Returns:
+            Mapping of ARRAY_NAMES -> array
+        """
+        return {
+            'feature': self.feature,
+            'threshold': self.threshold,
+            'children_left': self.children_left,
+            'children_right': self.children_right,
+            'feature_importances': self.feature_importances_,
+        }
+
+    def is_leaf(self, node: int) -> bool:
+        """Check whether a node is a leaf."""
+        return self.left_list[node] == self.right_list[node]
+
+    def find_frontier(self, known_mask: np.ndarray, feature_vector: np.ndarray, node: int = 0) -> int:
+        """
+        Walk down from a node following known feature values.
+
+        Stops at the first node that splits on an unknown feature (the next
+        thing worth asking about), or at a leaf.
+
+        Args:
+            known_mask: Boolean mask of known features
+            feature_vector: Current feature values (only read where known)
+            node: Node to start from (default: root)
+
+        Returns:
+            Node id of the frontier node (check is_leaf() to tell the two cases apart)
+        """
+        feature = self.feature_list
+        threshold = self.threshold_list
+        left = self.left_list
+        right = self.right_list
+
+        for _ in range(MAX_WALK_STEPS):
+            if left[node] == right[node]:
+                return node
+            feature_idx = feature[node]
+            if not known_mask[feature_idx]:
+                return node
+            # Binary features: 0 or 1, threshold is typically 0.5
+            if feature_vector[feature_idx] <= threshold[node]:
+                node = left[node]
+            else:
+                node = right[node]
+        return node
+
+    def soft_frontier(self, known_mask: np.ndarray, feature_vector: np.ndarray,
+                      confidence: np.ndarray, min_reach: float = MIN_REACH) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Walk down both branches of known splits, weighted by answer confidence.
+
+        At a node splitting on a known feature, the answered branch gets the
+        answer's confidence and the other branch the rest (e.g. 0.75 / 0.25 for
+        "probably"), so an uncertain answer doesn't rule a subtree out.
+        Definite answers (confidence 1.0) follow one branch, like find_frontier().
+
+        Args:
+            known_mask: Boolean mask of known features
+            feature_vector: Current feature values (only read where known)
+            confidence: Confidence of each known feature's answer (0.5 - 1.0)
+            min_reach: Branches reached with less probability are dropped
+
+        Returns:
+            (nodes, reach): frontier nodes that split on an unknown feature, and the
+            probability of reaching each (leaves are not included)
+        """
+        feature = self.feature_list
+        threshold = self.threshold_list
+        left = self.left_list
+        right = self.right_list
+
+        nodes = []
+        reach = []
+        stack = [(0, 1.0, 0)]
+        while stack:
+            node, weight, depth = stack.pop()
+            if weight < min_reach or depth > MAX_WALK_STEPS or left[node] == right[node]:
+                continue
+            feature_idx = feature[node]
+            if not known_mask[feature_idx]:
+                nodes.append(node)
+                reach.append(weight)
+                continue
+            answered, other = left[node], right[node]
+            if feature_vector[feature_idx] > threshold[node]:
+                answered, other = other, answered
+            certainty = float(confidence[feature_idx])
+            stack.append((other, weight * (1.0 - certainty), depth + 1))
+            stack.append((answered, weight * certainty, depth + 1))
+        return np.array(nodes, dtype=np.int64), np.array(reach, dtype=np.float64)
+
+    def node_membership(self, X: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Find which samples pass through each node.
+
+        Stored sparsely, one entry per node on a sample's root-to-leaf path, so
+        the size grows with samples × depth rather than samples × nodes.
+
+        Args:
+            X: Feature matrix (n_samples × n_features), e.g. the training characters
+
+        Returns:
+            (nodes, samples): parallel int arrays, sample samples[i] passes through node nodes[i]
+        """
+        n_samples = X.shape[0]
+        samples = np.arange(n_samples)
+        node = np.zeros(n_samples, dtype=np.int64)
+        path_nodes = [node]
+        path_samples = [samples]
+        for _ in range(MAX_WALK_STEPS):
+            inner = self.children_left[node] != self.children_right[node]
+            if not inner.any():
+                break
+            go_right = X[samples, self.feature[node]] > self.threshold[node]
+            child = np.where(go_right, self.children_right[node], self.children_left[node])
+            node = np.where(inner, child, node)
+            path_nodes.append(node[inner])
+            path_samples.append(samples[inner])
+        return np.concatenate(path_nodes), np.concatenate(path_samples)
+
+    def get_depth(self) -> int:
+        """
+        Get the maximum depth of the tree (root only = 0).
+
+        Returns:
+            Depth of the deepest leaf
+        """
+        max_depth = 0
+        stack = [(0, 0)]
+        while stack:
+            node, depth = stack.pop()
+            max_depth = max(max_depth, depth)
+            if not self.is_leaf(node):
+                stack.append((int(self.children_left[node]), depth + 1))
+                stack.append((int(self.children_right[node]), depth + 1))
+        return max_depth
+
+    def get_n_leaves(self) -> int:
+        """Get the number of leaf nodes."""
+        return int(np.sum(self.children_left == self.children_right))
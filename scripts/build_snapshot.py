@@ -0,0 +1,70 @@
+"""
+Build the precompiled model snapshot used for fast server startup.
+Parses the JSON data, trains the Decision Tree (and the randomized trees of the
+'ensemble' question strategy) once, and writes everything the engine needs to
+data/model.snapshot (memory-mapped at startup).
+
+Run again whenever traits_flat.json, questions.json or redundancy_rules.json change; a stale snapshot
+is detected by its content hash and ignored by the engine.
+"""
+
+import argparse
+import sys
+import time
+from pathlib import Path
+
+# Make project root importable
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from indinator import DecisionTreeAI
+from indinator.decision_tree_engine import DEFAULT_ENSEMBLE_SIZE
+from indinator.snapshot import load_snapshot
+
+
+def build_snapshot(traits_file: str, questions_file: str, output_file: str,
+                   max_depth: int = 20, min_samples_split: int = 2,
+                   ensemble_size: int = DEFAULT_ENSEMBLE_SIZE):
+    """
+    Train the model from JSON and write it as a snapshot.
+
+    ensemble_size randomized trees are trained too (in parallel), so engines using
+    question_strategy='ensemble' with that many trees load them instead of training;
+    0 leaves them out.
+    """
+    ai = DecisionTreeAI(
+        traits_file=traits_file,
+        questions_file=questions_file,
+        max_depth=max_depth,
+        min_samples_split=min_samples_split,
+        question_strategy='ensemble' if ensemble_size > 0 else 'tree',
+        ensemble_size=ensemble_size,
+    )
+    ai.save_snapshot(output_file)
+
+    size_kb = Path(output_file).stat().st_size / 1024
+    print(f"\n✓ Saved model snapshot to {output_file} ({size_kb:.1f} KB)")
+
+    # Report how long a cold load takes
+    start = time.perf_counter()
+    load_snapshot(output_file, ai.source_hash)
+    elapsed_ms = (time.perf_counter() - start) * 1000
+    print(f"  - Load time: {elapsed_ms:.2f} ms")
+
+
+if __name__ == "__main__":
+    data_dir = project_root / "data"
+
+    parser = argparse.ArgumentParser(description="Build the Indinator model snapshot.")
+    parser.add_argument("--traits", default=str(data_dir / "traits_flat.json"))
+    parser.add_argument("--questions", default=str(data_dir / "questions.json"))
+    parser.add_argument("--output", default=str(data_dir / "model.snapshot"))
+    parser.add_argument("--max-depth", type=int, default=20)
+    parser.add_argument("--min-samples-split", type=int, default=2)
+    parser.add_argument("--ensemble-size", type=int, default=DEFAULT_ENSEMBLE_SIZE,
+                        help="Randomized trees for the 'ensemble' question strategy (0 = none)")
+    args = parser.parse_args()
+
+    build_snapshot(args.traits, args.questions, args.output,
+                   max_depth=args.max_depth, min_samples_split=args.min_samples_split,
+                   ensemble_size=args.ensemble_size)
@@ -0,0 +1,79 @@
+"""
+Self-play simulation and throughput benchmark.
+Plays every character in traits_flat.json against DecisionTreeAI, answering
+from the ground-truth traits, and prints a JSON report (win rate, average
+questions, per-step latency percentiles, games/second).
+
+Example:
+    python scripts/simulate.py --noise 0.05 --probably 0.15 --dont-know 0.1 --output report.json
+    python scripts/simulate.py --repeats 20 --workers 8    # parallel, shared-memory model
+"""
+
+import argparse
+import contextlib
+import io
+import sys
+from pathlib import Path
+
+# Make project root importable
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from indinator import DecisionTreeAI
+from indinator.parallel_eval import evaluate_parallel
+from indinator.simulation import AnswerModel, format_report, simulate
+
+
+if __name__ == "__main__":
+    data_dir = project_root / "data"
+
+    parser = argparse.ArgumentParser(description="Run Indinator self-play and report accuracy/speed.")
+    parser.add_argument("--traits", default=str(data_dir / "traits_flat.json"))
+    parser.add_argument("--questions", default=str(data_dir / "questions.json"))
+    parser.add_argument("--snapshot", default=None, help="Model snapshot to load (default: train from JSON)")
+    parser.add_argument("--scoring-mode", default="vectorized")
+    parser.add_argument("--question-strategy", default="tree", help="tree, information_gain, soft_tree or ensemble")
+    parser.add_argument("--ensemble-size", type=int, default=16, help="Trees for --question-strategy ensemble")
+    parser.add_argument("--noise", type=float, default=0.0, help="Rate of wrong yes/no answers")
+    parser.add_argument("--probably", type=float, default=0.0, help="Rate of probably/probably not answers")
+    parser.add_argument("--dont-know", type=float, default=0.0, help="Rate of don't know answers")
+    parser.add_argument("--probably-wrong", type=float, default=0.0,
+                        help="Fraction of probably/probably not answers in the wrong direction")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--repeats", type=int, default=1, help="Games per character")
+    parser.add_argument("--max-questions", type=int, default=30)
+    parser.add_argument("--confidence-threshold", type=float, default=0.75)
+    parser.add_argument("--min-questions", type=int, default=4)
+    parser.add_argument("--workers", type=int, default=1,
+                        help="Worker processes (0 = one per CPU, 1 = run in this process)")
+    parser.add_argument("--output", default=None, help="Also write the report to this file")
+    args = parser.parse_args()
+
+    # Keep stdout clean for the JSON report
+    with contextlib.redirect_stdout(io.StringIO()):
+        ai = DecisionTreeAI(
+            traits_file=args.traits,
+            questions_file=args.questions,
+            scoring_mode=args.scoring_mode,
+            snapshot_file=args.snapshot,
+            question_strategy=args.question_strategy,
+            ensemble_size=args.ensemble_size,
+        )
+
+    run_options = dict(
+        answer_model=AnswerModel(args.noise, args.probably, args.dont_know, args.probably_wrong),
+        seed=args.seed,
+        repeats=args.repeats,
+        max_questions=args.max_questions,
+        confidence_threshold=args.confidence_threshold,
+        min_questions=args.min_questions,
+    )
+    if args.workers == 1:
+        report = simulate(ai, **run_options)
+    else:
+        report = evaluate_parallel(ai, workers=args.workers or None, **run_options)
+
+    text = format_report(report)
+    print(text)
+    if args.output:
+        Path(args.output).write_text(text + "\n", encoding="utf-8")
@@ -0,0 +1,92 @@
+"""
+Guess policy sweep.
+Runs self-play over a grid or random search of GuessPolicy parameters and
+prints a JSON report with every trial and the Pareto frontier of win rate vs.
+average questions.
+
+Examples:
+    python scripts/sweep.py --noise 0.05 --probably 0.15 --dont-know 0.1 --workers 0
+    python scripts/sweep.py --mode random --trials 50 --space my_space.json --output sweep.json
+
+A search space file maps GuessPolicy parameters to lists of candidate values,
+e.g. {"threshold": [0.7, 0.8], "early_questions": [10, 15, 20]}. With --ranges,
+two-element lists are [low, high] ranges sampled uniformly by random search.
+"""
+
+import argparse
+import contextlib
+import io
+import json
+import sys
+from pathlib import Path
+
+# Make project root importable
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from indinator import DecisionTreeAI
+from indinator.simulation import AnswerModel
+from indinator.sweep import DEFAULT_SEARCH_SPACE, grid_candidates, random_candidates, run_sweep
+
+
+if __name__ == "__main__":
+    data_dir = project_root / "data"
+
+    parser = argparse.ArgumentParser(description="Sweep Indinator guess policies with self-play.")
+    parser.add_argument("--traits", default=str(data_dir / "traits_flat.json"))
+    parser.add_argument("--questions", default=str(data_dir / "questions.json"))
+    parser.add_argument("--snapshot", default=None, help="Model snapshot to load (default: train from JSON)")
+    parser.add_argument("--mode", choices=["grid", "random"], default="grid")
+    parser.add_argument("--trials", type=int, default=50, help="Samples for random search")
+    parser.add_argument("--space", default=None, help="JSON search space (default: built-in)")
+    parser.add_argument("--ranges", action="store_true",
+                        help="Treat two-element lists in the space as [low, high] ranges (random search)")
+    parser.add_argument("--noise", type=float, default=0.0, help="Rate of wrong yes/no answers")
+    parser.add_argument("--probably", type=float, default=0.0, help="Rate of probably/probably not answers")
+    parser.add_argument("--dont-know", type=float, default=0.0, help="Rate of don't know answers")
+    parser.add_argument("--probably-wrong", type=float, default=0.0,
+                        help="Fraction of probably/probably not answers in the wrong direction")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--repeats", type=int, default=1, help="Games per character per trial")
+    parser.add_argument("--max-questions", type=int, default=30)
+    parser.add_argument("--min-questions", type=int, default=4)
+    parser.add_argument("--workers", type=int, default=1,
+                        help="Worker processes (0 = one per CPU, 1 = run in this process)")
+    parser.add_argument("--output", default=None, help="Also write the report to this file")
+    args = parser.parse_args()
+
+    space = DEFAULT_SEARCH_SPACE
+    if args.space:
+        space = json.loads(Path(args.space).read_text(encoding="utf-8"))
+    if args.ranges:
+        space = {k: tuple(v) if isinstance(v, list) and len(v) == 2 else v for k, v in space.items()}
+
+    if args.mode == "grid":
+        candidates = grid_candidates(space)
+    else:
+        candidates = random_candidates(space, args.trials, seed=args.seed)
+
+    # Keep stdout clean for the JSON report
+    with contextlib.redirect_stdout(io.StringIO()):
+        ai = DecisionTreeAI(
+            traits_file=args.traits,
+            questions_file=args.questions,
+            snapshot_file=args.snapshot,
+        )
+
+    report = run_sweep(
+        ai,
+        candidates,
+        answer_model=AnswerModel(args.noise, args.probably, args.dont_know, args.probably_wrong),
+        seed=args.seed,
+        repeats=args.repeats,
+        workers=args.workers or None,
+        max_questions=args.max_questions,
+        min_questions=args.min_questions,
+    )
+    report['config']['mode'] = args.mode
+
+    text = json.dumps(report, indent=2, sort_keys=True)
+    print(text)
+    if args.output:
+        Path(args.output).write_text(text + "\n", encoding="utf-8")
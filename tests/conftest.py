@@ -0,0 +1,91 @@
+"""
+Shared fixtures: engines built from the data in data/, and deterministic self-play.
+"""
+
+import contextlib
+import io
+import json
+import random
+import sys
+from pathlib import Path
+
+import pytest
+
+# Make project root importable
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from indinator import DecisionTreeAI
+
+DATA_DIR = project_root / "data"
+TRAITS_FILE = str(DATA_DIR / "traits_flat.json")
+QUESTIONS_FILE = str(DATA_DIR / "questions.json")
+
+
+def make_engine(**options) -> DecisionTreeAI:
+    """Build an engine from the JSON data (initialization output suppressed)."""
+    with contextlib.redirect_stdout(io.StringIO()):
+        return DecisionTreeAI(TRAITS_FILE, QUESTIONS_FILE, **options)
+
+
+@pytest.fixture(scope="session")
+def traits():
+    """Character -> trait values, as in traits_flat.json."""
+    with open(TRAITS_FILE, encoding="utf-8") as f:
+        return json.load(f)
+
+
+@pytest.fixture(scope="session")
+def engine():
+    """Default engine, shared by tests that only play on for_state views."""
+    return make_engine()
+
+
+@pytest.fixture(scope="session")
+def play(traits):
+    """
+    Self-play one game and return its trace.
+
+    The simulated player answers from the character's traits, with seeded
+    "don't know", "probably" and wrong answers; wrong guesses are penalized.
+    Each trace step is (question, answer, probabilities) or ('guess', name).
+    """
+    def play_game(ai: DecisionTreeAI, character: str, seed: int, max_steps: int = 25):
+        rng = random.Random(seed)
+        game = ai.for_state(ai.new_state())
+        character_traits = traits[character]
+        trace = []
+        for step in range(max_steps):
+            if step >= 4 and game.should_make_guess(0.75):
+                name, _ = game.get_best_guess()
+                trace.append(('guess', name))
+                if name == character:
+                    break
+                game.penalize_wrong_guess(name)
+            question_idx = game.select_best_question()
+            if question_idx is None:
+                break
+            has_trait = character_traits.get(game.questions[question_idx]['trait'], 0) == 1
+            r = rng.random()
+            if r < 0.1:
+                answer = 'dont_know'
+            elif r < 0.25:
+                answer = 'probably' if has_trait else 'probably_not'
+            elif r < 0.3:
+                answer = 'no' if has_trait else 'yes'
+            else:
+                answer = 'yes' if has_trait else 'no'
+            game.update_probabilities(question_idx, answer)
+            trace.append((question_idx, answer, game.probabilities.copy()))
+        return trace
+
+    return play_game
+
+
+def assert_same_trace(expected, actual):
+    """Same questions, answers and guesses, and (to rounding) the same probabilities."""
+    assert len(expected) == len(actual)
+    for step_expected, step_actual in zip(expected, actual):
+        assert step_expected[:2] == step_actual[:2]
+        if step_expected[0] != 'guess':
+            assert step_expected[2] == pytest.approx(step_actual[2], rel=1e-9, abs=1e-12)
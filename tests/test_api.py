@@ -0,0 +1,128 @@
+"""
+Web API: GameService and the Flask routes built on it.
+"""
+
+import pytest
+
+from indinator.api_service import MAX_SUGGESTIONS, ApiError, GameService
+
+
+@pytest.fixture
+def service(engine):
+    return GameService(engine)
+
+
+@pytest.fixture(scope="module")
+def client():
+    import api_server
+
+    assert api_server.ai is not None
+    return api_server.app.test_client()
+
+
+def test_suggest(service, engine):
+    name = engine.characters[0]
+    result = service.suggest(name[:3].lower())
+    assert result['query'] == name[:3].lower()
+    assert {'name': name} in result['suggestions']
+    assert len(service.suggest('a', limit='100')['suggestions']) <= MAX_SUGGESTIONS
+    assert service.suggest('a', limit=0)['suggestions'] == []
+    with pytest.raises(ApiError) as error:
+        service.suggest('a', limit='x')
+    assert error.value.status == 400
+
+
+def test_suggest_route_is_cacheable(client, engine):
+    response = client.get('/api/characters/suggest', query_string={'q': engine.characters[0][:4]})
+    assert response.status_code == 200
+    assert {'name': engine.characters[0]} in response.get_json()['suggestions']
+    assert 'public' in response.headers['Cache-Control']
+    assert 'max-age=86400' in response.headers['Cache-Control']
+    etag = response.headers['ETag']
+    assert etag.strip('"') == engine.source_hash
+
+    cached = client.get('/api/characters/suggest', query_string={'q': 'x'}, headers={'If-None-Match': etag})
+    assert cached.status_code == 304
+
+    assert client.get('/api/characters/suggest', query_string={'q': 'x', 'limit': 'many'}).status_code == 400
+
+
+def play_until_guess(service, character_traits, max_answers=40):
+    """Answer truthfully for one character until the service guesses."""
+    questions = service.ai.questions
+    state = service.start()
+    for _ in range(max_answers):
+        if state['guess'] is not None or state['question'] is None:
+            break
+        answer = 'yes' if character_traits.get(questions[state['question']['id']]['trait'], 0) == 1 else 'no'
+        state = service.answer(state['sessionId'], state['question']['id'], answer)
+    return state
+
+
+def test_game_flow(service):
+    state = service.start()
+    session_id = state['sessionId']
+    assert state['guess'] is None and state['questionNumber'] == 1
+    assert len(state['topCandidates']) == 8
+
+    state = service.answer(session_id, str(state['question']['id']), 'probably_no')
+    assert state['sessionId'] == session_id and state['questionNumber'] == 2
+    assert service.next_question(session_id)['question'] == state['question']
+
+    # Restarting keeps the session but starts a fresh game
+    restarted = service.start(session_id)
+    assert restarted['sessionId'] == session_id and restarted['questionNumber'] == 1
+
+
+def test_guess_feedback(service, traits):
+    state = play_until_guess(service, traits['Harry Potter'])
+    assert state['guess'] is not None
+    result = service.guess_feedback(state['sessionId'], False)
+    assert result['ok']
+    # The guess was scored: scoring it again is an error
+    with pytest.raises(ApiError) as error:
+        service.guess_feedback(state['sessionId'], True)
+    assert error.value.status == 400
+
+
+@pytest.mark.parametrize("question_id, answer, status", [
+    (None, 'yes', 400),
+    (1, None, 400),
+    ('x', 'yes', 400),
+    ([1], 'yes', 400),
+    (1, 'maybe', 400),
+])
+def test_invalid_answers(service, question_id, answer, status):
+    session_id = service.start()['sessionId']
+    with pytest.raises(ApiError) as error:
+        service.answer(session_id, question_id, answer)
+    assert error.value.status == status
+
+
+def test_unknown_session(service):
+    for call in (lambda: service.answer('nope', 1, 'yes'),
+                 lambda: service.next_question(None),
+                 lambda: service.guess_feedback('nope', True)):
+        with pytest.raises(ApiError) as error:
+            call()
+        assert error.value.status == 404
+    # Starting with an unknown id creates a new session
+    assert service.start('nope')['sessionId'] != 'nope'
+
+
+def test_flask_routes(client):
+    state = client.post('/api/start', json={}).get_json()
+    session_id = state['sessionId']
+    question_id = state['question']['id']
+
+    response = client.post('/api/answer', json={'sessionId': session_id, 'questionId': question_id, 'answer': 'yes'})
+    assert response.status_code == 200 and response.get_json()['questionNumber'] == 2
+    response = client.post('/api/next-question', json={}, headers={'X-Session-Id': session_id})
+    assert response.status_code == 200
+
+    bad_id = client.post('/api/answer', json={'sessionId': session_id, 'questionId': 'x', 'answer': 'yes'})
+    assert bad_id.status_code == 400 and bad_id.get_json() == {'error': "Invalid 'questionId'"}
+    assert client.post('/api/answer', json={'sessionId': session_id, 'answer': 'yes'}).status_code == 400
+    assert client.post('/api/guess-feedback', json={'sessionId': session_id, 'correct': True}).status_code == 400
+    assert client.post('/api/answer', json={'sessionId': 'nope', 'questionId': 1, 'answer': 'yes'}).status_code == 404
+    assert client.post('/api/next-question', json={'sessionId': 'nope'}).status_code == 404
@@ -0,0 +1,58 @@
+"""
+Packed trait matrix and inverted trait index against the dense matrix they encode.
+"""
+
+import numpy as np
+import pytest
+
+from indinator.bitset import PackedTraitMatrix
+from indinator.trait_index import InvertedTraitIndex
+
+
+@pytest.fixture(scope="module")
+def dense():
+    # 130 traits: spans three 64-bit words, the last one partly used
+    rng = np.random.default_rng(0)
+    return (rng.random((40, 130)) < 0.3).astype(np.int8)
+
+
+@pytest.fixture(scope="module")
+def matrix(dense):
+    return PackedTraitMatrix.from_dense(dense)
+
+
+def test_round_trip(dense, matrix):
+    assert matrix.shape == dense.shape
+    np.testing.assert_array_equal(matrix.to_dense(), dense)
+    np.testing.assert_array_equal(matrix.to_dense([3, 7]), dense[[3, 7]])
+    for feature_idx in (0, 63, 64, 129):
+        np.testing.assert_array_equal(matrix.column(feature_idx), dense[:, feature_idx])
+    np.testing.assert_array_equal(matrix.row_features(5), np.flatnonzero(dense[5]))
+    assert matrix.has_trait(5, int(np.flatnonzero(dense[5])[0]))
+
+
+def test_count_matches(dense, matrix):
+    rng = np.random.default_rng(1)
+    for _ in range(5):
+        known = rng.random(dense.shape[1]) < 0.4
+        feature_vector = np.where(known, rng.integers(0, 2, dense.shape[1]), -1).astype(np.int8)
+        expected = ((dense == feature_vector) & known).sum(axis=1)
+        np.testing.assert_array_equal(matrix.count_matches(feature_vector, known), expected)
+
+
+def test_inverted_index(dense, matrix):
+    index = InvertedTraitIndex.from_matrix(matrix)
+    for feature_idx in range(dense.shape[1]):
+        np.testing.assert_array_equal(index.characters_with(feature_idx), np.flatnonzero(dense[:, feature_idx]))
+        assert index.cardinality(feature_idx) == dense[:, feature_idx].sum()
+
+    features = [2, 64, 100]
+    expected = np.flatnonzero(dense[:, features].all(axis=1))
+    np.testing.assert_array_equal(index.intersect(features), expected)
+    np.testing.assert_array_equal(np.flatnonzero(index.mask(features)), expected)
+
+
+def test_inverted_index_round_trip(matrix):
+    index = InvertedTraitIndex.from_matrix(matrix)
+    copy = InvertedTraitIndex(*index.to_arrays().values(), matrix.num_characters)
+    np.testing.assert_array_equal(copy.cardinalities, index.cardinalities)
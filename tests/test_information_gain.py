@@ -0,0 +1,60 @@
+"""
+Expected information gain against a brute-force expected posterior entropy.
+"""
+
+import numpy as np
+import pytest
+
+from indinator.information_gain import DEFAULT_ANSWER_LIKELIHOODS, InformationGainSelector
+
+
+def entropy(p: np.ndarray) -> float:
+    p = p[p > 0]
+    return float(-(p * np.log2(p)).sum())
+
+
+def brute_force_gain(X: np.ndarray, probabilities: np.ndarray, likelihoods) -> np.ndarray:
+    """H(C) minus the expected entropy of the posterior after each answer."""
+    gains = []
+    for feature_idx in range(X.shape[1]):
+        has_trait = X[:, feature_idx]
+        expected = 0.0
+        for absent, present in likelihoods:
+            joint = probabilities * np.where(has_trait == 1, present, absent)
+            p_answer = joint.sum()
+            if p_answer > 0:
+                expected += p_answer * entropy(joint / p_answer)
+        gains.append(entropy(probabilities) - expected)
+    return np.array(gains)
+
+
+@pytest.fixture(scope="module")
+def problem():
+    rng = np.random.default_rng(0)
+    X = (rng.random((30, 12)) < 0.4).astype(np.int8)
+    X[:, 0] = 1  # every character has it: no gain
+    probabilities = rng.random(30) ** 3
+    return X, probabilities / probabilities.sum()
+
+
+def test_exact_answers(problem):
+    X, probabilities = problem
+    gains = InformationGainSelector(X).expected_gain(probabilities)
+    expected = brute_force_gain(X, probabilities, [(1.0, 0.0), (0.0, 1.0)])
+    np.testing.assert_allclose(gains, expected, atol=1e-5)
+    assert gains[0] == pytest.approx(0.0, abs=1e-6)
+
+
+def test_soft_answers(problem):
+    X, probabilities = problem
+    gains = InformationGainSelector(X, DEFAULT_ANSWER_LIKELIHOODS).expected_gain(probabilities)
+    expected = brute_force_gain(X, probabilities, list(DEFAULT_ANSWER_LIKELIHOODS.values()))
+    np.testing.assert_allclose(gains, expected, atol=1e-5)
+    # Noisy answers are worth less than exact ones
+    assert np.all(gains <= InformationGainSelector(X).expected_gain(probabilities) + 1e-9)
+
+
+def test_likelihoods_must_be_distributions(problem):
+    X, _ = problem
+    with pytest.raises(ValueError):
+        InformationGainSelector(X, {'yes': (0.5, 0.5), 'no': (0.2, 0.5)})
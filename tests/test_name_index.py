@@ -0,0 +1,106 @@
+"""
+NameIndex: ranked fuzzy lookup and prefix completion of character names.
+"""
+
+import subprocess
+import sys
+
+import pytest
+
+from conftest import project_root
+from indinator.name_index import NameIndex, edit_distance, normalize_name
+
+NAMES = [
+    "Harry Potter",
+    "Hermione Granger",
+    "Ron Weasley",
+    "Spider-Man",
+    "Darth Vader",
+    "Luke Skywalker",
+    "Zoë O'Neill",
+    "Potter Stewart",
+    "Harry Osborn",
+]
+
+
+@pytest.fixture(scope="module")
+def index():
+    return NameIndex(NAMES)
+
+
+def names_of(index, results):
+    return [index.names[idx] for idx, _ in results]
+
+
+def test_normalize_name():
+    assert normalize_name("Zoë  O'Neill") == "zoe o neill"
+    assert normalize_name("  Spider-Man ") == "spider man"
+
+
+def test_edit_distance():
+    assert edit_distance("potter", "poter") == 1
+    assert edit_distance("kitten", "sitting") == 3
+    assert edit_distance("kitten", "sitting", max_distance=1) == 2
+
+
+def test_exact_match_ranks_first(index):
+    results = index.search("harry potter")
+    assert results[0] == (0, 1.0)
+    assert index.search("HARRY-POTTER", limit=1) == [(0, 1.0)]
+
+
+def test_typos_and_partial_names(index):
+    assert names_of(index, index.search("hary poter"))[0] == "Harry Potter"
+    assert names_of(index, index.search("hermione"))[0] == "Hermione Granger"
+    assert names_of(index, index.search("skywalker"))[0] == "Luke Skywalker"
+    assert names_of(index, index.search("zoe oneill"))[0] == "Zoë O'Neill"
+
+
+def test_spaces_removed_match(index):
+    assert names_of(index, index.search("spiderman"))[0] == "Spider-Man"
+
+
+def test_scores_are_sorted_and_ties_keep_catalog_order(index):
+    results = index.search("harry")
+    scores = [score for _, score in results]
+    assert scores == sorted(scores, reverse=True)
+    assert names_of(index, results)[:2] == ["Harry Potter", "Harry Osborn"]
+
+
+def test_best_match_threshold(index):
+    assert index.best_match("darth vadr") == 4
+    assert index.best_match("qwertyuiop") is None
+
+
+def test_complete_prefers_first_word_matches(index):
+    completions = [NAMES[idx] for idx in index.complete("pot")]
+    assert completions == ["Potter Stewart", "Harry Potter"]
+    assert [NAMES[idx] for idx in index.complete("harry ")] == ["Harry Potter", "Harry Osborn"]
+    assert index.complete("") == []
+
+
+def test_engine_lookups(engine):
+    name = engine.characters[0]
+    assert engine.find_character(name.upper()) == name
+    assert engine.find_characters(name, limit=3)[0][0] == name
+    assert name in engine.suggest_characters(name[:4], limit=20)
+
+
+def test_candidates_do_not_depend_on_hash_seed():
+    # Each trigram of "abcde" is in exactly 3 names and the posting budget only
+    # takes one list: the one taken must not follow set (string hash) order
+    script = (
+        "import indinator.name_index as m\n"
+        "m.MAX_POSTING_IDS = 3\n"
+        "words = ['abzz', 'qabcq', 'xbcdx', 'ycdey', 'wwde']\n"
+        "index = m.NameIndex([f'{word} {i}' for word in words for i in range(3)])\n"
+        "print(index._candidates(['abcde']).tolist())\n"
+    )
+    outputs = {
+        subprocess.run(
+            [sys.executable, "-c", script], cwd=project_root, capture_output=True, text=True, check=True,
+            env={"PYTHONHASHSEED": str(seed)},
+        ).stdout
+        for seed in range(8)
+    }
+    assert len(outputs) == 1
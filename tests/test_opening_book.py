@@ -0,0 +1,47 @@
+"""
+Opening book: book moves are the questions the priority selection would ask.
+"""
+
+import itertools
+
+import pytest
+
+from indinator.opening_book import OpeningBook
+
+# Every answer of each class (the book only depends on the class)
+CLASS_ANSWERS = {'1': ('yes', 'probably'), '0': ('no', 'probably_not'), '?': ('dont_know',)}
+
+
+def test_build_matches_stored_book(engine):
+    assert OpeningBook.build(engine).to_dict() == engine.opening_book.to_dict()
+    assert OpeningBook.from_dict(engine.opening_book.to_dict()).moves == engine.opening_book.moves
+
+
+def test_book_moves_equal_priority_selection(engine):
+    book = engine.opening_book
+    assert len(book) > 1
+    for key, book_question in book.moves.items():
+        # Every concrete answer sequence of the key's answer classes
+        for answers in itertools.product(*(CLASS_ANSWERS[cls_char] for cls_char in key)):
+            game = engine.for_state(engine.new_state())
+            for i, answer in enumerate(answers):
+                game.update_probabilities(book.moves[key[:i]], answer)
+            assert game.state.opening_key == key
+            assert game.select_best_question() == book_question
+            assert game._select_priority_question() == book_question
+
+
+def test_leaving_the_book(engine):
+    game = engine.for_state(engine.new_state())
+    book_question = game.select_best_question()
+    other = next(q for q in range(len(game.questions)) if q != book_question and game.questions[q].get('trait'))
+    game.update_probabilities(other, 'yes')
+    assert game.state.opening_key is None
+    # Off-book games still get the priority question during the opening
+    assert game.select_best_question() == game._select_priority_question()
+
+
+@pytest.mark.parametrize("depth", [1, 2])
+def test_depth(engine, depth):
+    book = OpeningBook.build(engine, depth)
+    assert max(len(key) for key in book.moves) == depth - 1
@@ -0,0 +1,88 @@
+"""
+Redundancy rules (data/redundancy_rules.json): which questions are skipped once
+other traits are known.
+"""
+
+import numpy as np
+import pytest
+
+from indinator.redundancy import RedundancyRules
+
+
+@pytest.fixture(scope="module")
+def redundant_traits(engine):
+    """Traits of the questions made redundant by some known trait values."""
+    def lookup(**known):
+        feature_vector = np.full(len(engine.feature_extractor.feature_names), -1, dtype=np.int8)
+        known_mask = np.zeros(len(feature_vector), dtype=bool)
+        for trait, value in known.items():
+            feature_idx = engine.feature_extractor.trait_to_index[trait]
+            feature_vector[feature_idx] = value
+            known_mask[feature_idx] = True
+        redundant = engine.redundancy.redundant_questions(feature_vector, known_mask)
+        return {engine.questions[q_idx]['trait'] for q_idx in np.flatnonzero(redundant)}
+    return lookup
+
+
+def test_nothing_known_nothing_redundant(redundant_traits):
+    assert redundant_traits() == set()
+    # "No" to a franchise rules nothing out
+    assert redundant_traits(franchise_marvel=0) == set()
+
+
+def test_source_confirmed_yes(redundant_traits):
+    redundant = redundant_traits(source_movie=1)
+    # Other media origins (exclusive source_ group)
+    assert {'source_movie', 'source_anime', 'source_video_game', 'source_tv_streaming'} <= redundant
+    # Franchises whose source is another medium (requires rule)...
+    assert {'franchise_naruto', 'franchise_marvel', 'franchise_mario', 'franchise_got'} <= redundant
+    # ...but not movie franchises
+    assert not {'franchise_star_wars', 'franchise_harry_potter', 'franchise_shrek'} & redundant
+
+
+def test_required_source_known_no(redundant_traits):
+    redundant = redundant_traits(source_anime=0)
+    assert {'franchise_naruto', 'franchise_one_piece', 'franchise_dragon_ball', 'franchise_pokemon',
+            'franchise_demon_slayer'} <= redundant
+    assert not {'franchise_star_wars', 'franchise_mario', 'source_movie', 'source_anime'} & redundant
+
+
+def test_sibling_franchise_confirmed_yes(redundant_traits, engine):
+    redundant = redundant_traits(franchise_marvel=1)
+    franchise_traits = {q['trait'] for q in engine.questions if q.get('trait', '').startswith('franchise_')}
+    assert redundant >= franchise_traits
+    assert not any(trait.startswith('source_') for trait in redundant)
+
+
+def test_masks_accumulate_per_answer(engine):
+    # The OR of redundant_after over the known traits equals the full computation
+    names = engine.feature_extractor.feature_names
+    rng = np.random.default_rng(0)
+    for _ in range(50):
+        known_mask = rng.random(len(names)) < 0.1
+        feature_vector = np.where(known_mask, rng.integers(0, 2, len(names)), -1).astype(np.int8)
+        expected = np.zeros(len(engine.questions), dtype=bool)
+        for feature_idx in np.flatnonzero(known_mask):
+            expected |= engine.redundancy.redundant_after(feature_idx, int(feature_vector[feature_idx]))
+        np.testing.assert_array_equal(engine.redundancy.redundant_questions(feature_vector, known_mask), expected)
+
+
+def test_compile_small_rule_table():
+    features = ['source_a', 'source_b', 'franchise_x', 'franchise_y']
+    rules = {'rules': [
+        {'type': 'exclusive', 'prefix': 'source_'},
+        {'type': 'requires', 'group': 'source_', 'traits': {'franchise_x': 'source_a'}},
+    ]}
+    compiled = RedundancyRules.compile(rules, features, features + [''])
+
+    def redundant(**known):
+        vector = np.array([known.get(name, -1) for name in features], dtype=np.int8)
+        return [features[q] for q in np.flatnonzero(compiled.redundant_questions(vector, vector >= 0))]
+
+    assert redundant(source_b=1) == ['source_a', 'source_b', 'franchise_x']
+    assert redundant(source_a=1) == ['source_a', 'source_b']
+    assert redundant(source_a=0) == ['franchise_x']
+    assert redundant(franchise_y=1) == []
+
+    with pytest.raises(ValueError):
+        RedundancyRules.compile({'rules': [{'type': 'unknown'}]}, features, features)
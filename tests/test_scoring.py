@@ -0,0 +1,79 @@
+"""
+Scoring modes: the vectorized and incremental scorers must play exactly like
+the reference per-character loop.
+"""
+
+import numpy as np
+import pytest
+
+from conftest import assert_same_trace, make_engine
+from indinator.decision_tree_engine import SCORING_MODES
+
+
+@pytest.fixture(scope="module")
+def engines():
+    # No transposition cache, so every answer is actually rescored
+    return {mode: make_engine(scoring_mode=mode, cache_bytes=0) for mode in SCORING_MODES}
+
+
+@pytest.mark.parametrize("mode", [mode for mode in SCORING_MODES if mode != 'reference'])
+def test_scoring_mode_traces_match_reference(engines, play, mode):
+    for seed, character in enumerate(sorted(engines['reference'].characters)[::5]):
+        expected = play(engines['reference'], character, seed)
+        actual = play(engines[mode], character, seed)
+        assert_same_trace(expected, actual)
+
+
+def test_changed_answer_rescores_like_fresh_game(engines):
+    # Answering a trait again must leave the same state as answering it that way first
+    for mode, ai in engines.items():
+        changed = ai.for_state(ai.new_state())
+        fresh = ai.for_state(ai.new_state())
+        questions = [q for q in range(len(ai.questions)) if ai.questions[q].get('trait')][:3]
+        changed.update_probabilities(questions[0], 'yes')
+        changed.update_probabilities(questions[1], 'no')
+        changed.update_probabilities(questions[0], 'probably_not')
+        fresh.update_probabilities(questions[1], 'no')
+        fresh.update_probabilities(questions[0], 'probably_not')
+        assert changed.probabilities == pytest.approx(fresh.probabilities, rel=1e-9), mode
+
+
+def test_probabilities_are_normalized_after_penalties(engine):
+    game = engine.for_state(engine.new_state())
+    game.update_probabilities(0, 'yes')
+    for _ in range(200):
+        name, _ = game.get_best_guess()
+        game.penalize_wrong_guess(name)
+    probabilities = game.probabilities
+    assert np.all(np.isfinite(probabilities))
+    assert probabilities.sum() == pytest.approx(1.0)
+
+
+def test_id_adjustments_match_name_adjustments(engine):
+    by_name = engine.for_state(engine.new_state())
+    by_id = engine.for_state(engine.new_state())
+    for game in (by_name, by_id):
+        game.update_probabilities(game.select_best_question(), 'yes')
+
+    names = engine.characters[:3]
+    by_name.penalize_wrong_guess(names[0])
+    by_name.penalize_wrong_guess(names[1], penalty_factor=0.5)
+    by_name.boost_character(names[2])
+    by_id.penalize_id(engine.character_ids[names[0]])
+    by_id.penalize_id(engine.character_ids[names[1]], penalty_factor=0.5)
+    by_id.boost_id(engine.character_ids[names[2]])
+
+    np.testing.assert_array_equal(by_name.probabilities, by_id.probabilities)
+    assert by_name.state.adjustments == by_id.state.adjustments
+    assert by_id.probabilities.sum() == pytest.approx(1.0)
+
+
+def test_penalty_and_boost_scale_odds(engine):
+    game = engine.for_state(engine.new_state())
+    before = game.probabilities.copy()
+    game.penalize_id(0, penalty_factor=0.5)
+    game.boost_id(1, boost_factor=4.0)
+    after = game.probabilities
+    # Relative to an untouched character, the odds scale by exactly the factors
+    assert after[0] / after[2] == pytest.approx(0.5 * before[0] / before[2])
+    assert after[1] / after[2] == pytest.approx(4.0 * before[1] / before[2])
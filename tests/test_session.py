@@ -0,0 +1,106 @@
+"""
+SessionStore: TTL expiry, least-recently-used eviction and the memory cap.
+"""
+
+import pytest
+
+import indinator.session as session_module
+from indinator.session import SessionStore
+
+
+class FakeClock:
+    """Stands in for time.monotonic."""
+
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    fake = FakeClock()
+    monkeypatch.setattr(session_module.time, "monotonic", fake)
+    return fake
+
+
+def make_store(engine, **options):
+    return SessionStore(engine.new_state, **options)
+
+
+def test_create_and_get(engine):
+    store = make_store(engine, id_prefix="3.")
+    session = store.create()
+    assert session.session_id.startswith("3.")
+    assert store.get(session.session_id) is session
+    assert store.get("unknown") is None
+    assert store.get(None) is None
+
+
+def test_idle_sessions_expire(engine, clock):
+    store = make_store(engine, ttl_seconds=60)
+    old = store.create()
+    clock.now += 30
+    kept = store.create()
+    clock.now += 45  # old idle for 75 s, kept for 45 s
+    assert store.get(old.session_id) is None
+    assert store.get(kept.session_id) is kept
+    assert len(store) == 1
+
+
+def test_access_refreshes_ttl(engine, clock):
+    store = make_store(engine, ttl_seconds=60)
+    session = store.create()
+    for _ in range(5):
+        clock.now += 50
+        assert store.get(session.session_id) is session
+
+
+def test_least_recently_used_evicted_over_max_sessions(engine, clock):
+    store = make_store(engine, max_sessions=3)
+    first, second, third = store.create(), store.create(), store.create()
+    store.get(first.session_id)  # second is now the least recently used
+    fourth = store.create()
+    assert store.get(second.session_id) is None
+    for session in (first, third, fourth):
+        assert store.get(session.session_id) is session
+    assert store.evictions == 1
+
+
+def test_max_bytes_caps_total_size(engine, clock):
+    state_bytes = engine.new_state().nbytes()
+    store = make_store(engine, max_bytes=int(state_bytes * 3.5))
+    sessions = [store.create() for _ in range(6)]
+    assert len(store) == 3
+    assert store.total_bytes() <= store.max_bytes
+    assert [store.get(s.session_id) is not None for s in sessions] == [False] * 3 + [True] * 3
+
+
+def test_growing_session_counts_against_max_bytes(engine, clock):
+    state_bytes = engine.new_state().nbytes()
+    store = make_store(engine, max_bytes=int(state_bytes * 2.5))
+    idle, active = store.create(), store.create()
+    game = engine.for_state(active.state)
+    for _ in range(10):
+        game.update_probabilities(game.select_best_question(), 'no')
+    assert store.get(active.session_id) is active  # re-measured: now over the cap
+    assert store.get(idle.session_id) is None
+    assert store.total_bytes() == active.state.nbytes()
+
+
+def test_most_recent_session_is_kept_even_over_max_bytes(engine, clock):
+    store = make_store(engine, max_bytes=1)
+    session = store.create()
+    assert store.get(session.session_id) is session
+
+
+def test_delete_and_reset(engine):
+    store = make_store(engine)
+    session = store.create()
+    old_state = session.state
+    store.reset(session)
+    assert session.state is not old_state
+    store.delete(session.session_id)
+    assert store.get(session.session_id) is None
+    assert store.total_bytes() == 0
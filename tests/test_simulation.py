@@ -0,0 +1,38 @@
+"""
+Self-play simulation: parallel runs play exactly the games of serial runs.
+"""
+
+import pytest
+
+from indinator.parallel_eval import ParallelEvaluator
+from indinator.simulation import AnswerModel, simulate
+
+# Fields of a report that describe the games played (not their timing)
+GAME_FIELDS = ('games', 'wins', 'win_rate', 'avg_questions', 'avg_guesses', 'steps', 'lost')
+
+
+def game_fields(report):
+    return {field: report[field] for field in GAME_FIELDS}
+
+
+@pytest.fixture(scope="module")
+def characters(engine):
+    return sorted(engine.characters)[::4]
+
+
+def test_same_seed_same_games(engine, characters):
+    model = AnswerModel(noise_rate=0.05, probably_rate=0.15, dont_know_rate=0.1)
+    first = simulate(engine, characters, model, seed=7)
+    second = simulate(engine, characters, model, seed=7)
+    assert game_fields(first) == game_fields(second)
+    assert first['games'] == len(characters)
+
+
+def test_parallel_matches_serial(engine, characters):
+    model = AnswerModel(noise_rate=0.05, probably_rate=0.15, dont_know_rate=0.1)
+    with ParallelEvaluator(engine, workers=2) as evaluator:
+        for seed, repeats in ((3, 1), (11, 2)):
+            parallel = evaluator.evaluate(characters, model, seed=seed, repeats=repeats)
+            serial = simulate(engine, characters, model, seed=seed, repeats=repeats)
+            assert game_fields(parallel) == game_fields(serial)
+            assert parallel['config']['workers'] == 2
@@ -0,0 +1,128 @@
+"""
+Model snapshots: an engine loaded from a snapshot must match the one trained from JSON.
+"""
+
+import json
+
+import numpy as np
+import pytest
+
+from conftest import assert_same_trace, make_engine
+from indinator.snapshot import (
+    SNAPSHOT_FORMAT_VERSION, SNAPSHOT_MAGIC, SnapshotError, _PREAMBLE, load_snapshot, read_snapshot
+)
+from indinator.tree_runtime import FlatTree
+
+
+@pytest.fixture(scope="module")
+def snapshot_file(tmp_path_factory, engine):
+    path = tmp_path_factory.mktemp("snapshot") / "model.snapshot"
+    engine.save_snapshot(str(path))
+    return str(path)
+
+
+@pytest.fixture(scope="module")
+def snapshot_engine(snapshot_file):
+    return make_engine(snapshot_file=snapshot_file)
+
+
+def test_snapshot_engine_has_same_model(engine, snapshot_engine):
+    assert snapshot_engine.tree is None  # loaded, not trained
+    assert snapshot_engine.characters == engine.characters
+    assert snapshot_engine.questions == engine.questions
+    assert snapshot_engine.source_hash == engine.source_hash
+    np.testing.assert_array_equal(snapshot_engine.X_train, engine.X_train)
+    np.testing.assert_array_equal(snapshot_engine.question_features, engine.question_features)
+    np.testing.assert_array_equal(snapshot_engine.trait_index.indptr, engine.trait_index.indptr)
+    np.testing.assert_array_equal(snapshot_engine.trait_index.indices, engine.trait_index.indices)
+    for name in FlatTree.ARRAY_NAMES:
+        np.testing.assert_array_equal(snapshot_engine.flat_tree.to_arrays()[name], engine.flat_tree.to_arrays()[name])
+    assert snapshot_engine.opening_book.to_dict() == engine.opening_book.to_dict()
+
+
+def test_snapshot_engine_plays_like_json_engine(engine, snapshot_engine, play):
+    for seed, character in enumerate(sorted(engine.characters)[::5]):
+        assert_same_trace(play(engine, character, seed), play(snapshot_engine, character, seed))
+
+
+def test_snapshot_bytes_round_trip(engine):
+    snapshot = read_snapshot(engine.snapshot_bytes())
+    assert snapshot.source_hash == engine.source_hash
+    np.testing.assert_array_equal(snapshot['X_bits'], engine.trait_matrix.words)
+
+
+def test_stale_snapshot_is_rejected(snapshot_file):
+    with pytest.raises(SnapshotError):
+        load_snapshot(snapshot_file, expected_hash="0" * 64)
+
+
+def snapshot_with_header(header) -> bytes:
+    """Snapshot bytes with the given JSON header and no array data."""
+    encoded = json.dumps(header).encode('utf-8')
+    return _PREAMBLE.pack(SNAPSHOT_MAGIC, SNAPSHOT_FORMAT_VERSION, len(encoded)) + encoded
+
+
+@pytest.mark.parametrize("header", [
+    {},
+    [],
+    {'source_hash': 'x', 'metadata': {}},
+    {'source_hash': 'x', 'metadata': {}, 'arrays': {'X_bits': {'shape': [1], 'offset': 0}}},
+    {'source_hash': 'x', 'metadata': {}, 'arrays': {'X_bits': {'dtype': 'nope', 'shape': [1], 'offset': 0}}},
+    {'metadata': {}, 'arrays': {}},
+])
+def test_corrupt_header_is_rejected(header):
+    with pytest.raises(SnapshotError):
+        read_snapshot(snapshot_with_header(header))
+
+
+def test_empty_and_truncated_snapshots_are_rejected(tmp_path, snapshot_file):
+    empty = tmp_path / "empty.snapshot"
+    empty.write_bytes(b"")
+    with pytest.raises(SnapshotError):
+        load_snapshot(str(empty))
+
+    with open(snapshot_file, 'rb') as f:
+        data = f.read()
+    for size in (10, _PREAMBLE.size + 20, len(data) // 2):
+        truncated = tmp_path / f"truncated{size}.snapshot"
+        truncated.write_bytes(data[:size])
+        with pytest.raises(SnapshotError):
+            load_snapshot(str(truncated))
+
+
+@pytest.mark.parametrize("contents", [b"", None])
+def test_unusable_snapshot_falls_back_to_json(tmp_path, engine, contents):
+    path = tmp_path / "model.snapshot"
+    path.write_bytes(contents if contents is not None else snapshot_with_header({'arrays': {}}))
+    ai = make_engine(snapshot_file=str(path))
+    assert ai.tree is not None  # trained from JSON
+    assert ai.characters == engine.characters
+
+
+def test_missing_snapshot_falls_back_to_json(tmp_path, engine):
+    ai = make_engine(snapshot_file=str(tmp_path / "missing.snapshot"))
+    assert ai.tree is not None  # trained from JSON
+    assert ai.characters == engine.characters
+
+
+def test_snapshot_with_other_tree_parameters_is_ignored(snapshot_file):
+    ai = make_engine(snapshot_file=snapshot_file, max_depth=5)
+    assert ai.tree is not None
+    assert ai.flat_tree.get_depth() <= 5
+
+
+def test_ensemble_loads_from_snapshot(tmp_path):
+    built = make_engine(question_strategy='ensemble', ensemble_size=4)
+    path = str(tmp_path / "model.snapshot")
+    built.save_snapshot(path)
+
+    loaded = make_engine(snapshot_file=path, question_strategy='ensemble', ensemble_size=4)
+    assert len(loaded.ensemble) == 4
+    for built_tree, loaded_tree in zip(built.ensemble, loaded.ensemble):
+        np.testing.assert_array_equal(built_tree.feature, loaded_tree.feature)
+
+    # Games on views select questions without unpacking the dense matrix
+    game = loaded.for_state(loaded.new_state())
+    for _ in range(8):
+        game.update_probabilities(game.select_best_question(), 'no')
+    assert game._X_train is None and loaded._X_train is None
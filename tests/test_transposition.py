@@ -0,0 +1,69 @@
+"""
+Transposition cache and eligible-question bookkeeping: shortcuts that must not
+change how a game is played.
+"""
+
+import numpy as np
+
+from conftest import assert_same_trace, make_engine
+from indinator.transposition import TranspositionCache
+
+
+def test_cache_evicts_least_recently_used():
+    cache = TranspositionCache(max_bytes=300)
+    cache.put('a', 1, 100)
+    cache.put('b', 2, 100)
+    cache.put('c', 3, 100)
+    assert cache.get('a') == 1  # 'b' is now the least recently used
+    cache.put('d', 4, 100)
+    assert cache.get('b') is None
+    assert cache.get('a') == 1 and cache.get('d') == 4
+    assert cache.total_bytes() == 300
+    assert cache.evictions == 1
+    assert cache.stats()['hits'] == 3
+
+
+def test_entries_over_budget_are_not_stored():
+    cache = TranspositionCache(max_bytes=100)
+    cache.put('big', 1, 101)
+    assert len(cache) == 0
+
+
+def test_cached_engine_plays_like_uncached(engine, play):
+    uncached = make_engine(cache_bytes=0)
+    for seed, character in enumerate(sorted(engine.characters)[::3]):
+        assert_same_trace(play(uncached, character, seed), play(engine, character, seed))
+    assert engine.transposition_cache.hits > 0
+
+
+def test_answer_order_reaches_same_position(engine):
+    questions = [q for q in range(len(engine.questions)) if engine.questions[q].get('trait')][:3]
+    first = engine.for_state(engine.new_state())
+    second = engine.for_state(engine.new_state())
+    for question_idx, answer in zip(questions, ('yes', 'no', 'dont_know')):
+        first.update_probabilities(question_idx, answer)
+    for question_idx, answer in reversed(list(zip(questions, ('yes', 'no', 'dont_know')))):
+        second.update_probabilities(question_idx, answer)
+    assert first.state.answer_key == second.state.answer_key
+    np.testing.assert_array_equal(first.probabilities, second.probabilities)
+
+
+def test_answering_a_trait_again_leaves_the_cache(engine):
+    game = engine.for_state(engine.new_state())
+    question_idx = game.select_best_question()
+    game.update_probabilities(question_idx, 'yes')
+    game.update_probabilities(question_idx, 'no')
+    assert game.state.answer_key is None
+
+
+def test_eligible_questions_match_recomputation(engine, traits):
+    # The per-answer updates of the eligible mask must equal computing it from scratch
+    for character in sorted(engine.characters)[::15]:
+        game = engine.for_state(engine.new_state())
+        for _ in range(12):
+            question_idx = game.select_best_question()
+            if question_idx is None:
+                break
+            has_trait = traits[character].get(game.questions[question_idx]['trait'], 0) == 1
+            game.update_probabilities(question_idx, 'yes' if has_trait else 'no')
+            np.testing.assert_array_equal(game.state.eligible_questions, game._eligible_questions())
@@ -1,5 +1,7 @@
 // === UI STATE ===
 let currentQuestion = null;
+// Identifies this player's game on the server (issued by /api/start)
+let sessionId = null;
 let gameState = {
   questionNumber: 0,
   entropy: null,
@@ -44,7 +46,7 @@ guessCorrectBtn.addEventListener("click", () => {
   // then end the game on the frontend.
   fetch("/api/guess-feedback", {
     method: "POST",
-    headers: { "Content-Type": "application/json" },
+    headers: requestHeaders(),
     body: JSON.stringify({ correct: true }),
   }).finally(() => {
     endGame(true);
@@ -56,7 +58,7 @@ guessIncorrectBtn.addEventListener("click", () => {
   systemMessageEl.textContent = "Okay, updating beliefs and continuing…";
   fetch("/api/guess-feedback", {
     method: "POST",
-    headers: { "Content-Type": "application/json" },
+    headers: requestHeaders(),
     body: JSON.stringify({ correct: false }),
   })
     .then((res) => {
@@ -76,6 +78,14 @@ guessIncorrectBtn.addEventListener("click", () => {
 
 // === MAIN FLOW ===
 
+function requestHeaders() {
+  const headers = { "Content-Type": "application/json" };
+  if (sessionId) {
+    headers["X-Session-Id"] = sessionId;
+  }
+  return headers;
+}
+
 function startGame() {
   disableAnswers(true);
   systemMessageEl.textContent =
@@ -92,7 +102,7 @@ function startGame() {
 
   fetch("/api/start", {
     method: "POST",
-    headers: { "Content-Type": "application/json" },
+    headers: requestHeaders(),
     body: JSON.stringify({}),
   })
     .then((res) => {
@@ -100,6 +110,7 @@ function startGame() {
       return res.json();
     })
     .then((state) => {
+      sessionId = state.sessionId;
       applyStateFromBackend(state);
       disableAnswers(false);
     })
@@ -120,7 +131,7 @@ function handleAnswer(answerCode) {
 
   fetch("/api/answer", {
     method: "POST",
-    headers: { "Content-Type": "application/json" },
+    headers: requestHeaders(),
     body: JSON.stringify({
       questionId: currentQuestion.id,
       answer: answerCode,
@@ -150,7 +161,7 @@ function requestNextQuestion() {
 
   fetch("/api/next-question", {
     method: "POST",
-    headers: { "Content-Type": "application/json" },
+    headers: requestHeaders(),
     body: JSON.stringify({}),
   })
     .then((res) => {